@@ -9,7 +9,7 @@ from evolution.evolution_configuration import EvolutionConfiguration
 from evolution.evolution_service import EvolutionService
 from grammar_estimator import EvolutionStepEstimator
 from induction.cyk_configuration import CykConfiguration
-from induction.cyk_service import CykService, StochasticCykService
+from induction.cyk_service import CykService, VectorizedStochasticCykService
 from rule_adding import AddingRulesConfiguration, AddingRuleSupervisor
 from statistics.grammar_statistics import GrammarStatistics, ClassicalStatisticsConfiguration, \
     PasiekaStatisticsConfiguration
@@ -110,7 +110,7 @@ class CykServiceVariationManager(object):
 
     def create_cyk_service(self, randomizer, adding_rule_supervisor):
         if self.is_stochastic:
-            return StochasticCykService.default(randomizer, adding_rule_supervisor)
+            return VectorizedStochasticCykService.default(randomizer, adding_rule_supervisor)
         else:
             return CykService.default(randomizer, adding_rule_supervisor)
 
@@ -143,8 +143,8 @@ class RuleConfiguration(SimpleJsonNode):
         configuration = RuleConfiguration()
         configuration.adding = AddingRulesConfiguration.create(
             crowding_factor, crowding_size, elitism_size, max_non_terminal_rules)
-        configuration.starting_symbol = Symbol(starting_symbol)
-        configuration.universal_symbol = Symbol(universal_symbol) if universal_symbol else None
+        configuration.starting_symbol = Symbol.of(starting_symbol)
+        configuration.universal_symbol = Symbol.of(universal_symbol) if universal_symbol else None
         configuration.max_non_terminal_symbols = max_non_terminal_symbols
         configuration.random_starting_population_size = random_starting_population_size
         return configuration
@@ -267,9 +267,9 @@ class GcsRunner(object):
         rules = set()
         rules |= set(provided_rules)
         while len(rules) < self.configuration.rule.random_starting_population_size:
-            rules.add(Rule(Symbol(self._random_symbol_id(self.configuration)),
-                           Symbol(self._random_symbol_id(self.configuration)),
-                           Symbol(self._random_symbol_id(self.configuration))))
+            rules.add(Rule.of(Symbol.of(self._random_symbol_id(self.configuration)),
+                              Symbol.of(self._random_symbol_id(self.configuration)),
+                              Symbol.of(self._random_symbol_id(self.configuration))))
 
         return list(rules)
 
@@ -295,22 +295,27 @@ class GcsRunner(object):
         evolution_step = 0
 
         # print('')
-        while not any(cr() for cr in self.stop_criteria):
-            # print('.', end='')
-            evolution_step_estimator = EvolutionStepEstimator()
-            self.induction.perform_cyk_for_all_sentences(rule_population, sentences,
-                                                         evolution_step_estimator,
-                                                         self.configuration.induction,
-                                                         grammar_statistics)
-
-            self.grammar_estimator.append_step_estimation(evolution_step, evolution_step_estimator)
-
-            if self.configuration.should_run_evolution:
-                self.evolution.run_genetic_algorithm(grammar_statistics, rule_population,
-                                                     self.rule_adding, self.configuration.evolution)
-
-            evolution_step += 1
-            self._post_step_actions(evolution_step)
+        try:
+            while not any(cr() for cr in self.stop_criteria):
+                # print('.', end='')
+                evolution_step_estimator = EvolutionStepEstimator()
+                self.induction.perform_cyk_for_all_sentences(rule_population, sentences,
+                                                             evolution_step_estimator,
+                                                             self.configuration.induction,
+                                                             grammar_statistics)
+
+                self.grammar_estimator.append_step_estimation(evolution_step,
+                                                              evolution_step_estimator)
+
+                if self.configuration.should_run_evolution:
+                    self.evolution.run_genetic_algorithm(grammar_statistics, rule_population,
+                                                         self.rule_adding,
+                                                         self.configuration.evolution)
+
+                evolution_step += 1
+                self._post_step_actions(evolution_step)
+        finally:
+            self.induction.close()
 
         stop_reasoning = next(cr for cr in self.stop_criteria if cr.has_been_fulfilled())
         fitness_reached = self.grammar_estimator['fitness'].get_global_max()
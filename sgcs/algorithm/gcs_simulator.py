@@ -6,7 +6,7 @@ import random
 
 from algorithm.gcs_runner import GcsRunner
 from algorithm.run_estimator import RunEstimator
-from grammar_estimator import GrammarEstimator
+from grammar_estimator import GrammarEstimator, EvolutionStepEstimator
 
 
 class GcsSimulator(object):
@@ -14,29 +14,6 @@ class GcsSimulator(object):
         self.randomizer = randomizer
         self.algorithm_variant = algorithm_variant
 
-    @staticmethod
-    def _prepare_configuration_for_generalization_test(conf):
-        configuration = copy.deepcopy(conf)
-
-        configuration.should_run_evolution = False
-
-        configuration.induction.grammar_correction.should_run = False
-        configuration.induction.coverage.operators.terminal.chance = 0
-        configuration.induction.coverage.operators.universal.chance = 0
-        configuration.induction.coverage.operators.starting.chance = 0
-        configuration.induction.coverage.operators.full.chance = 0
-
-        configuration.max_algorithm_steps = 1
-        configuration.max_execution_time = 1800
-
-        configuration.evolution.operators.crossover.chance = 0
-        configuration.evolution.operators.mutation.chance = 0
-        configuration.evolution.operators.inversion.chance = 0
-
-        configuration.induction.coverage.operators.aggressive.chance = 0
-
-        return configuration
-
     @staticmethod
     def _rules_population_size_keyfunc(rp):
         return float('inf') if rp is None else rp.terminal_rule_count + rp.non_terminal_rule_count
@@ -87,27 +64,31 @@ class GcsSimulator(object):
     def _perform_generalization_test(self, configuration, rule_population,
                                      auxiliary_rule_population,
                                      testing_set, run_estimator):
-        conf = self._prepare_configuration_for_generalization_test(configuration)
-
         logging.info('nGen starting')
 
         rule_population = rule_population if rule_population is not None \
             else auxiliary_rule_population
 
-        rules = list(rule_population.get_all_non_terminal_rules())
-        rules += rule_population.get_terminal_rules()
-
         sentences = list(testing_set.get_sentences())
 
-        r = self._generalization_run(conf, rules, sentences)
-        rule_population, _, n_gen, *_1, grammar_statistics = r
+        grammar_estimator = self._generalization_run(configuration, rule_population, sentences)
+        n_gen = grammar_estimator['fitness'].get_global_max()
 
         logging.info(testing_set.rule_population_to_string(rule_population))
 
-        return run_estimator, n_gen, grammar_statistics, rule_population
+        return run_estimator, n_gen, grammar_estimator, rule_population
+
+    def _generalization_run(self, configuration, rule_population, sentences):
+        grammar_estimator = GrammarEstimator()
+        evolution_step_estimator = EvolutionStepEstimator()
+
+        cyk_service = self.algorithm_variant.create_cyk_service(self.randomizer, None)
+        cyk_service.configuration = configuration.induction
+        cyk_service.perform_recognition_for_all_sentences(rule_population, sentences,
+                                                          evolution_step_estimator)
 
-    def _generalization_run(self, conf, rules, sentences):
-        return self._perform_run(conf, rules, sentences, None)
+        grammar_estimator.append_step_estimation(0, evolution_step_estimator)
+        return grammar_estimator
 
     def perform_simulation(self, learning_set, testing_set, configuration, starting_rules=None):
         starting_rules = starting_rules if starting_rules is not None else []
@@ -150,12 +131,7 @@ class AsyncGcsSimulator(GcsSimulator):
 
         with multiprocessing.Pool(worker_pool_size) as pool:
             runs_to_be_performed = range(configuration.max_algorithm_runs)
-            tasks = [(self._perform_run, (
-                copy.deepcopy(configuration),
-                copy.deepcopy(starting_rules),
-                copy.deepcopy(sentences),
-                run_no
-            ),
+            tasks = [(self._perform_run, (configuration, starting_rules, sentences, run_no),
                       run_no, random.randint(0, 10**10))
                      for run_no in runs_to_be_performed]
 
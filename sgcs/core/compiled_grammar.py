@@ -0,0 +1,171 @@
+from core.rule_change import RuleChangeKind
+
+
+class CompiledGrammar(object):
+    def __init__(self, rule_population):
+        self.rule_population = rule_population
+        self.symbols = []
+        self.symbol_ids = dict()
+        self.rules = []
+        self.rule_ids = dict()
+        self.rule_symbol_ids = []
+        self.rules_by_right = []
+        self.terminal_ids = dict()
+        self.terminal_rules = []
+        self._free_rule_ids = []
+        self._probabilities = None
+        self._reachable_symbols = None
+
+        for rule in rule_population.get_all_non_terminal_rules():
+            self.add_rule(rule)
+        for rule in rule_population.get_terminal_rules():
+            self.add_rule(rule)
+
+    def symbol_id(self, symbol):
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbol_ids[symbol] = symbol_id
+            self.symbols.append(symbol)
+            self.rules_by_right.append(dict())
+
+        return symbol_id
+
+    def terminal_id(self, symbol):
+        terminal_id = self.terminal_ids.get(symbol)
+        if terminal_id is None:
+            terminal_id = len(self.terminal_rules)
+            self.terminal_ids[symbol] = terminal_id
+            self.terminal_rules.append([])
+
+        return terminal_id
+
+    def get_symbol_ids(self, symbols):
+        symbol_ids = self.symbol_ids
+        return [symbol_ids.get(symbol) for symbol in symbols]
+
+    def add_rule(self, rule):
+        if rule in self.rule_ids:
+            self.invalidate_probabilities()
+            return
+
+        parent_id = self.symbol_id(rule.parent)
+        if rule.is_terminal_rule():
+            rule_symbol_ids = parent_id, self.terminal_id(rule.left_child), None
+        else:
+            rule_symbol_ids = parent_id, self.symbol_id(rule.left_child), \
+                self.symbol_id(rule.right_child)
+
+        if self._free_rule_ids:
+            rule_id = self._free_rule_ids.pop()
+            self.rules[rule_id] = rule
+            self.rule_symbol_ids[rule_id] = rule_symbol_ids
+        else:
+            rule_id = len(self.rules)
+            self.rules.append(rule)
+            self.rule_symbol_ids.append(rule_symbol_ids)
+
+        self.rule_ids[rule] = rule_id
+        _, left_id, right_id = rule_symbol_ids
+        if right_id is None:
+            self.terminal_rules[left_id].append(rule_id)
+        else:
+            self.rules_by_right[left_id].setdefault(right_id, []).append(rule_id)
+
+        self._invalidate()
+
+    def remove_rule(self, rule):
+        rule_id = self.rule_ids.pop(rule, None)
+        if rule_id is None:
+            return
+
+        _, left_id, right_id = self.rule_symbol_ids[rule_id]
+        if right_id is None:
+            self.terminal_rules[left_id].remove(rule_id)
+        else:
+            rule_ids = self.rules_by_right[left_id][right_id]
+            rule_ids.remove(rule_id)
+            if not rule_ids:
+                del self.rules_by_right[left_id][right_id]
+
+        self.rules[rule_id] = None
+        self.rule_symbol_ids[rule_id] = None
+        self._free_rule_ids.append(rule_id)
+        self._invalidate()
+
+    def on_rule_change(self, change):
+        if change.kind == RuleChangeKind.added:
+            self.add_rule(change.rule)
+        elif change.kind == RuleChangeKind.removed:
+            self.remove_rule(change.rule)
+        else:
+            self.invalidate_probabilities()
+
+    def get_rules_by_right(self, left_child, right_child):
+        left_id = self.symbol_ids.get(left_child)
+        if left_id is None:
+            return []
+
+        rule_ids = self.rules_by_right[left_id].get(self.symbol_ids.get(right_child), ())
+        return [self.rules[rule_id] for rule_id in rule_ids]
+
+    def get_terminal_rules(self, symbol):
+        terminal_id = self.terminal_ids.get(symbol)
+        if terminal_id is None:
+            return []
+
+        return [self.rules[rule_id] for rule_id in self.terminal_rules[terminal_id]]
+
+    def _invalidate(self):
+        self._probabilities = None
+        self._reachable_symbols = None
+
+    def invalidate_probabilities(self):
+        self._probabilities = None
+
+    @property
+    def reachable_symbols(self):
+        if self._reachable_symbols is None:
+            self._reachable_symbols = self._find_reachable_symbols()
+
+        return self._reachable_symbols
+
+    def _find_reachable_symbols(self):
+        starting_symbol = self.rule_population.starting_symbol
+        starting_id = self.symbol_ids.get(starting_symbol)
+        if starting_id is None:
+            return {starting_symbol}
+
+        children_by_parent = [[] for _ in self.symbols]
+        for rule_symbol_ids in self.rule_symbol_ids:
+            if rule_symbol_ids is not None and rule_symbol_ids[2] is not None:
+                parent_id, left_id, right_id = rule_symbol_ids
+                children_by_parent[parent_id].append(left_id)
+                children_by_parent[parent_id].append(right_id)
+
+        is_reachable = [False] * len(self.symbols)
+        is_reachable[starting_id] = True
+        worklist = [starting_id]
+        while worklist:
+            for child_id in children_by_parent[worklist.pop()]:
+                if not is_reachable[child_id]:
+                    is_reachable[child_id] = True
+                    worklist.append(child_id)
+
+        return {symbol for symbol, reachable in zip(self.symbols, is_reachable) if reachable}
+
+    @property
+    def probabilities(self):
+        if self._probabilities is None:
+            self._probabilities = [
+                self.rule_population.get_normalized_rule_probability(rule)
+                if rule is not None else 0 for rule in self.rules]
+
+        return self._probabilities
+
+    def get_normalized_rule_probability(self, rule):
+        rule_id = self.rule_ids.get(rule)
+        if rule_id is None:
+            return self.rule_population.get_normalized_rule_probability(rule)
+
+        return self.probabilities[rule_id]
@@ -2,10 +2,33 @@ from core.symbol import Symbol
 
 
 class Rule(object):
+    __slots__ = ('_parent', 'left_child', 'right_child', 'rule_id', '_hash')
+
+    _interned = dict()
+
     def __init__(self, parent, left_child, right_child=None):
         self._parent = parent
         self.left_child = left_child
         self.right_child = right_child
+        self.rule_id = None
+        self._hash = hash(parent) << 6 ^ hash(left_child) << 3
+        if right_child is not None:
+            self._hash ^= hash(right_child)
+
+    @staticmethod
+    def of(parent, left_child, right_child=None):
+        key = parent, left_child, right_child
+        rule = Rule._interned.get(key)
+        if rule is None:
+            rule = Rule(parent, left_child, right_child) if right_child is not None \
+                else TerminalRule(parent, left_child)
+            rule.rule_id = len(Rule._interned)
+            rule = Rule._interned.setdefault(key, rule)
+
+        return rule
+
+    def __reduce__(self):
+        return Rule.of, (self._parent, self.left_child, self.right_child)
 
     STARTING_SYMBOL_REPR = '<S>'
     UNIVERSAL_SYMBOL_REPR = '<U>'
@@ -74,11 +97,7 @@ class Rule(object):
         return not self.__eq__(other)
 
     def __hash__(self):
-        res = self.parent.__hash__() << 6 ^ self.left_child.__hash__() << 3
-        if self.right_child is not None:
-            res = res ^ self.right_child.__hash__()
-
-        return res
+        return self._hash
 
     def __str__(self):
         props = [str(self.parent), str(self.left_child), str(self.right_child)]
@@ -90,7 +109,7 @@ class Rule(object):
 
     @staticmethod
     def _symbol_or_none(inpt):
-        return Symbol(inpt) if inpt is not None else None
+        return Symbol.of(inpt) if inpt is not None else None
 
     def json_coder(self):
         return [self._symbol_id_or_none(x) for x in
@@ -98,9 +117,15 @@ class Rule(object):
 
     @staticmethod
     def json_decoder(json):
-        return Rule(*[Rule._symbol_or_none(x) for x in json])
+        return Rule.of(*[Rule._symbol_or_none(x) for x in json])
 
 
 class TerminalRule(Rule):
+    __slots__ = ()
+
     def __init__(self, parent, child):
         super().__init__(parent, child, None)
+
+    @staticmethod
+    def of(parent, child):
+        return Rule.of(parent, child)
@@ -0,0 +1,61 @@
+from collections import deque
+from itertools import islice
+
+
+class RuleChangeKind(object):
+    added = 0
+    removed = 1
+    probabilities_updated = 2
+
+
+class RuleChange(object):
+    __slots__ = ('version', 'kind', 'rule')
+
+    def __init__(self, version, kind, rule=None):
+        self.version = version
+        self.kind = kind
+        self.rule = rule
+
+    def is_structural(self):
+        return self.kind != RuleChangeKind.probabilities_updated
+
+
+class RuleChangeJournal(object):
+    def __init__(self, max_length=4096, version=0):
+        self._changes = deque(maxlen=max_length)
+        self._version = version
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def position(self):
+        return self._version
+
+    @property
+    def _offset(self):
+        return self._version - len(self._changes)
+
+    def record(self, kind, rule=None):
+        self._version += 1
+        change = RuleChange(self._version, kind, rule)
+        self._changes.append(change)
+        return change
+
+    def events_since(self, position):
+        if position < self._offset:
+            return None
+
+        return list(islice(self._changes, position - self._offset, None))
+
+    def changes_since(self, position):
+        events = self.events_since(position)
+        if events is None:
+            return None
+
+        return [change.rule for change in events if change.is_structural()]
+
+    def forget_before(self, position):
+        for _ in range(min(position, self._version) - self._offset):
+            self._changes.popleft()
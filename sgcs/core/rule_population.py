@@ -1,4 +1,8 @@
+import copy
+
+from core.compiled_grammar import CompiledGrammar
 from core.rule import Rule
+from core.rule_change import RuleChangeJournal, RuleChangeKind
 from core.symbol import Symbol
 
 
@@ -11,15 +15,28 @@ class RulePopulationAccessViolationError(Exception):
 
 
 class RulePopulation(object):
+    _copied_on_write = ('_all_non_terminal_rules', '_all_terminal_rules',
+                        '_non_terminal_rule_list', '_non_terminal_rule_indexes',
+                        '_rules_by_right', '_terminal_rules')
+    _bucketed = ('_rules_by_right', '_terminal_rules')
+
     def __init__(self, starting_symbol, universal_symbol=None, previous_instance=None,
                  max_non_terminal_symbols=32):
         self._all_non_terminal_rules = set()
         self._all_terminal_rules = set()
+        self._non_terminal_rule_list = []
+        self._non_terminal_rule_indexes = dict()
         self._rules_by_right = dict()
         self._terminal_rules = dict()
         self._starting_symbol = starting_symbol
         self._universal_symbol = universal_symbol
         self._max_non_terminal_symbols = max_non_terminal_symbols
+        self._rule_change_journal = RuleChangeJournal()
+        self._subscribers = []
+        self._compiled_grammar = None
+        self._is_frozen = False
+        self._shared_fields = set()
+        self._owned_buckets = dict()
 
     @property
     def starting_symbol(self):
@@ -33,6 +50,84 @@ class RulePopulation(object):
     def max_non_terminal_symbols(self):
         return self._max_non_terminal_symbols
 
+    @property
+    def version(self):
+        return self._rule_change_journal.version
+
+    @property
+    def rule_change_journal(self):
+        return self._rule_change_journal
+
+    def subscribe(self, subscriber):
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.remove(subscriber)
+
+    @property
+    def is_frozen(self):
+        return self._is_frozen
+
+    def snapshot(self):
+        return self if self._is_frozen else self._share(True)
+
+    def copy(self):
+        return self._share(False)
+
+    def _share(self, is_frozen):
+        shared = copy.copy(self)
+        shared._rule_change_journal = RuleChangeJournal(version=self.version)
+        shared._is_frozen = is_frozen
+        shared._shared_fields = set(self._copied_on_write)
+        shared._owned_buckets = dict()
+        self._shared_fields = set(self._copied_on_write)
+        return shared
+
+    def _writable(self, field):
+        if self._is_frozen:
+            raise RulePopulationAccessViolationError('Rule population snapshot is read-only')
+
+        value = getattr(self, field)
+        if field in self._shared_fields:
+            self._shared_fields.remove(field)
+            value = copy.copy(value)
+            setattr(self, field, value)
+            if field in self._bucketed:
+                self._owned_buckets[field] = set()
+
+        return value
+
+    def _writable_bucket(self, field, key):
+        buckets = self._writable(field)
+        owned_buckets = self._owned_buckets.get(field)
+        if owned_buckets is not None and key not in owned_buckets:
+            if key in buckets:
+                buckets[key] = dict(buckets[key])
+            owned_buckets.add(key)
+
+        return buckets
+
+    @property
+    def compiled_grammar(self):
+        if self._compiled_grammar is None:
+            self._compiled_grammar = CompiledGrammar(self)
+            self.subscribe(self._compiled_grammar.on_rule_change)
+
+        return self._compiled_grammar
+
+    def _record_rule_change(self, kind, rule=None):
+        change = self._rule_change_journal.record(kind, rule)
+        for subscriber in list(self._subscribers):
+            subscriber(change)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_subscribers'] = []
+        state['_compiled_grammar'] = None
+        state['_shared_fields'] = set()
+        state['_owned_buckets'] = dict()
+        return state
+
     @staticmethod
     def symbol_shift():
         return 101
@@ -59,25 +154,33 @@ class RulePopulation(object):
     def add_rule(self, rule, randomizer):
         if rule.is_terminal_rule():
             self._add_terminal_rule(rule, randomizer)
-            self._all_terminal_rules.add(rule)
+            self._writable('_all_terminal_rules').add(rule)
         else:
             self._add_non_terminal_rule(rule, randomizer)
-            self._all_non_terminal_rules.add(rule)
+            if rule not in self._non_terminal_rule_indexes:
+                self._writable('_non_terminal_rule_indexes')[rule] = \
+                    len(self._non_terminal_rule_list)
+                self._writable('_non_terminal_rule_list').append(rule)
+            self._writable('_all_non_terminal_rules').add(rule)
+
+        self._record_rule_change(RuleChangeKind.added, rule)
 
     def _add_non_terminal_rule(self, rule, randomizer):
         by_right_key = (rule.left_child, rule.right_child)
-        if by_right_key not in self._rules_by_right:
-            self._rules_by_right[by_right_key] = dict()
+        rules_by_right = self._writable_bucket('_rules_by_right', by_right_key)
+        if by_right_key not in rules_by_right:
+            rules_by_right[by_right_key] = dict()
 
         # if there is already such an rule, then make mess
-        self._rules_by_right[by_right_key][rule.parent] = rule
+        rules_by_right[by_right_key][rule.parent] = rule
 
     def _add_terminal_rule(self, rule, randomizer):
-        if rule.left_child not in self._terminal_rules:
-            self._terminal_rules[rule.left_child] = dict()
+        terminal_rules = self._writable_bucket('_terminal_rules', rule.left_child)
+        if rule.left_child not in terminal_rules:
+            terminal_rules[rule.left_child] = dict()
 
         # if there is already such an rule, then make mess
-        self._terminal_rules[rule.left_child][rule.parent] = rule
+        terminal_rules[rule.left_child][rule.parent] = rule
 
     def get_terminal_rules(self, symbol=None):
         if symbol is None:
@@ -87,34 +190,68 @@ class RulePopulation(object):
             return packed_rules.values() if packed_rules else []
 
     def get_random_non_terminal_symbol(self, randomizer):
-        return Symbol(randomizer.randint(self.symbol_shift(),
-                                         self.symbol_shift() + self.max_non_terminal_symbols))
+        return Symbol.of(randomizer.randint(self.symbol_shift(),
+                                            self.symbol_shift() + self.max_non_terminal_symbols))
 
     def get_random_rules(self, randomizer, terminal, size):
-        real_size = min(size, len(self._all_non_terminal_rules))
-        return randomizer.sample(self._all_non_terminal_rules, real_size)
+        rules = self._non_terminal_rule_list
+        real_size = min(size, len(rules))
+        return [rules[i] for i in randomizer.sample(range(len(rules)), real_size)]
+
+    def _remove_from_non_terminal_rule_list(self, rule):
+        rule_indexes = self._writable('_non_terminal_rule_indexes')
+        rule_list = self._writable('_non_terminal_rule_list')
+        index = rule_indexes.pop(rule)
+        last_rule = rule_list.pop()
+        if index < len(rule_list):
+            rule_list[index] = last_rule
+            rule_indexes[last_rule] = index
 
     def remove_rule(self, rule):
         terminal = rule.is_terminal_rule()
         if not terminal:
             right_key = rule.left_child, rule.right_child
-            self._all_non_terminal_rules.remove(rule)
+            buckets_field = '_rules_by_right'
+            self._writable('_all_non_terminal_rules').remove(rule)
+            self._remove_from_non_terminal_rule_list(rule)
         else:
             right_key = rule.left_child
-            self._all_terminal_rules.remove(rule)
-        del self._rules_by_right[right_key][rule.parent]
-        if not self._rules_by_right[right_key]:
-            del self._rules_by_right[right_key]
+            buckets_field = '_terminal_rules'
+            self._writable('_all_terminal_rules').remove(rule)
+        buckets = self._writable_bucket(buckets_field, right_key)
+        del buckets[right_key][rule.parent]
+        if not buckets[right_key]:
+            del buckets[right_key]
+
+        self._record_rule_change(RuleChangeKind.removed, rule)
 
     def get_random_rules_matching_filter(self, randomizer, terminal, size, filter):
-        filtered_rules = [x for x in self.get_all_non_terminal_rules() if filter(x)]
-        real_size = min(size, len(filtered_rules))
-        return randomizer.sample(filtered_rules, real_size)
+        rules = self._non_terminal_rule_list
+        last_index = len(rules) - 1
+        swapped_indexes = dict()
+        selected_rules = []
+        for i in range(len(rules)):
+            if len(selected_rules) >= size:
+                break
+
+            j = randomizer.randint(i, last_index)
+            rule = rules[swapped_indexes.get(j, j)]
+            swapped_indexes[j] = swapped_indexes.get(i, i)
+            if filter(rule):
+                selected_rules.append(rule)
+
+        return selected_rules
 
     def has_rule(self, rule):
         return rule in (self._terminal_rules if rule.is_terminal_rule()
                         else self._all_non_terminal_rules)
 
+    def get_probability_tables(self):
+        return None
+
+    def set_probability_tables(self, probability_tables):
+        pass
+
     def json_coder(self):
         terminal_rules = self.get_terminal_rules()
         non_terminal_rules = self.get_all_non_terminal_rules()
@@ -128,6 +265,9 @@ class RulePopulation(object):
 
 
 class StochasticRulePopulation(RulePopulation):
+    _copied_on_write = RulePopulation._copied_on_write + \
+        ('rule_probabilities', 'left_side_probabilities')
+
     def __init__(self, starting_symbol, universal_symbol=None, previous_instance=None,
                  max_non_terminal_symbols=32):
         super().__init__(starting_symbol, universal_symbol, previous_instance,
@@ -136,23 +276,23 @@ class StochasticRulePopulation(RulePopulation):
         self.left_side_probabilities = dict()
 
     def add_rule(self, rule, randomizer):
-        super().add_rule(rule, randomizer)
         new_rule_probability = randomizer.uniform(0.01, 1)
         self._add_new_rule_probability(rule, new_rule_probability)
+        super().add_rule(rule, randomizer)
 
     def _add_new_rule_probability(self, rule, new_rule_probability):
-        self.rule_probabilities[rule] = new_rule_probability
+        self._writable('rule_probabilities')[rule] = new_rule_probability
 
-        if rule.parent not in self.left_side_probabilities:
-            self.left_side_probabilities[rule.parent] = new_rule_probability
+        left_side_probabilities = self._writable('left_side_probabilities')
+        if rule.parent not in left_side_probabilities:
+            left_side_probabilities[rule.parent] = new_rule_probability
         else:
-            self.left_side_probabilities[rule.parent] += new_rule_probability
+            left_side_probabilities[rule.parent] += new_rule_probability
 
     def remove_rule(self, rule):
+        probability_of_removed = self._writable('rule_probabilities').pop(rule)
+        self._writable('left_side_probabilities')[rule.parent] -= probability_of_removed
         super().remove_rule(rule)
-        probability_of_removed = self.rule_probabilities[rule]
-        del self.rule_probabilities[rule]
-        self.left_side_probabilities[rule.parent] -= probability_of_removed
 
     def get_normalized_rule_probability(self, rule):
         left_side_probability = self.left_side_probabilities.get(rule.parent, 1)
@@ -160,8 +300,9 @@ class StochasticRulePopulation(RulePopulation):
             left_side_probability if left_side_probability > 0 else 1
 
     def perform_probability_estimation(self, fitness_getter):
-        for parent in self.left_side_probabilities:
-            self.left_side_probabilities[parent] = 0
+        left_side_probabilities = self._writable('left_side_probabilities')
+        for parent in left_side_probabilities:
+            left_side_probabilities[parent] = 0
 
         for rule in self.get_all_non_terminal_rules():
             fitness = fitness_getter(rule)
@@ -170,10 +311,36 @@ class StochasticRulePopulation(RulePopulation):
             fitness = fitness_getter(rule)
             self._add_new_rule_probability(rule, fitness)
 
-        for rule in self.rule_probabilities:
-            self.rule_probabilities[rule] = self.get_normalized_rule_probability(rule)
-        for parent in self.left_side_probabilities:
-            self.left_side_probabilities[parent] = 1
+        rule_probabilities = self._writable('rule_probabilities')
+        for rule in rule_probabilities:
+            rule_probabilities[rule] = self.get_normalized_rule_probability(rule)
+        for parent in left_side_probabilities:
+            left_side_probabilities[parent] = 1
+        self._record_rule_change(RuleChangeKind.probabilities_updated)
+
+    def update_rule_probabilities(self, rule_probabilities):
+        current_probabilities = self._writable('rule_probabilities')
+        for rule, probability in rule_probabilities.items():
+            if rule in current_probabilities:
+                current_probabilities[rule] = probability
+
+        left_side_probabilities = self._writable('left_side_probabilities')
+        for parent in left_side_probabilities:
+            left_side_probabilities[parent] = 0
+        for rule, probability in current_probabilities.items():
+            left_side_probabilities[rule.parent] += probability
+        self._record_rule_change(RuleChangeKind.probabilities_updated)
+
+    def get_probability_tables(self):
+        return dict(self.rule_probabilities), dict(self.left_side_probabilities)
+
+    def set_probability_tables(self, probability_tables):
+        rule_probabilities, left_side_probabilities = probability_tables
+        self._writable('rule_probabilities')
+        self._writable('left_side_probabilities')
+        self.rule_probabilities = dict(rule_probabilities)
+        self.left_side_probabilities = dict(left_side_probabilities)
+        self._record_rule_change(RuleChangeKind.probabilities_updated)
 
     def json_coder(self):
         terminal_rules = self.get_terminal_rules()
@@ -186,5 +353,5 @@ class StochasticRulePopulation(RulePopulation):
     def json_decoder(self, json, randomizer):
         for jsonized_rule in json[1:]:
             rule = Rule.json_decoder(jsonized_rule[1:])
-            super().add_rule(rule, randomizer)
             self._add_new_rule_probability(rule, jsonized_rule[0])
+            super().add_rule(rule, randomizer)
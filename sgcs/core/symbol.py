@@ -3,10 +3,31 @@ from utils import RunTimes
 
 
 class Symbol(SimpleJsonNode):
+    __slots__ = ('symbol_id', '_hash')
+
     ALPHABET_SIZE = ord('z') - ord('a')
+    _interned = dict()
 
     def __init__(self, symbol_id=None):
         self.symbol_id = symbol_id
+        self._hash = hash(symbol_id)
+
+    @staticmethod
+    def of(symbol_id):
+        symbol = Symbol._interned.get(symbol_id)
+        if symbol is None:
+            symbol = Symbol._interned.setdefault(symbol_id, Symbol(symbol_id))
+
+        return symbol
+
+    def to_json(self, jsonizer):
+        return {'symbol_id': self.symbol_id, jsonizer.node_id: type(self).__name__}
+
+    def from_json(self, state, jsonizer):
+        return Symbol.of(state['symbol_id'])
+
+    def __reduce__(self):
+        return Symbol.of, (self.symbol_id,)
 
     def human_friendly_representation(self, abs_shift):
         remainder = self.symbol_id - abs_shift + 1
@@ -26,16 +47,16 @@ class Symbol(SimpleJsonNode):
         for letter in human_repr:
             acc = acc * Symbol.ALPHABET_SIZE + (ord(letter.lower()) - ord('a'))
 
-        return Symbol(acc + abs_shift - 1)
+        return Symbol.of(acc + abs_shift - 1)
 
     def __eq__(self, other):
-        return self.symbol_id == other.symbol_id
+        return self is other or self.symbol_id == other.symbol_id
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __hash__(self):
-        return self.symbol_id.__hash__()
+        return self._hash
 
     def __repr__(self):
         return self.__class__.__name__ + '({' + str(self.symbol_id) + "})"
@@ -49,6 +70,18 @@ class Sentence(object):
     def __len__(self):
         return len(self.symbols)
 
+    @staticmethod
+    def collapse_duplicates(sentences):
+        multiplicities = dict()
+        for sentence in sentences:
+            key = tuple(sentence.symbols), sentence.is_positive_sentence
+            if key in multiplicities:
+                multiplicities[key][1] += 1
+            else:
+                multiplicities[key] = [sentence, 1]
+
+        return [(sentence, count) for sentence, count in multiplicities.values()]
+
     def get_symbol(self, index):
         return self.symbols[index]
 
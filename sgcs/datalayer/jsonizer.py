@@ -4,6 +4,8 @@ import collections
 
 
 class SimpleJsonNode(object):
+    __slots__ = ()
+
     def to_json(self, jsonizer):
         name = type(self).__name__
         node_dict = copy.copy(self.__dict__)
@@ -52,8 +54,7 @@ class BasicJsonizer(object):
         instance = class_object()
         state = copy.copy(json)
         del state[self.node_id]
-        instance.from_json(state, self)
-        return instance
+        return instance.from_json(state, self)
 
 
 class RulePopulationJsonizer(object):
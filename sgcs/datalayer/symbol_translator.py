@@ -67,7 +67,7 @@ class SymbolTranslator(object):
         symbol_id = self.word_to_id_map.get(word)
         if symbol_id is None:
             raise UnknownWord(word)
-        return Symbol(symbol_id)
+        return Symbol.of(symbol_id)
 
     def rule_population_to_string(self, rule_population):
         name = type(rule_population).__name__
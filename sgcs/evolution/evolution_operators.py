@@ -45,7 +45,7 @@ class InversionOperator(EvolutionOperator):
 
     def apply_impl(self, service, rule_population, *rules):
         rule, = rules
-        return Rule(rule.parent, rule.right_child, rule.left_child),
+        return Rule.of(rule.parent, rule.right_child, rule.left_child),
 
 
 # noinspection PyAbstractClass
@@ -64,7 +64,7 @@ class ParentMutationOperator(MutationOperator):
         parent = rule_population.get_random_non_terminal_symbol(service.randomizer) \
             if service.randomizer.perform_with_chance(self.get_execution_chance(service)) \
             else rule.parent
-        return Rule(parent, rule.left_child, rule.right_child),
+        return Rule.of(parent, rule.left_child, rule.right_child),
 
 
 # noinspection PyAbstractClass
@@ -74,7 +74,7 @@ class LeftChildMutationOperator(MutationOperator):
         left_child = rule_population.get_random_non_terminal_symbol(service.randomizer) \
             if service.randomizer.perform_with_chance(self.get_execution_chance(service)) \
             else rule.left_child
-        return Rule(rule.parent, left_child, rule.right_child),
+        return Rule.of(rule.parent, left_child, rule.right_child),
 
 
 # noinspection PyAbstractClass
@@ -84,7 +84,7 @@ class RightChildMutationOperator(MutationOperator):
         right_child = rule_population.get_random_non_terminal_symbol(service.randomizer) \
             if service.randomizer.perform_with_chance(self.get_execution_chance(service)) \
             else rule.right_child
-        return Rule(rule.parent, rule.left_child, right_child),
+        return Rule.of(rule.parent, rule.left_child, right_child),
 
 
 class CrossoverOperator(EvolutionOperator):
@@ -97,11 +97,11 @@ class CrossoverOperator(EvolutionOperator):
     def apply_impl(self, service, rule_population, *rules):
         rule_1, rule_2 = rules
         if service.randomizer.perform_with_chance(0.5):
-            rule_1, rule_2 = Rule(rule_1.parent, rule_2.left_child, rule_1.right_child), \
-                             Rule(rule_2.parent, rule_1.left_child, rule_2.right_child)
+            rule_1, rule_2 = Rule.of(rule_1.parent, rule_2.left_child, rule_1.right_child), \
+                             Rule.of(rule_2.parent, rule_1.left_child, rule_2.right_child)
         else:
-            rule_1, rule_2 = Rule(rule_1.parent, rule_1.left_child, rule_2.right_child), \
-                             Rule(rule_2.parent, rule_2.left_child, rule_1.right_child)
+            rule_1, rule_2 = Rule.of(rule_1.parent, rule_1.left_child, rule_2.right_child), \
+                             Rule.of(rule_2.parent, rule_2.left_child, rule_1.right_child)
 
-        return Rule(rule_2.parent, rule_1.left_child, rule_1.right_child), \
-            Rule(rule_1.parent, rule_2.left_child, rule_2.right_child)
+        return Rule.of(rule_2.parent, rule_1.left_child, rule_1.right_child), \
+            Rule.of(rule_1.parent, rule_2.left_child, rule_2.right_child)
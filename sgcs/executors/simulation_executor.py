@@ -20,7 +20,9 @@ from evolution.evolution_configuration import EvolutionConfiguration, EvolutionO
     EvolutionRouletteSelectorConfiguration
 from gui.proxy.simulator_proxy import PyQtAwareAsyncGcsSimulator
 from induction.cyk_configuration import CoverageConfiguration, CoverageOperatorConfiguration, \
-    CoverageOperatorsConfiguration, CykConfiguration, GrammarCorrection
+    CoverageOperatorsConfiguration, CykConfiguration, GrammarCorrection, SpanCaching, \
+    IncrementalParsing, SentenceCollapsing, ParallelParsing, WavefrontParsing, \
+    InsideOutsideEstimation, BeamPruning, CoReachabilityFiltering
 from rule_adding import AddingRulesConfiguration, CrowdingConfiguration, ElitismConfiguration
 from statistics.grammar_statistics import ClassicalStatisticsConfiguration, \
     PasiekaStatisticsConfiguration
@@ -112,6 +114,14 @@ class SimulationExecutor(object):
             CoverageOperatorsConfiguration,
             CykConfiguration,
             GrammarCorrection,
+            SpanCaching,
+            IncrementalParsing,
+            SentenceCollapsing,
+            ParallelParsing,
+            WavefrontParsing,
+            InsideOutsideEstimation,
+            BeamPruning,
+            CoReachabilityFiltering,
             ClassicalStatisticsConfiguration,
             PasiekaStatisticsConfiguration,
             EvolutionRandomSelectorConfiguration,
@@ -172,7 +182,7 @@ class SimulationExecutor(object):
         if population_path is not None:
             pop_path = os.path.dirname(population_path)
             pop_name = os.path.basename(population_path).split('.')[0]
-            starting_pop = self.load_population(pop_path, pop_name, starting_symbol=Symbol(1))
+            starting_pop = self.load_population(pop_path, pop_name, starting_symbol=Symbol.of(1))
             starting_rules = list(starting_pop.get_all_non_terminal_rules())
             starting_rules += starting_pop.get_terminal_rules()
         else:
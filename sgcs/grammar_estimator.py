@@ -49,14 +49,14 @@ class EvolutionStepEstimator(object):
     def append_result(self, cyk_result):
         if cyk_result.is_positive:
             if cyk_result.belongs_to_grammar:
-                self._true_positive += 1
+                self._true_positive += cyk_result.multiplicity
             else:
-                self._false_negative += 1
+                self._false_negative += cyk_result.multiplicity
         else:
             if cyk_result.belongs_to_grammar:
-                self._false_positive += 1
+                self._false_positive += cyk_result.multiplicity
             else:
-                self._true_negative += 1
+                self._true_negative += cyk_result.multiplicity
 
 
 class InvalidGrammarCriteriaAddingOperation(Exception):
@@ -13,7 +13,9 @@ from evolution.evolution_configuration import EvolutionConfiguration, EvolutionO
     EvolutionRouletteSelectorConfiguration
 from gui.dynamic_gui import AutoUpdater
 from induction.cyk_configuration import CoverageConfiguration, CoverageOperatorConfiguration, \
-    CoverageOperatorsConfiguration, CykConfiguration, GrammarCorrection
+    CoverageOperatorsConfiguration, CykConfiguration, GrammarCorrection, SpanCaching, \
+    IncrementalParsing, SentenceCollapsing, ParallelParsing, WavefrontParsing, \
+    InsideOutsideEstimation, BeamPruning, CoReachabilityFiltering
 from rule_adding import AddingRulesConfiguration, CrowdingConfiguration, ElitismConfiguration
 from statistics.grammar_statistics import ClassicalStatisticsConfiguration
 
@@ -42,6 +44,14 @@ class MainBoxAutoUpdater(AutoUpdater):
             CoverageOperatorsConfiguration,
             CykConfiguration,
             GrammarCorrection,
+            SpanCaching,
+            IncrementalParsing,
+            SentenceCollapsing,
+            ParallelParsing,
+            WavefrontParsing,
+            InsideOutsideEstimation,
+            BeamPruning,
+            CoReachabilityFiltering,
             ClassicalStatisticsConfiguration,
             EvolutionRandomSelectorConfiguration,
             EvolutionTournamentSelectorConfiguration,
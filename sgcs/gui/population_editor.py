@@ -132,7 +132,7 @@ class RuleView(object):
 class LoadPopulationWorker(QtCore.QThread):
     TRANSLATOR_READY_SIGNAL = 'TRANSLATOR_READY_SIGNAL'
     POPULATION_LOADED_SIGNAL = 'POPULATION_LOADED_SIGNAL'
-    STARTING_SYMBOL = Symbol(1)
+    STARTING_SYMBOL = Symbol.of(1)
 
     def __init__(self, population_editor):
         super().__init__(population_editor.widget)
@@ -204,7 +204,7 @@ class LoadPopulationWorker(QtCore.QThread):
                 )
                 terminal_symbol = self.translator.word_to_symbol(terminal_word)
 
-                population.add_rule(Rule(parent, terminal_symbol), self.randomizer)
+                population.add_rule(Rule.of(parent, terminal_symbol), self.randomizer)
             else:
                 parent, left, right = Rule.from_human_friendly_representation(
                     population.symbol_shift(),
@@ -215,7 +215,7 @@ class LoadPopulationWorker(QtCore.QThread):
                     rule_model.right_child
                 )
 
-                population.add_rule(Rule(parent, left, right), self.randomizer)
+                population.add_rule(Rule.of(parent, left, right), self.randomizer)
 
         name = os.path.basename(self.population_editor.population_path).split('.')[0]
         path = os.path.dirname(self.population_editor.population_path)
@@ -59,9 +59,9 @@ class PyQtAwareAsyncGcsSimulator(AsyncGcsSimulator):
         return PyQtAwareGcsRunner(
             self.randomizer, run_no, self.pyqt_hook, self.task_no, self.algorithm_variant)
 
-    def _generalization_run(self, conf, rules, sentences):
+    def _generalization_run(self, configuration, rule_population, sentences):
         self.pyqt_hook.put((self.TESTING_HAS_STARTED_SIGNAL, (self.task_no,)))
-        result = super()._generalization_run(conf, rules, sentences)
+        result = super()._generalization_run(configuration, rule_population, sentences)
 
         return result
 
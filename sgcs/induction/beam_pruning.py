@@ -0,0 +1,37 @@
+def beam_pruned_effectors(effectors, effector_probabilities, max_effectors, relative_threshold):
+    ranked = sorted(effectors, key=lambda effector: effector_probabilities[effector],
+                    reverse=True)
+    if not ranked:
+        return set()
+
+    threshold = effector_probabilities[ranked[0]] * relative_threshold
+    kept = ranked[:max_effectors] if max_effectors > 0 else ranked
+    return set(ranked) - {effector for effector in kept
+                          if effector_probabilities[effector] >= threshold}
+
+
+class BeamPruningReport(object):
+    def __init__(self):
+        self.pruned_effectors = 0
+        self.pruned_sentences = 0
+        self.changed_results = 0
+
+    def record(self, environment, cyk_result, create_recognizer):
+        if not environment.pruned_effectors:
+            return
+
+        self.pruned_effectors += environment.pruned_effectors
+        self.pruned_sentences += cyk_result.multiplicity
+        if not cyk_result.belongs_to_grammar and \
+                create_recognizer().belongs_to_grammar(environment.sentence):
+            self.changed_results += cyk_result.multiplicity
+
+    def merge(self, other):
+        self.pruned_effectors += other.pruned_effectors
+        self.pruned_sentences += other.pruned_sentences
+        self.changed_results += other.changed_results
+
+    def __str__(self):
+        return '{0}(pruned effectors: {1}; pruned sentences: {2}; changed results: {3})'.format(
+            self.__class__.__name__, self.pruned_effectors, self.pruned_sentences,
+            self.changed_results)
@@ -0,0 +1,143 @@
+from induction.cyk_executors import CykResult
+
+
+def bit_indexes(mask):
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+class BitsetGrammar(object):
+    def __init__(self, rule_population, rule_filter=None):
+        self.symbols = []
+        self.symbol_indexes = dict()
+        self.terminal_masks = dict()
+
+        non_terminal_rules = [rule for rule in rule_population.get_all_non_terminal_rules()
+                              if rule_filter is None or rule_filter(rule)]
+        terminal_rules = [rule for rule in rule_population.get_terminal_rules()
+                          if rule_filter is None or rule_filter(rule)]
+
+        for rule in non_terminal_rules:
+            self.symbol_index(rule.parent)
+            self.symbol_index(rule.left_child)
+            self.symbol_index(rule.right_child)
+
+        for rule in terminal_rules:
+            self.terminal_masks[rule.left_child] = \
+                self.terminal_masks.get(rule.left_child, 0) | self.mask_of(rule.parent)
+
+        size = len(self.symbols)
+        self.pair_table = [[0] * size for _ in range(size)]
+        for rule in non_terminal_rules:
+            left, right = self.symbol_indexes[rule.left_child], \
+                self.symbol_indexes[rule.right_child]
+            self.pair_table[left][right] |= 1 << self.symbol_indexes[rule.parent]
+
+        self._pairs_by_left = [[(1 << right, parents) for right, parents in enumerate(row)
+                                if parents] for row in self.pair_table]
+        self._left_children_mask = sum(1 << left for left, pairs in
+                                       enumerate(self._pairs_by_left) if pairs)
+        self._right_children_mask = 0
+        for pairs in self._pairs_by_left:
+            for right_bit, _ in pairs:
+                self._right_children_mask |= right_bit
+
+    def symbol_index(self, symbol):
+        index = self.symbol_indexes.get(symbol)
+        if index is None:
+            index = len(self.symbols)
+            self.symbol_indexes[symbol] = index
+            self.symbols.append(symbol)
+
+        return index
+
+    def mask_of(self, symbol):
+        return 1 << self.symbol_index(symbol)
+
+    def symbols_of(self, mask):
+        return [self.symbols[index] for index in bit_indexes(mask)]
+
+    def terminal_mask(self, terminal_symbol):
+        return self.terminal_masks.get(terminal_symbol, 0)
+
+    def combine(self, left_mask, right_mask):
+        right_mask &= self._right_children_mask
+        if not right_mask:
+            return 0
+
+        parents = 0
+        for left in bit_indexes(left_mask & self._left_children_mask):
+            for right_bit, parent_mask in self._pairs_by_left[left]:
+                if right_mask & right_bit:
+                    parents |= parent_mask
+
+        return parents
+
+
+class BitsetRecognizer(object):
+    def __init__(self, rule_population, rule_filter=None):
+        self.grammar = BitsetGrammar(rule_population, rule_filter)
+        starting_index = self.grammar.symbol_indexes.get(rule_population.starting_symbol)
+        self.starting_mask = 0 if starting_index is None else 1 << starting_index
+
+    @staticmethod
+    def row_offsets(size):
+        return [row * size - row * (row - 1) // 2 for row in range(size)]
+
+    def fill_chart(self, sentence, row_count=None):
+        size = len(sentence)
+        offsets = self.row_offsets(size)
+        chart = [0] * (size * (size + 1) // 2)
+        for col in range(size):
+            chart[col] = self.grammar.terminal_mask(sentence.get_symbol(col))
+
+        for row in range(1, size if row_count is None else row_count):
+            for col in range(size - row):
+                chart[offsets[row] + col] = self._fill_cell(chart, offsets, row, col)
+
+        return chart
+
+    def _fill_cell(self, chart, offsets, row, col):
+        combine = self.grammar.combine
+        parents = 0
+        for shift in range(1, row + 1):
+            left_mask = chart[offsets[shift - 1] + col]
+            right_mask = chart[offsets[row - shift] + col + shift]
+            if left_mask and right_mask:
+                parents |= combine(left_mask, right_mask)
+
+        return parents
+
+    def _derives_starting_symbol(self, chart, offsets, size):
+        row = size - 1
+        for shift in range(1, row + 1):
+            left_mask = chart[offsets[shift - 1]]
+            right_mask = chart[offsets[row - shift] + shift]
+            if left_mask and right_mask and \
+                    self.grammar.combine(left_mask, right_mask) & self.starting_mask:
+                return True
+
+        return False
+
+    def covers_all_terminals(self, sentence):
+        terminal_mask = self.grammar.terminal_mask
+        return all(terminal_mask(symbol) for symbol in sentence.symbols)
+
+    def belongs_to_grammar(self, sentence):
+        size = len(sentence)
+        if not size or not self.starting_mask or not self.covers_all_terminals(sentence):
+            return False
+
+        chart = self.fill_chart(sentence, size - 1)
+        if size == 1:
+            return bool(chart[0] & self.starting_mask)
+
+        return self._derives_starting_symbol(chart, self.row_offsets(size), size)
+
+    def perform_cyk(self, sentence):
+        result = CykResult()
+        result.belongs_to_grammar = self.belongs_to_grammar(sentence)
+        result.is_positive = sentence.is_positive_sentence
+        return result
@@ -98,7 +98,7 @@ class TerminalCoverageOperator(CoverageOperator):
         parent = rule_population.get_random_non_terminal_symbol(cyk_service.randomizer)
         return self.production(
             coordinates,
-            TerminalRule(parent, environment.get_sentence_symbol(coordinates[1])))
+            TerminalRule.of(parent, environment.get_sentence_symbol(coordinates[1])))
 
     def get_chance(self, cyk_service):
         return cyk_service.configuration.coverage.operators.terminal.chance
@@ -121,7 +121,7 @@ class UniversalCoverageOperator(CoverageOperator):
 
         return self.production(
             coordinates,
-            TerminalRule(rule_population.universal_symbol, child))
+            TerminalRule.of(rule_population.universal_symbol, child))
 
     def get_chance(self, cyk_service):
         return cyk_service.configuration.coverage.operators.universal.chance
@@ -140,7 +140,7 @@ class StartingCoverageOperator(CoverageOperator):
             only_symbol = environment.get_sentence_symbol(0)
             return self.production(
                 coordinates,
-                TerminalRule(rule_population.starting_symbol, only_symbol))
+                TerminalRule.of(rule_population.starting_symbol, only_symbol))
         else:
             return self.empty_production(coordinates)
 
@@ -176,7 +176,7 @@ class AggressiveCoverageOperator(CoverageOperator):
                 parent = self._select_parent(cyk_service, rule_population)
                 return Production(
                     selected_detector,
-                    Rule(parent, *children))
+                    Rule.of(parent, *children))
 
         return self.empty_production(coordinates)
 
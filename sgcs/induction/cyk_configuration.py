@@ -5,14 +5,40 @@ class CykConfiguration(SimpleJsonNode):
     def __init__(self):
         self._coverage = None
         self._grammar_correction = None
+        self._span_caching = None
+        self._incremental_parsing = None
+        self._sentence_collapsing = None
+        self._parallel_parsing = None
+        self._wavefront_parsing = None
+        self._inside_outside_estimation = None
+        self._beam_pruning = None
+        self._co_reachability_filtering = None
 
     @staticmethod
     def create(should_correct_grammar, terminal_chance, universal_chance, aggressive_chance,
-               starting_chance, full_chance):
+               starting_chance, full_chance, should_cache_spans=False,
+               should_parse_incrementally=False, should_collapse_sentences=False,
+               should_parse_in_parallel=False, worker_count=0,
+               should_use_wavefront=False, wavefront_length_threshold=128,
+               should_estimate_inside_outside=False, should_prune_beam=False,
+               beam_width=0, beam_threshold=0, should_filter_unreachable=False):
         configuration = CykConfiguration()
         configuration.coverage = CoverageConfiguration.create(
             terminal_chance, universal_chance, aggressive_chance, starting_chance, full_chance)
         configuration.grammar_correction = GrammarCorrection.create(should_correct_grammar)
+        configuration.span_caching = SpanCaching.create(should_cache_spans)
+        configuration.incremental_parsing = IncrementalParsing.create(should_parse_incrementally)
+        configuration.sentence_collapsing = SentenceCollapsing.create(should_collapse_sentences)
+        configuration.parallel_parsing = ParallelParsing.create(should_parse_in_parallel,
+                                                                worker_count)
+        configuration.wavefront_parsing = WavefrontParsing.create(
+            should_use_wavefront, wavefront_length_threshold, worker_count)
+        configuration.inside_outside_estimation = InsideOutsideEstimation.create(
+            should_estimate_inside_outside)
+        configuration.beam_pruning = BeamPruning.create(should_prune_beam, beam_width,
+                                                        beam_threshold)
+        configuration.co_reachability_filtering = CoReachabilityFiltering.create(
+            should_filter_unreachable)
         return configuration
 
     @property
@@ -31,6 +57,70 @@ class CykConfiguration(SimpleJsonNode):
     def grammar_correction(self, value):
         self._grammar_correction = value
 
+    @property
+    def span_caching(self):
+        return self._span_caching
+
+    @span_caching.setter
+    def span_caching(self, value):
+        self._span_caching = value
+
+    @property
+    def incremental_parsing(self):
+        return self._incremental_parsing
+
+    @incremental_parsing.setter
+    def incremental_parsing(self, value):
+        self._incremental_parsing = value
+
+    @property
+    def sentence_collapsing(self):
+        return self._sentence_collapsing
+
+    @sentence_collapsing.setter
+    def sentence_collapsing(self, value):
+        self._sentence_collapsing = value
+
+    @property
+    def parallel_parsing(self):
+        return self._parallel_parsing
+
+    @parallel_parsing.setter
+    def parallel_parsing(self, value):
+        self._parallel_parsing = value
+
+    @property
+    def wavefront_parsing(self):
+        return self._wavefront_parsing
+
+    @wavefront_parsing.setter
+    def wavefront_parsing(self, value):
+        self._wavefront_parsing = value
+
+    @property
+    def inside_outside_estimation(self):
+        return self._inside_outside_estimation
+
+    @inside_outside_estimation.setter
+    def inside_outside_estimation(self, value):
+        self._inside_outside_estimation = value
+
+    @property
+    def beam_pruning(self):
+        return self._beam_pruning
+
+    @beam_pruning.setter
+    def beam_pruning(self, value):
+        self._beam_pruning = value
+
+    @property
+    def co_reachability_filtering(self):
+        return self._co_reachability_filtering
+
+    @co_reachability_filtering.setter
+    def co_reachability_filtering(self, value):
+        self._co_reachability_filtering = value
+
 
 class CoverageConfiguration(SimpleJsonNode):
     def __init__(self):
@@ -148,6 +238,113 @@ class GrammarCorrection(SimpleJsonNode):
         return configuration
 
 
+class SpanCaching(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+
+    @staticmethod
+    def create(should_run):
+        configuration = SpanCaching()
+        configuration.should_run = should_run
+        return configuration
+
+
+class IncrementalParsing(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+
+    @staticmethod
+    def create(should_run):
+        configuration = IncrementalParsing()
+        configuration.should_run = should_run
+        return configuration
+
+
+class SentenceCollapsing(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+
+    @staticmethod
+    def create(should_run):
+        configuration = SentenceCollapsing()
+        configuration.should_run = should_run
+        return configuration
+
+
+class ParallelParsing(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+        self.worker_count = 0
+
+    @staticmethod
+    def create(should_run, worker_count=0):
+        configuration = ParallelParsing()
+        configuration.should_run = should_run
+        configuration.worker_count = worker_count
+        return configuration
+
+
+class WavefrontParsing(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+        self.length_threshold = 128
+        self.worker_count = 0
+
+    @staticmethod
+    def create(should_run, length_threshold=128, worker_count=0):
+        configuration = WavefrontParsing()
+        configuration.should_run = should_run
+        configuration.length_threshold = length_threshold
+        configuration.worker_count = worker_count
+        return configuration
+
+
+class InsideOutsideEstimation(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+
+    @staticmethod
+    def create(should_run):
+        configuration = InsideOutsideEstimation()
+        configuration.should_run = should_run
+        return configuration
+
+
+class BeamPruning(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+        self.max_effectors = 0
+        self.relative_threshold = 0
+
+    @staticmethod
+    def create(should_run, max_effectors=0, relative_threshold=0):
+        configuration = BeamPruning()
+        configuration.should_run = should_run
+        configuration.max_effectors = max_effectors
+        configuration.relative_threshold = relative_threshold
+        configuration.validate()
+        return configuration
+
+    def validate(self):
+        if self.max_effectors < 0:
+            raise InvalidCykConfigurationError(
+                'Beam width must not be negative; got {0}'.format(self.max_effectors))
+        if not 0 <= self.relative_threshold <= 1:
+            raise InvalidCykConfigurationError(
+                'Beam threshold must lie in [0, 1]; got {0}'.format(self.relative_threshold))
+
+
+class CoReachabilityFiltering(SimpleJsonNode):
+    def __init__(self):
+        self.should_run = False
+
+    @staticmethod
+    def create(should_run):
+        configuration = CoReachabilityFiltering()
+        configuration.should_run = should_run
+        return configuration
+
+
 class InvalidCykConfigurationError(Exception):
     def __init__(self, error):
         self.error = error
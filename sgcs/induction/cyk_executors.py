@@ -1,5 +1,7 @@
 from induction.coverage_operators import CoverageType
+from induction.span_cache import execute_with_span_cache
 from sgcs.induction.detector import Detector
+from sgcs.induction.production import Production
 
 
 class CykTypeId(object):
@@ -18,6 +20,7 @@ class CykResult(object):
     def __init__(self):
         self.belongs_to_grammar = False
         self.is_positive = None
+        self.multiplicity = 1
 
     def __str__(self):
         props = ['belongs?:{0}'.format('Y' if self.belongs_to_grammar else 'N')]
@@ -56,6 +59,10 @@ class CykTableExecutor(CykExecutor):
             child_executor = self.create_child_executor(self, row, self.cyk_service)
             child_executor.execute(environment, rule_population)
 
+        return self._create_result(environment, rule_population)
+
+    def _create_result(self, environment, rule_population):
+        sentence_length = environment.get_sentence_length()
         if not self._belongs_to_grammar(rule_population, environment):
             last_cell_coordinates = sentence_length - 1, 0
             self.cyk_service.coverage_operations.perform_coverage(
@@ -70,6 +77,11 @@ class CykTableExecutor(CykExecutor):
         result.is_positive = environment.is_sentence_positive()
         return result
 
+    def _filter_cell(self, environment, rule_population, coordinates):
+        if self.cyk_service.filters_unreachable_symbols:
+            environment.filter_cell(coordinates,
+                                    rule_population.compiled_grammar.reachable_symbols)
+
 
 class CykStochasticTableExecutor(CykTableExecutor):
     @staticmethod
@@ -77,6 +89,12 @@ class CykStochasticTableExecutor(CykTableExecutor):
         return environment.get_most_probable_production_for(
             rule_population.starting_symbol) is not None
 
+    def _prune_cell(self, environment, coordinates):
+        beam_pruning = self.cyk_service.beam_pruning
+        if beam_pruning is not None:
+            environment.prune_cell(coordinates, beam_pruning.max_effectors,
+                                   beam_pruning.relative_threshold)
+
 
 class CykRowExecutor(CykExecutor):
     def __init__(self, table_executor, row, cyk_service):
@@ -255,3 +273,115 @@ class CykStochasticSymbolPairExecutor(CykSymbolPairExecutor):
         set_probabilities(productions, rule_population)
 
         self._add_productions(environment, productions)
+
+
+class FullChartRefresh(object):
+    @staticmethod
+    def prepare_cell(coordinates):
+        return True
+
+    @staticmethod
+    def finish_cell(coordinates):
+        pass
+
+
+class CykFusedTableExecutor(CykTableExecutor):
+    def execute(self, environment, rule_population, chart_refresh=FullChartRefresh):
+        sentence_length = environment.get_sentence_length()
+
+        for col in range(sentence_length):
+            self._execute_terminal_cell(environment, rule_population, (0, col), chart_refresh)
+
+        for row in range(1, sentence_length):
+            for col in range(environment.get_row_length(row)):
+                self._execute_cell(environment, rule_population, (row, col), chart_refresh)
+
+        return self._create_result(environment, rule_population)
+
+    def _execute_terminal_cell(self, environment, rule_population, coordinates, chart_refresh):
+        if chart_refresh.prepare_cell(coordinates):
+            execute_with_span_cache(
+                self.cyk_service.span_cache, environment, coordinates,
+                lambda: self._fill_terminal_cell(environment, rule_population, coordinates))
+
+        if environment.has_no_productions(coordinates):
+            self.cyk_service.coverage_operations.perform_coverage(
+                self.cyk_service,
+                CoverageType.unknown_terminal_symbol,
+                environment,
+                rule_population,
+                coordinates
+            )
+
+        chart_refresh.finish_cell(coordinates)
+
+    def _execute_cell(self, environment, rule_population, coordinates, chart_refresh):
+        if chart_refresh.prepare_cell(coordinates):
+            execute_with_span_cache(
+                self.cyk_service.span_cache, environment, coordinates,
+                lambda: self._fill_cell(environment, rule_population, *coordinates))
+
+        if not environment.get_symbols(coordinates):
+            self.cyk_service.coverage_operations.perform_coverage(
+                self.cyk_service,
+                CoverageType.no_effector_found,
+                environment,
+                rule_population,
+                coordinates
+            )
+
+        chart_refresh.finish_cell(coordinates)
+
+    def _fill_terminal_cell(self, environment, rule_population, coordinates):
+        grammar = rule_population.compiled_grammar
+        terminal_id = grammar.terminal_ids.get(environment.get_sentence_symbol(coordinates[1]))
+        self._add_rule_productions(environment, grammar, coordinates,
+                                   grammar.terminal_rules[terminal_id]
+                                   if terminal_id is not None else ())
+        self._filter_cell(environment, rule_population, coordinates)
+
+    def _fill_cell(self, environment, rule_population, row, col):
+        grammar = rule_population.compiled_grammar
+        for shift in range(1, row + 1):
+            left_symbol_ids = grammar.get_symbol_ids(environment.get_symbols((shift - 1, col)))
+            right_symbol_ids = grammar.get_symbol_ids(
+                environment.get_symbols((row - shift, col + shift)))
+
+            for left_id, left_symbol_id in enumerate(left_symbol_ids):
+                rules_by_right = grammar.rules_by_right[left_symbol_id] \
+                    if left_symbol_id is not None else {}
+                for right_id, right_symbol_id in enumerate(right_symbol_ids):
+                    self._add_rule_productions(environment, grammar,
+                                               (row, col, shift, left_id, right_id),
+                                               rules_by_right.get(right_symbol_id, ()))
+
+        self._filter_cell(environment, rule_population, (row, col))
+
+    def _add_rule_productions(self, environment, grammar, coordinates, rule_ids):
+        if not rule_ids:
+            environment.add_unsatisfied_detector(coordinates)
+            return
+
+        detector = Detector(coordinates)
+        for rule_id in rule_ids:
+            environment.add_production(self._create_production(grammar, detector, rule_id))
+
+    @staticmethod
+    def _create_production(grammar, detector, rule_id):
+        return Production(detector, grammar.rules[rule_id])
+
+
+class CykStochasticFusedTableExecutor(CykFusedTableExecutor, CykStochasticTableExecutor):
+    def _fill_terminal_cell(self, environment, rule_population, coordinates):
+        super()._fill_terminal_cell(environment, rule_population, coordinates)
+        self._prune_cell(environment, coordinates)
+
+    def _fill_cell(self, environment, rule_population, row, col):
+        super()._fill_cell(environment, rule_population, row, col)
+        self._prune_cell(environment, (row, col))
+
+    @staticmethod
+    def _create_production(grammar, detector, rule_id):
+        production = Production(detector, grammar.rules[rule_id])
+        production.probability = grammar.probabilities[rule_id]
+        return production
@@ -1,16 +1,30 @@
 import logging
 
+from core.symbol import Sentence
 from factory import Factory
 from induction import cyk_executors
+from induction.beam_pruning import BeamPruningReport
+from induction.bitset_recognizer import BitsetRecognizer
 from induction.coverage_operators import CoverageOperations
-from induction.environment import Environment
+from induction.cyk_configuration import InvalidCykConfigurationError
+from induction.environment import TriangularEnvironment
 from induction.grammar_corrector import GrammarCorrector
+from induction.incremental_parsing import IncrementalCykParser
+from induction.inside_outside import InsideOutsideEstimator
+from induction.parallel_cyk import ParallelCykExecutor
 from induction.production import ProductionPool
+from induction.span_cache import SpanCache
 from induction.traceback import Traceback, StochasticBestTreeTraceback
+from induction.vectorized_cyk import CykVectorizedStochasticTableExecutor, \
+    VectorizedStochasticEnvironment
+from induction.wavefront import WavefrontRecognizer
 from sgcs.induction.cyk_executors import CykTypeId
 
 
 class CykService(object):
+    supports_incremental_parsing = True
+    supports_beam_pruning = False
+
     @staticmethod
     def default(randomizer, adding_rule_supervisor):
         factory = Factory({
@@ -21,9 +35,9 @@ class CykService(object):
                 lambda table_executor, row, executor_factory:
                 cyk_executors.CykRowExecutor(table_executor, row, executor_factory) if row > 0
                 else cyk_executors.CykFirstRowExecutor(table_executor, row, executor_factory),
-            CykTypeId.table_executor: cyk_executors.CykTableExecutor,
+            CykTypeId.table_executor: cyk_executors.CykFusedTableExecutor,
             CykTypeId.production_pool: ProductionPool,
-            CykTypeId.environment: Environment,
+            CykTypeId.environment: TriangularEnvironment,
             CykTypeId.cyk_result: cyk_executors.CykResult,
             CykTypeId.terminal_cell_executor: cyk_executors.CykTerminalCellExecutor
         })
@@ -52,33 +66,187 @@ class CykService(object):
         self._rule_adding = adding_rule_supervisor
         self._traceback_creator = traceback_creator
         self._traceback = None
+        self._span_cache = None
+        self._beam_pruning = None
+        self.pruning_report = None
+        self.filters_unreachable_symbols = False
+        self.skips_hopeless_sentences = False
+        self.incremental_parser = None
+        self.parallel_cyk = None
         self.grammar_corrector = GrammarCorrector() if grammar_corrector is None \
             else grammar_corrector
 
-    def perform_cyk(self, rules_population, sentence):
+    def perform_cyk(self, rules_population, sentence, multiplicity=1):
         logging.debug(str(sentence))
-        environment = self.factory.create(CykTypeId.environment, sentence, self.factory)
-        result = self.table_executor.execute(environment, rules_population)
+        if self.span_cache is not None:
+            self.span_cache.follow(rules_population)
+        if self._is_hopeless(rules_population, sentence):
+            result = self.factory.create(CykTypeId.cyk_result)
+            result.is_positive = sentence.is_positive_sentence
+            result.multiplicity = multiplicity
+            return result
+
+        if self.incremental_parser is not None:
+            environment, result = self.incremental_parser.parse(rules_population, sentence)
+        else:
+            environment = self.factory.create(CykTypeId.environment, sentence, self.factory)
+            result = self.table_executor.execute(environment, rules_population)
+        result.multiplicity = multiplicity
+        if self.pruning_report is not None:
+            self.pruning_report.record(environment, result,
+                                       lambda: self.create_recognizer(rules_population))
         self.traceback.perform_traceback(self, environment, result, rules_population)
+        self.statistics.apply_rule_usage_batch()
         return result
 
-    def perform_cyk_for_all_sentences(self, rule_population, sentences, evolution_step_estimator,
-                                      configuration, statistics):
+    def prepare_for_step(self, configuration, statistics):
+        self._validate_incremental_parsing(configuration)
+        self._validate_beam_pruning(configuration)
         self.configuration = configuration
         self.statistics = statistics
         self.traceback = self._traceback_creator(self.statistics.statistics_visitors)
+        self._close_span_cache()
+        self.span_cache = SpanCache() \
+            if self.configuration.span_caching is not None and \
+            self.configuration.span_caching.should_run else None
+        self.beam_pruning = self.configuration.beam_pruning \
+            if self.configuration.beam_pruning is not None and \
+            self.configuration.beam_pruning.should_run else None
+        self.pruning_report = BeamPruningReport() if self.beam_pruning is not None else None
+        self.filters_unreachable_symbols = \
+            self.configuration.co_reachability_filtering is not None and \
+            self.configuration.co_reachability_filtering.should_run
+        self.skips_hopeless_sentences = self._coverage_cannot_add_rules()
+
+    def _validate_incremental_parsing(self, configuration):
+        if not self.supports_incremental_parsing and \
+                configuration.incremental_parsing is not None and \
+                configuration.incremental_parsing.should_run:
+            raise InvalidCykConfigurationError(
+                '{0} does not support incremental parsing'.format(type(self).__name__))
+
+    def _validate_beam_pruning(self, configuration):
+        if not self.supports_beam_pruning and configuration.beam_pruning is not None and \
+                configuration.beam_pruning.should_run:
+            raise InvalidCykConfigurationError(
+                '{0} does not support beam pruning'.format(type(self).__name__))
+        if configuration.beam_pruning is not None:
+            configuration.beam_pruning.validate()
+
+    def _coverage_cannot_add_rules(self):
+        operators = self.configuration.coverage.operators
+        return operators.terminal.chance == 0 and operators.universal.chance == 0 and \
+            operators.aggressive.chance == 0
+
+    def _is_hopeless(self, rule_population, sentence):
+        if not self.skips_hopeless_sentences or \
+                len(sentence) == 1 and self.configuration.coverage.operators.starting.chance:
+            return False
+
+        return any(not rule_population.get_terminal_rules(symbol)
+                   for symbol in sentence.symbols)
+
+    def perform_cyk_for_all_sentences(self, rule_population, sentences, evolution_step_estimator,
+                                      configuration, statistics):
+        self.prepare_for_step(configuration, statistics)
 
         if self.configuration.grammar_correction.should_run:
             self.grammar_corrector.correct_grammar(rule_population, self.statistics)
 
-        cnt = 0
-        for sentence in sentences:
-            cnt += 1
-            result = self.perform_cyk(rule_population, sentence)
+        parallel_cyk = self._create_parallel_cyk()
+        if parallel_cyk is not None or not self._should_parse_incrementally():
+            self.incremental_parser = None
+        elif self.incremental_parser is None:
+            self.incremental_parser = IncrementalCykParser(self)
+
+        weighted_sentences = self._weighted_sentences(sentences)
+        if parallel_cyk is not None:
+            results = parallel_cyk.perform_cyk(self, rule_population, weighted_sentences)
+        else:
+            results = (self.perform_cyk(rule_population, sentence, multiplicity)
+                       for sentence, multiplicity in weighted_sentences)
+
+        for result in results:
             evolution_step_estimator.append_result(result)
 
+        self._close_span_cache()
+        self.span_cache = None
+        if self.pruning_report is not None:
+            logging.info(str(self.pruning_report))
+        if self.incremental_parser is not None:
+            self.incremental_parser.forget_applied_changes()
         self.statistics.update_fitness()
 
+    def _close_span_cache(self):
+        if self.span_cache is not None:
+            self.span_cache.close()
+
+    def _create_parallel_cyk(self):
+        if self.configuration.parallel_parsing is None or \
+                not self.configuration.parallel_parsing.should_run or \
+                not ParallelCykExecutor.is_available():
+            self._close_parallel_cyk()
+            return None
+
+        worker_count = ParallelCykExecutor.resolve_worker_count(
+            self.configuration.parallel_parsing.worker_count)
+        if self.parallel_cyk is None or self.parallel_cyk.worker_count != worker_count:
+            self._close_parallel_cyk()
+            self.parallel_cyk = ParallelCykExecutor(worker_count)
+
+        return self.parallel_cyk
+
+    def _close_parallel_cyk(self):
+        if self.parallel_cyk is not None:
+            self.parallel_cyk.close()
+            self.parallel_cyk = None
+
+    def close(self):
+        self._close_parallel_cyk()
+
+    def _weighted_sentences(self, sentences):
+        if self.configuration is not None and \
+                self.configuration.sentence_collapsing is not None and \
+                self.configuration.sentence_collapsing.should_run:
+            return Sentence.collapse_duplicates(sentences)
+
+        return ((sentence, 1) for sentence in sentences)
+
+    def _should_parse_incrementally(self):
+        return self.supports_incremental_parsing and \
+            self.configuration.incremental_parsing is not None and \
+            self.configuration.incremental_parsing.should_run
+
+    def create_recognizer(self, rule_population):
+        return BitsetRecognizer(rule_population)
+
+    def perform_recognition_for_all_sentences(self, rule_population, sentences,
+                                              evolution_step_estimator):
+        recognizer = self.create_recognizer(rule_population)
+        if not self._should_use_wavefront():
+            self._recognize_all(recognizer, sentences, evolution_step_estimator)
+            return
+
+        wavefront_recognizer = WavefrontRecognizer(
+            recognizer, self.configuration.wavefront_parsing.length_threshold,
+            self.configuration.wavefront_parsing.worker_count)
+        try:
+            self._recognize_all(wavefront_recognizer, sentences, evolution_step_estimator)
+        finally:
+            wavefront_recognizer.close()
+
+    def _recognize_all(self, recognizer, sentences, evolution_step_estimator):
+        for sentence, multiplicity in self._weighted_sentences(sentences):
+            result = recognizer.perform_cyk(sentence)
+            result.multiplicity = multiplicity
+            evolution_step_estimator.append_result(result)
+
+    def _should_use_wavefront(self):
+        return self.configuration is not None and \
+            self.configuration.wavefront_parsing is not None and \
+            self.configuration.wavefront_parsing.should_run and \
+            WavefrontRecognizer.is_available()
+
     @property
     def configuration(self):
         return self._configuration
@@ -123,8 +291,27 @@ class CykService(object):
     def traceback(self, value):
         self._traceback = value
 
+    @property
+    def span_cache(self):
+        return self._span_cache
+
+    @span_cache.setter
+    def span_cache(self, value):
+        self._span_cache = value
+
+    @property
+    def beam_pruning(self):
+        return self._beam_pruning
+
+    @beam_pruning.setter
+    def beam_pruning(self, value):
+        self._beam_pruning = value
+
 
 class StochasticCykService(CykService):
+    supports_incremental_parsing = False
+    supports_beam_pruning = True
+
     @staticmethod
     def default(randomizer, adding_rule_supervisor):
         factory = Factory({
@@ -135,9 +322,9 @@ class StochasticCykService(CykService):
                 lambda table_executor, row, executor_factory:
                 cyk_executors.CykRowExecutor(table_executor, row, executor_factory) if row > 0
                 else cyk_executors.CykFirstRowExecutor(table_executor, row, executor_factory),
-            CykTypeId.table_executor: cyk_executors.CykStochasticTableExecutor,
+            CykTypeId.table_executor: cyk_executors.CykStochasticFusedTableExecutor,
             CykTypeId.production_pool: ProductionPool,
-            CykTypeId.environment: Environment.with_viterbi_approach,
+            CykTypeId.environment: TriangularEnvironment.with_viterbi_approach,
             CykTypeId.cyk_result: cyk_executors.CykResult,
             CykTypeId.terminal_cell_executor: cyk_executors.CykStochasticTerminalCellExecutor
         })
@@ -153,9 +340,49 @@ class StochasticCykService(CykService):
             traceback_creator
         )
 
+    def create_recognizer(self, rule_population):
+        return BitsetRecognizer(
+            rule_population,
+            lambda rule: rule_population.get_normalized_rule_probability(rule) > 0)
+
+    def perform_cyk_for_all_sentences(self, rule_population, sentences, evolution_step_estimator,
+                                      configuration, statistics):
+        super().perform_cyk_for_all_sentences(rule_population, sentences, evolution_step_estimator,
+                                              configuration, statistics)
+        if self._should_estimate_inside_outside():
+            InsideOutsideEstimator(rule_population).estimate(sentences)
+        else:
+            rule_population.perform_probability_estimation(
+                statistics.fitness.get_keyfunc_getter(statistics))
+
+    def _should_estimate_inside_outside(self):
+        return self.configuration.inside_outside_estimation is not None and \
+            self.configuration.inside_outside_estimation.should_run
+
+
+class VectorizedStochasticCykService(StochasticCykService):
+    @staticmethod
+    def default(randomizer, adding_rule_supervisor):
+        factory = Factory({
+            CykTypeId.table_executor: CykVectorizedStochasticTableExecutor,
+            CykTypeId.environment: VectorizedStochasticEnvironment.with_viterbi_approach,
+            CykTypeId.cyk_result: cyk_executors.CykResult
+        })
+
+        coverage_operations = CoverageOperations.create_default_set()
+        traceback_creator = StochasticBestTreeTraceback
+
+        return VectorizedStochasticCykService(
+            factory,
+            randomizer,
+            adding_rule_supervisor,
+            coverage_operations,
+            traceback_creator
+        )
+
     def perform_cyk_for_all_sentences(self, rule_population, sentences, evolution_step_estimator,
                                       configuration, statistics):
+        self.table_executor.invalidate_grammar()
         super().perform_cyk_for_all_sentences(rule_population, sentences, evolution_step_estimator,
                                               configuration, statistics)
-        rule_population.perform_probability_estimation(
-            statistics.fitness.get_keyfunc_getter(statistics))
+        self.table_executor.invalidate_grammar()
@@ -2,18 +2,25 @@ from sgcs.induction.production import EmptyProduction, Production
 
 
 class Detector(object):
+    __slots__ = ('coordinates', '_hash')
+
     def __init__(self, coordinates):
         self.coordinates = coordinates
+        self._hash = None
 
-    def generate_production(self, environment, rule_population):
-        row, col, *_ = self.coordinates
+    @staticmethod
+    def find_rules(coordinates, environment, rule_population):
+        row, col, *_ = coordinates
 
         if row > 0:
-            symbols = environment.get_detector_symbols(self.coordinates)
-            rules = rule_population.get_rules_by_right(symbols)
+            symbols = environment.get_detector_symbols(coordinates)
+            return rule_population.get_rules_by_right(symbols)
         else:
             symbol = environment.get_sentence_symbol(col)
-            rules = rule_population.get_terminal_rules(symbol)
+            return rule_population.get_terminal_rules(symbol)
+
+    def generate_production(self, environment, rule_population):
+        rules = self.find_rules(self.coordinates, environment, rule_population)
 
         return [EmptyProduction(self)] \
             if len(rules) == 0 \
@@ -26,7 +33,30 @@ class Detector(object):
         return not self.__eq__(other)
 
     def __hash__(self):
-        return hash(self.coordinates)
+        if self._hash is None:
+            self._hash = hash(self.coordinates)
+
+        return self._hash
 
     def __str__(self):
         return self.__class__.__name__ + '({' + '};{'.join(str(x) for x in self.coordinates) + "})"
+
+
+class UnsatisfiedDetectors(object):
+    __slots__ = ('detectors', 'coordinates')
+
+    def __init__(self, detectors, coordinates):
+        self.detectors = detectors
+        self.coordinates = coordinates
+
+    def __len__(self):
+        return len(self.detectors) + len(self.coordinates)
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        if index < len(self.detectors):
+            return self.detectors[index]
+
+        return Detector(self.coordinates[index - len(self.detectors)])
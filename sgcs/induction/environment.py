@@ -1,4 +1,6 @@
 from sgcs.induction.cyk_executors import CykTypeId
+from sgcs.induction.detector import Detector, UnsatisfiedDetectors
+from sgcs.induction.production import Production
 
 
 def value_in_bounds(lower_eq, val, greater):
@@ -14,45 +16,77 @@ class CykTableIndexError(Exception):
 
 
 class Environment(object):
-    @staticmethod
-    def with_viterbi_approach(sentence, factory):
-        environment = Environment(sentence, factory)
+    @classmethod
+    def with_viterbi_approach(cls, sentence, factory):
+        environment = cls(sentence, factory)
         environment.probability_approach = viterbi_probability_approach
         return environment
 
-    @staticmethod
-    def with_baum_welch_approach(sentence, factory):
-        environment = Environment(sentence, factory)
+    @classmethod
+    def with_baum_welch_approach(cls, sentence, factory):
+        environment = cls(sentence, factory)
         environment.probability_approach = baum_welch_probability_approach
         return environment
 
     def __init__(self, sentence, factory):
         self.sentence = sentence
         self.size = self.get_sentence_length()
-        self.cyk_table = {
+        self.factory = factory
+        self.cyk_table = self._create_cyk_table(factory)
+        self.probability_approach = None
+        self.pruned_effectors = 0
+        self.filtered_effectors = 0
+
+    def _create_cyk_table(self, factory):
+        return {
             (x, y): factory.create(CykTypeId.production_pool)
             for x in range(self.size) for y in range(self.size)
         }
-        self.probability_approach = None
 
     def get_symbols(self, absolute_coordinates):
         return self._get_production_pool(absolute_coordinates).get_effectors()
 
+    def reset_cell(self, absolute_coordinates):
+        self._get_production_pool(absolute_coordinates)
+        self.cyk_table[tuple(absolute_coordinates)] = \
+            self.factory.create(CykTypeId.production_pool)
+
     def _get_production_pool(self, absolute_coordinates):
         try:
             return self.cyk_table[absolute_coordinates]
-        except IndexError:
+        except KeyError:
             raise CykTableIndexError(absolute_coordinates)
 
     def add_production(self, production):
         absolute_coordinates = production.get_coordinates()[:2]
         try:
             child_productions = self.simple_get_child_productions(production)
-            self.cyk_table[absolute_coordinates].add_production(
-                production, child_productions, self.probability_approach)
-        except KeyError:
+            production_pool = self._get_production_pool(absolute_coordinates)
+        except CykTableIndexError:
             raise CykTableIndexError(production.get_coordinates())
 
+        production_pool.add_production(production, child_productions, self.probability_approach)
+
+    def add_unsatisfied_detector(self, coordinates):
+        self._get_production_pool(coordinates[:2]).add_unsatisfied_detector(coordinates)
+
+    def filter_cell(self, absolute_coordinates, kept_symbols):
+        production_pool = self._get_production_pool(absolute_coordinates)
+        effectors = production_pool.get_effectors()
+        dropped = {effector for effector in effectors if effector not in kept_symbols}
+        if not dropped or len(dropped) == len(effectors):
+            return 0
+
+        production_pool.drop_effectors(dropped)
+        self.filtered_effectors += len(dropped)
+        return len(dropped)
+
+    def prune_cell(self, absolute_coordinates, max_effectors, relative_threshold):
+        pruned = self._get_production_pool(absolute_coordinates).prune_effectors(
+            max_effectors, relative_threshold)
+        self.pruned_effectors += pruned
+        return pruned
+
     @staticmethod
     def _left_coord(row, col, shift, left_id, right_id):
         return shift - 1, col
@@ -97,7 +131,7 @@ class Environment(object):
         return self.sentence.get_symbol(index)
 
     def get_last_cell_productions(self):
-        return self.cyk_table[self.size - 1, 0].get_non_empty_productions()
+        return self._get_production_pool((self.size - 1, 0)).get_non_empty_productions()
 
     def __str__(self):
         return self.__class__.__name__ + '({' + str(self.cyk_table) + "})"
@@ -114,11 +148,12 @@ class Environment(object):
             return self._terminal_parent_symbols(col),
 
     def get_unsatisfied_detectors(self, coordinates):
-        production_pool = self.cyk_table[coordinates]
-        return production_pool.get_unsatisfied_detectors()
+        production_pool = self._get_production_pool(coordinates)
+        return UnsatisfiedDetectors(production_pool.get_unsatisfied_detectors(),
+                                    production_pool.get_unsatisfied_coordinates())
 
     def has_no_productions(self, coordinates):
-        production_pool = self.cyk_table[coordinates]
+        production_pool = self._get_production_pool(coordinates)
         return production_pool.is_empty()
 
     # Usnafe!
@@ -144,29 +179,68 @@ class Environment(object):
             return None
         else:
             parent_detector = production.detector
-            left_production_pool = self.cyk_table[self._left_coord(*parent_detector.coordinates)]
-            left_production = left_production_pool[parent_detector.coordinates[3]]
+            left_production_pool = self._get_production_pool(
+                self._left_coord(*parent_detector.coordinates))
+            left_production = left_production_pool.get_best_production_for(
+                left_production_pool.effectors[parent_detector.coordinates[3]])
             left_probability = left_production_pool.effector_probabilities.get(
                 production.rule.left_child, 0)
 
-            right_production_pool = self.cyk_table[self._right_coord(*parent_detector.coordinates)]
-            right_production = right_production_pool[parent_detector.coordinates[4]]
+            right_production_pool = self._get_production_pool(
+                self._right_coord(*parent_detector.coordinates))
+            right_production = right_production_pool.get_best_production_for(
+                right_production_pool.effectors[parent_detector.coordinates[4]])
             right_probability = right_production_pool.effector_probabilities.get(
                 production.rule.right_child, 0)
 
             return left_production, left_probability, right_production, right_probability
 
     def _child_production_generator(self, coordinates, symbol):
-        production_pool = self._get_production_pool(coordinates)
-
-        return (p for p in production_pool.find_non_empty_productions(
-            lambda x: x.rule.parent == symbol))
+        return self._get_production_pool(coordinates).get_productions_for(symbol)
 
     def get_most_probable_production_for(self, symbol, coordinates=None):
         coordinates = coordinates if coordinates is not None else (self.size - 1, 0)
         production_pool = self._get_production_pool(coordinates)
         return production_pool.get_best_production_for(symbol)
 
+    def snapshot_cell(self, coordinates):
+        production_pool = self._get_production_pool(coordinates)
+        return [(production.get_coordinates()[2:], production.rule, production.probability)
+                for production in production_pool.all_productions] + \
+            [(unsatisfied_coordinates[2:], None, None)
+             for unsatisfied_coordinates in production_pool.get_unsatisfied_coordinates()]
+
+    def restore_cell(self, coordinates, cell_snapshot):
+        for relative_coordinates, rule, probability in cell_snapshot:
+            absolute_coordinates = tuple(coordinates) + relative_coordinates
+            if rule is None:
+                self.add_unsatisfied_detector(absolute_coordinates)
+            else:
+                production = Production(Detector(absolute_coordinates), rule)
+                production.probability = probability
+                self.add_production(production)
+
+
+class TriangularEnvironment(Environment):
+    def _create_cyk_table(self, factory):
+        return [factory.create(CykTypeId.production_pool)
+                for _ in range(self.size * (self.size + 1) // 2)]
+
+    def _cell_index(self, row, col):
+        if not (0 <= row < self.size and 0 <= col < self.size - row):
+            raise CykTableIndexError((row, col))
+
+        return row * self.size - row * (row - 1) // 2 + col
+
+    def _get_production_pool(self, absolute_coordinates):
+        row, col = absolute_coordinates
+        return self.cyk_table[self._cell_index(row, col)]
+
+    def reset_cell(self, absolute_coordinates):
+        row, col = absolute_coordinates
+        self.cyk_table[self._cell_index(row, col)] = \
+            self.factory.create(CykTypeId.production_pool)
+
 
 def viterbi_probability_approach(current, parent, children):
     if children is not None:
@@ -1,46 +1,62 @@
 class GrammarCorrector(object):
     def correct_grammar(self, rule_population, statistics):
-        self.remove_non_productive(rule_population, statistics)
-        self.remove_not_reachable(rule_population, statistics)
+        removed_rules = self.remove_non_productive(rule_population, statistics)
+        removed_rules |= self.remove_not_reachable(rule_population, statistics)
+        return removed_rules
 
     @staticmethod
-    def _rule_remover(rule_population, statistics, starting_rules, select_predicate,
-                      symbol_adder):
-        selected_rules = set()
-        selected_rules.update(starting_rules)
-
-        while True:
-            last_selected_rules = selected_rules.copy()
-            for rule in rule_population.get_all_non_terminal_rules():
-                if select_predicate(rule):
-                    selected_rules.add(rule)
-                    symbol_adder(rule)
-
-            if len(selected_rules) == len(last_selected_rules):
-                break
-
-        for rule in rule_population.get_all_non_terminal_rules():
-            if rule not in selected_rules:
-                rule_population.remove_rule(rule)
-                statistics.on_rule_removed(rule)
+    def _remove_rules_except(rule_population, statistics, rules, kept_rules):
+        removed_rules = [rule for rule in rules if rule not in kept_rules]
+        for rule in removed_rules:
+            rule_population.remove_rule(rule)
+            statistics.on_rule_removed(rule)
 
-    def remove_non_productive(self, rule_population, statistics):
-        starting_rules = list(rule_population.get_terminal_rules())
-        symbols = set(map(lambda x: x.parent, starting_rules))
-        select_predicate = lambda rule: \
-            rule.left_child in symbols and rule.right_child in symbols or \
-            rule_population.universal_symbol is not None and \
-            rule_population.universal_symbol in symbols
-        symbol_adder = lambda rule: symbols.add(rule.parent)
+        return set(removed_rules)
 
-        self._rule_remover(rule_population, statistics, starting_rules, select_predicate,
-                           symbol_adder)
+    def remove_non_productive(self, rule_population, statistics):
+        rules = list(rule_population.get_all_non_terminal_rules())
+        productive_symbols = {rule.parent for rule in rule_population.get_terminal_rules()}
+
+        rules_by_child = dict()
+        missing_children = dict()
+        for rule in rules:
+            children = {rule.left_child, rule.right_child}
+            missing_children[rule] = len(children)
+            for child in children:
+                rules_by_child.setdefault(child, []).append(rule)
+
+        productive_rules = set()
+        worklist = list(productive_symbols)
+        while worklist:
+            for rule in rules_by_child.get(worklist.pop(), ()):
+                missing_children[rule] -= 1
+                if missing_children[rule] == 0:
+                    productive_rules.add(rule)
+                    if rule.parent not in productive_symbols:
+                        productive_symbols.add(rule.parent)
+                        worklist.append(rule.parent)
+
+        if rule_population.universal_symbol is not None and \
+                rule_population.universal_symbol in productive_symbols:
+            return set()
+
+        return self._remove_rules_except(rule_population, statistics, rules, productive_rules)
 
     def remove_not_reachable(self, rule_population, statistics):
-        starting_rules = list()
-        symbols = {rule_population.starting_symbol}
-        select_predicate = lambda rule: rule.parent in symbols
-        symbol_adder = lambda rule: (symbols.add(rule.left_child), symbols.add(rule.right_child))
-
-        self._rule_remover(rule_population, statistics, starting_rules, select_predicate,
-                           symbol_adder)
+        rules = list(rule_population.get_all_non_terminal_rules())
+
+        rules_by_parent = dict()
+        for rule in rules:
+            rules_by_parent.setdefault(rule.parent, []).append(rule)
+
+        reachable_symbols = {rule_population.starting_symbol}
+        worklist = [rule_population.starting_symbol]
+        while worklist:
+            for rule in rules_by_parent.get(worklist.pop(), ()):
+                for child in (rule.left_child, rule.right_child):
+                    if child not in reachable_symbols:
+                        reachable_symbols.add(child)
+                        worklist.append(child)
+
+        reachable_rules = {rule for rule in rules if rule.parent in reachable_symbols}
+        return self._remove_rules_except(rule_population, statistics, rules, reachable_rules)
@@ -0,0 +1,113 @@
+from induction.cyk_executors import CykTypeId
+
+
+class IncrementalChartRefresh(object):
+    def __init__(self, environment, journal, journal_position):
+        self.environment = environment
+        self._journal = journal
+        self._journal_position = journal_position
+        self._seen_journal_position = None
+        self._changed_terminals = set()
+        self._changed_pairs = set()
+        self._changed_left_children = set()
+        self._changed_cells = set()
+        self._previous_effectors = None
+        self.recomputed_cells = 0
+
+    def _refresh_changed_rules(self):
+        if self._seen_journal_position == self._journal.position:
+            return
+
+        self._seen_journal_position = self._journal.position
+        for rule in self._journal.changes_since(self._journal_position):
+            if rule.is_terminal_rule():
+                self._changed_terminals.add(rule.left_child)
+            else:
+                self._changed_pairs.add((rule.left_child, rule.right_child))
+                self._changed_left_children.add(rule.left_child)
+
+    def _is_dirty(self, coordinates):
+        row, col = coordinates
+        if row == 0:
+            return self.environment.get_sentence_symbol(col) in self._changed_terminals
+
+        for shift in range(1, row + 1):
+            left_coordinates, right_coordinates = (shift - 1, col), (row - shift, col + shift)
+            if left_coordinates in self._changed_cells or right_coordinates in self._changed_cells:
+                return True
+
+            left_symbols = [symbol for symbol in self.environment.get_symbols(left_coordinates)
+                            if symbol in self._changed_left_children]
+            if left_symbols:
+                right_symbols = self.environment.get_symbols(right_coordinates)
+                if any((left, right) in self._changed_pairs
+                       for left in left_symbols for right in right_symbols):
+                    return True
+
+        return False
+
+    def prepare_cell(self, coordinates):
+        self._refresh_changed_rules()
+        self._previous_effectors = list(self.environment.get_symbols(coordinates))
+        if not self._is_dirty(coordinates):
+            return False
+
+        self.environment.reset_cell(coordinates)
+        self.recomputed_cells += 1
+        return True
+
+    def finish_cell(self, coordinates):
+        if self.environment.get_symbols(coordinates) != self._previous_effectors:
+            self._changed_cells.add(coordinates)
+
+
+class ParsedChart(object):
+    def __init__(self, environment, journal_position, reachable_symbols=None):
+        self.environment = environment
+        self.journal_position = journal_position
+        self.reachable_symbols = reachable_symbols
+
+
+class IncrementalCykParser(object):
+    def __init__(self, cyk_service):
+        self.cyk_service = cyk_service
+        self._charts = dict()
+        self._rule_population = None
+
+    @staticmethod
+    def chart_key(sentence):
+        return tuple(sentence.symbols), sentence.is_positive_sentence
+
+    def parse(self, rule_population, sentence):
+        journal = rule_population.rule_change_journal
+        if rule_population is not self._rule_population:
+            self._charts.clear()
+            self._rule_population = rule_population
+
+        key = self.chart_key(sentence)
+        chart = self._charts.get(key)
+        journal_position = journal.position
+        reachable_symbols = frozenset(rule_population.compiled_grammar.reachable_symbols) \
+            if self.cyk_service.filters_unreachable_symbols else None
+
+        if chart is None or journal.changes_since(chart.journal_position) is None or \
+                chart.reachable_symbols != reachable_symbols:
+            environment = self.cyk_service.factory.create(
+                CykTypeId.environment, sentence, self.cyk_service.factory)
+            result = self.cyk_service.table_executor.execute(environment, rule_population)
+        else:
+            environment = chart.environment
+            result = self.cyk_service.table_executor.execute(
+                environment, rule_population,
+                IncrementalChartRefresh(environment, journal, chart.journal_position))
+
+        self._charts[key] = ParsedChart(environment, journal_position, reachable_symbols)
+        return environment, result
+
+    def forget_applied_changes(self):
+        if self._rule_population is not None and self._charts:
+            self._rule_population.rule_change_journal.forget_before(
+                min(chart.journal_position for chart in self._charts.values()))
+
+    def __len__(self):
+        return len(self._charts)
@@ -0,0 +1,110 @@
+import numpy
+
+from core.symbol import Sentence
+from induction.vectorized_cyk import CompiledStochasticGrammar
+
+
+class InsideOutsideEstimator(object):
+    def __init__(self, rule_population):
+        self.rule_population = rule_population
+        self.grammar = CompiledStochasticGrammar(rule_population)
+        self.starting_index = self.grammar.symbol_indexes.get(rule_population.starting_symbol)
+        self._rule_span_products = numpy.zeros_like(self.grammar.rule_probabilities)
+        self.terminal_counts = dict()
+        self.sentence_probabilities = []
+
+    def _terminal_probabilities(self, sentence):
+        empty = numpy.zeros(self.grammar.size)
+        return numpy.array([self.grammar.terminal_probabilities.get(symbol, empty)
+                            for symbol in sentence.symbols])
+
+    def inside(self, sentence):
+        size = len(sentence)
+        rules = self.grammar.rule_probabilities
+        inside = numpy.zeros((size, size, self.grammar.size))
+        inside[0] = self._terminal_probabilities(sentence)
+
+        for row in range(1, size):
+            starts = size - row
+            for shift in range(1, row + 1):
+                inside[row, :starts] += numpy.einsum(
+                    'abc,ib,ic->ia', rules, inside[shift - 1, :starts],
+                    inside[row - shift, shift:shift + starts])
+
+        return inside
+
+    def outside(self, sentence, inside):
+        size = len(sentence)
+        rules = self.grammar.rule_probabilities
+        outside = numpy.zeros_like(inside)
+        outside[size - 1, 0, self.starting_index] = 1
+
+        for row in range(size - 1, 0, -1):
+            starts = size - row
+            for shift in range(1, row + 1):
+                left = inside[shift - 1, :starts]
+                right = inside[row - shift, shift:shift + starts]
+                outside[shift - 1, :starts] += numpy.einsum(
+                    'ia,abc,ic->ib', outside[row, :starts], rules, right)
+                outside[row - shift, shift:shift + starts] += numpy.einsum(
+                    'ia,abc,ib->ic', outside[row, :starts], rules, left)
+
+        return outside
+
+    def _accumulate(self, sentence, weight):
+        inside = self.inside(sentence)
+        sentence_probability = inside[len(sentence) - 1, 0, self.starting_index]
+        self.sentence_probabilities.append(sentence_probability)
+        if sentence_probability <= 0:
+            return
+
+        outside = self.outside(sentence, inside)
+        scale = weight / sentence_probability
+        size = len(sentence)
+        for row in range(1, size):
+            starts = size - row
+            for shift in range(1, row + 1):
+                self._rule_span_products += scale * numpy.einsum(
+                    'ia,ib,ic->abc', outside[row, :starts], inside[shift - 1, :starts],
+                    inside[row - shift, shift:shift + starts])
+
+        terminal_counts = scale * outside[0] * inside[0]
+        for col, symbol in enumerate(sentence.symbols):
+            if symbol not in self.terminal_counts:
+                self.terminal_counts[symbol] = numpy.zeros(self.grammar.size)
+            self.terminal_counts[symbol] += terminal_counts[col]
+
+    def accumulate(self, sentences):
+        if self.starting_index is None:
+            return
+
+        for sentence, multiplicity in Sentence.collapse_duplicates(sentences):
+            if len(sentence) and sentence.is_positive_sentence is not False:
+                self._accumulate(sentence, multiplicity)
+
+    @property
+    def rule_counts(self):
+        return self._rule_span_products * self.grammar.rule_probabilities
+
+    def estimated_probabilities(self):
+        rule_counts = self.rule_counts
+        left_side_counts = rule_counts.sum(axis=(1, 2))
+        for counts in self.terminal_counts.values():
+            left_side_counts += counts
+        normalizer = numpy.where(left_side_counts > 0, left_side_counts, 1)
+
+        rule_probabilities = rule_counts / normalizer[:, None, None]
+        probabilities = {rule: float(rule_probabilities[key])
+                         for key, rule in self.grammar.rules.items()
+                         if left_side_counts[key[0]] > 0}
+        for (parent, terminal_symbol), rule in self.grammar.terminal_rules.items():
+            if left_side_counts[parent] > 0:
+                counts = self.terminal_counts.get(terminal_symbol)
+                probabilities[rule] = float(counts[parent] / normalizer[parent]) \
+                    if counts is not None else 0.0
+
+        return probabilities
+
+    def estimate(self, sentences):
+        self.accumulate(sentences)
+        self.rule_population.update_rule_probabilities(self.estimated_probabilities())
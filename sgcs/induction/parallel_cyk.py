@@ -0,0 +1,218 @@
+import multiprocessing
+from random import Random
+
+from core.rule_change import RuleChangeKind
+from statistics.grammar_statistics import DummyCykStatistics
+from utils import Randomizer
+
+
+class QueuedRuleAdding(object):
+    def __init__(self, randomizer):
+        self.randomizer = randomizer
+        self.queued_rules = []
+
+    def add_rule(self, rule, rule_population, statistics, strategy_hint):
+        self.queued_rules.append((rule, strategy_hint))
+        rule_population.add_rule(rule, self.randomizer)
+
+
+class RecordingStatistics(DummyCykStatistics):
+    def __init__(self, statistics):
+        super().__init__()
+        self.statistics_visitors = list(statistics.statistics_visitors)
+        self.rule_statistics = type(statistics.rule_statistics)() \
+            if self.statistics_visitors else None
+        self.configuration = statistics.configuration if self.statistics_visitors else None
+        self.rule_usages = []
+        self.rule_usage_batches = []
+
+    def on_rule_usage(self, rule, usage_info=None):
+        self.rule_usages.append((rule, usage_info))
+
+    def on_rules_usage(self, rule_usages, usage_info):
+        self.rule_usage_batches.append((rule_usages, usage_info))
+
+
+class SentenceChunk(object):
+    def __init__(self, cyk_service_type, rule_population, weighted_sentences, configuration,
+                 statistics, seed):
+        self.cyk_service_type = cyk_service_type
+        self.rule_population = rule_population
+        self.weighted_sentences = weighted_sentences
+        self.configuration = configuration
+        self.statistics = statistics
+        self.seed = seed
+
+
+class ChunkResult(object):
+    def __init__(self, cyk_results, rule_usages, rule_usage_batches, queued_rules,
+                 pruning_report=None):
+        self.cyk_results = cyk_results
+        self.rule_usages = rule_usages
+        self.rule_usage_batches = rule_usage_batches
+        self.queued_rules = queued_rules
+        self.pruning_report = pruning_report
+
+
+class PopulationUpdate(object):
+    def __init__(self, snapshot=None, changes=(), probability_tables=None):
+        self.snapshot = snapshot
+        self.changes = changes
+        self.probability_tables = probability_tables
+
+    @staticmethod
+    def since(rule_population, version):
+        events = rule_population.rule_change_journal.events_since(version) \
+            if version is not None else None
+        if events is None:
+            return PopulationUpdate(rule_population.snapshot())
+
+        changes = [(change.kind, change.rule) for change in events if change.is_structural()]
+        probability_tables = rule_population.get_probability_tables() if events else None
+        return PopulationUpdate(None, changes, probability_tables)
+
+    def apply(self, rule_population, randomizer):
+        if self.snapshot is not None:
+            rule_population = self.snapshot.copy()
+
+        for kind, rule in self.changes:
+            if kind == RuleChangeKind.added:
+                rule_population.add_rule(rule, randomizer)
+            else:
+                rule_population.remove_rule(rule)
+
+        if self.probability_tables is not None:
+            rule_population.set_probability_tables(self.probability_tables)
+
+        return rule_population
+
+
+def parse_sentence_chunk(chunk):
+    randomizer = Randomizer(Random(chunk.seed))
+    rule_adding = QueuedRuleAdding(randomizer)
+    cyk_service = chunk.cyk_service_type.default(randomizer, rule_adding)
+    cyk_service.prepare_for_step(chunk.configuration, chunk.statistics)
+
+    rule_population = chunk.rule_population.copy()
+    cyk_results = [cyk_service.perform_cyk(rule_population, sentence, multiplicity)
+                   for sentence, multiplicity in chunk.weighted_sentences]
+
+    return ChunkResult(cyk_results, chunk.statistics.rule_usages,
+                       chunk.statistics.rule_usage_batches, rule_adding.queued_rules,
+                       cyk_service.pruning_report)
+
+
+def _serve_chunks(connection):
+    randomizer = Randomizer(Random())
+    rule_population = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        population_update, chunk = message
+        try:
+            rule_population = population_update.apply(rule_population, randomizer)
+            chunk.rule_population = rule_population
+            connection.send(parse_sentence_chunk(chunk))
+        except Exception as error:
+            rule_population = None
+            connection.send(error)
+
+    connection.close()
+
+
+class CykWorker(object):
+    def __init__(self):
+        self._connection, worker_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_chunks, args=(worker_connection,),
+                                                daemon=True)
+        self._process.start()
+        worker_connection.close()
+        self._rule_population = None
+        self._version = None
+
+    def submit(self, rule_population, chunk):
+        version = self._version if rule_population is self._rule_population else None
+        self._connection.send((PopulationUpdate.since(rule_population, version), chunk))
+        self._rule_population, self._version = rule_population, rule_population.version
+
+    def receive(self):
+        result = self._connection.recv()
+        if isinstance(result, Exception):
+            self._rule_population = self._version = None
+
+        return result
+
+    def close(self):
+        self._connection.send(None)
+        self._process.join()
+        self._connection.close()
+
+
+class ParallelCykExecutor(object):
+    def __init__(self, worker_count=0):
+        self.worker_count = self.resolve_worker_count(worker_count)
+        self._workers = []
+
+    @staticmethod
+    def resolve_worker_count(worker_count):
+        return worker_count if worker_count > 0 else multiprocessing.cpu_count()
+
+    @staticmethod
+    def is_available():
+        return not multiprocessing.current_process().daemon
+
+    def split(self, weighted_sentences):
+        chunk_count = min(self.worker_count, len(weighted_sentences))
+        chunk_size, remainder = divmod(len(weighted_sentences), chunk_count) \
+            if chunk_count else (0, 0)
+
+        chunks, start = [], 0
+        for i in range(chunk_count):
+            end = start + chunk_size + (1 if i < remainder else 0)
+            chunks.append(weighted_sentences[start:end])
+            start = end
+
+        return chunks
+
+    def perform_cyk(self, cyk_service, rule_population, weighted_sentences):
+        chunks = [SentenceChunk(type(cyk_service), None, part,
+                                cyk_service.configuration,
+                                RecordingStatistics(cyk_service.statistics),
+                                cyk_service.randomizer.randint(0, 10**10))
+                  for part in self.split(list(weighted_sentences))]
+        if not chunks:
+            return []
+
+        while len(self._workers) < len(chunks):
+            self._workers.append(CykWorker())
+
+        workers = self._workers[:len(chunks)]
+        for worker, chunk in zip(workers, chunks):
+            worker.submit(rule_population, chunk)
+        chunk_results = [worker.receive() for worker in workers]
+        for chunk_result in chunk_results:
+            if isinstance(chunk_result, Exception):
+                raise chunk_result
+
+        for chunk_result in chunk_results:
+            for rule, strategy_hint in chunk_result.queued_rules:
+                cyk_service.rule_adding.add_rule(rule, rule_population, cyk_service.statistics,
+                                                 strategy_hint)
+
+        for chunk_result in chunk_results:
+            for rule, usage_info in chunk_result.rule_usages:
+                cyk_service.statistics.on_rule_usage(rule, usage_info)
+            for rule_usages, usage_info in chunk_result.rule_usage_batches:
+                cyk_service.statistics.on_rules_usage(rule_usages, usage_info)
+            if cyk_service.pruning_report is not None and chunk_result.pruning_report is not None:
+                cyk_service.pruning_report.merge(chunk_result.pruning_report)
+
+        return [cyk_result for chunk_result in chunk_results
+                for cyk_result in chunk_result.cyk_results]
+
+    def close(self):
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
@@ -1,4 +1,9 @@
+from induction.beam_pruning import beam_pruned_effectors
+
+
 class Production(object):
+    __slots__ = ('detector', 'rule', 'probability')
+
     def __init__(self, detector, rule):
         self.detector = detector
         self.rule = rule
@@ -30,45 +35,76 @@ class Production(object):
 
 
 class EmptyProduction(Production):
+    __slots__ = ()
+
     def __init__(self, detector):
         super().__init__(detector, None)
-        self.detector = detector
 
 
 class ProductionPool(object):
+    __slots__ = ('non_empty_productions', 'empty_productions', 'unsatisfied_coordinates',
+                 'effectors', 'effector_probabilities', '_best_productions',
+                 '_productions_by_parent')
+
     def __init__(self):
         self.non_empty_productions = []
         self.empty_productions = []
-        self.all_productions = []
+        self.unsatisfied_coordinates = []
         self.effectors = list()
         self.effector_probabilities = dict()
-        self._best_productions_per_effector = dict()
-        self._best_productions_per_effector__probabilities = dict()
+        self._best_productions = dict()
+        self._productions_by_parent = dict()
+
+    @property
+    def all_productions(self):
+        return self.non_empty_productions + self.empty_productions
 
     def add_production(self, production, child_productions, probability_approach):
-        self.all_productions.append(production)
         if production.is_empty():
             self.empty_productions.append(production)
+            return
+
+        self.non_empty_productions.append(production)
+        effector = production.rule.parent
+        if effector not in self.effector_probabilities:
+            self.effectors.append(effector)
+            self.effector_probabilities[effector] = 0
+            self._best_productions[effector] = production, 0
+            self._productions_by_parent[effector] = [production]
         else:
-            self.non_empty_productions.append(production)
-            effector = production.rule.parent
-            if effector not in self.effectors:
-                self.effectors.append(effector)
-                self.effector_probabilities[effector] = 0
-                self._best_productions_per_effector[effector] = production
-                self._best_productions_per_effector__probabilities[effector] = 0
-
-            if probability_approach is not None:
-                prob = probability_approach(
-                    self.effector_probabilities[effector],
-                    production,
-                    child_productions)
-
-                self.effector_probabilities[effector] = prob
-
-                if self._best_productions_per_effector__probabilities[effector] < prob:
-                    self._best_productions_per_effector[effector] = production
-                    self._best_productions_per_effector__probabilities[effector] = prob
+            self._productions_by_parent[effector].append(production)
+
+        if probability_approach is not None:
+            prob = probability_approach(
+                self.effector_probabilities[effector],
+                production,
+                child_productions)
+
+            self.effector_probabilities[effector] = prob
+
+            if self._best_productions[effector][1] < prob:
+                self._best_productions[effector] = production, prob
+
+    def add_unsatisfied_detector(self, coordinates):
+        self.unsatisfied_coordinates.append(coordinates)
+
+    def prune_effectors(self, max_effectors, relative_threshold):
+        pruned = beam_pruned_effectors(self.effectors, self.effector_probabilities,
+                                       max_effectors, relative_threshold)
+        if not pruned:
+            return 0
+
+        self.drop_effectors(pruned)
+        return len(pruned)
+
+    def drop_effectors(self, dropped):
+        self.effectors = [effector for effector in self.effectors if effector not in dropped]
+        self.non_empty_productions = [production for production in self.non_empty_productions
+                                      if production.rule.parent not in dropped]
+        for effector in dropped:
+            del self.effector_probabilities[effector]
+            del self._best_productions[effector]
+            del self._productions_by_parent[effector]
 
     def is_empty(self):
         return not self.non_empty_productions
@@ -79,6 +115,9 @@ class ProductionPool(object):
     def get_unsatisfied_detectors(self):
         return list(map(lambda prod: prod.detector, self.empty_productions))
 
+    def get_unsatisfied_coordinates(self):
+        return self.unsatisfied_coordinates
+
     def get_non_empty_productions(self):
         return self.non_empty_productions
 
@@ -94,8 +133,10 @@ class ProductionPool(object):
     def find_non_empty_productions(self, predicate):
         return filter(predicate, self.non_empty_productions)
 
+    def get_productions_for(self, symbol):
+        return self._productions_by_parent.get(symbol, ())
+
     def get_best_production_for(self, symbol):
-        best_production = self._best_productions_per_effector.get(symbol, None)
+        best_production, probability = self._best_productions.get(symbol, (None, 0))
 
-        return None if best_production is None or \
-            self._best_productions_per_effector__probabilities[symbol] <= 0 else best_production
+        return None if best_production is None or probability <= 0 else best_production
@@ -0,0 +1,56 @@
+class SpanCache(object):
+    def __init__(self):
+        self._spans = dict()
+        self.hits = 0
+        self.misses = 0
+        self._rule_population = None
+
+    def follow(self, rule_population):
+        if rule_population is not self._rule_population:
+            self.close()
+            self._rule_population = rule_population
+            rule_population.subscribe(self.on_rule_change)
+
+    def on_rule_change(self, change):
+        self.invalidate()
+
+    def close(self):
+        if self._rule_population is not None:
+            self._rule_population.unsubscribe(self.on_rule_change)
+            self._rule_population = None
+        self.invalidate()
+
+    @staticmethod
+    def span_key(environment, coordinates):
+        row, col = coordinates
+        return tuple(environment.sentence.symbols[col:col + row + 1])
+
+    def restore(self, environment, coordinates):
+        cell_snapshot = self._spans.get(self.span_key(environment, coordinates))
+        if cell_snapshot is None:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        environment.restore_cell(coordinates, cell_snapshot)
+        return True
+
+    def store(self, environment, coordinates):
+        self._spans[self.span_key(environment, coordinates)] = \
+            environment.snapshot_cell(coordinates)
+
+    def invalidate(self):
+        self._spans.clear()
+
+    def __len__(self):
+        return len(self._spans)
+
+
+def execute_with_span_cache(span_cache, environment, coordinates, fill_cell):
+    if span_cache is not None and span_cache.restore(environment, coordinates):
+        return
+
+    fill_cell()
+
+    if span_cache is not None:
+        span_cache.store(environment, coordinates)
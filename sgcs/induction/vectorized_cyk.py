@@ -0,0 +1,420 @@
+import numpy
+
+from induction.coverage_operators import CoverageType
+from induction.cyk_executors import CykStochasticTableExecutor
+from induction.detector import Detector
+from induction.environment import TriangularEnvironment, baum_welch_probability_approach
+from induction.production import Production
+from induction.span_cache import execute_with_span_cache
+
+
+class CompiledStochasticGrammar(object):
+    def __init__(self, rule_population, symbols=None):
+        self.rule_population = rule_population
+        self.symbols = list(symbols) if symbols is not None else []
+        self.symbol_indexes = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        non_terminal_rules = list(rule_population.get_all_non_terminal_rules())
+        terminal_rules = list(rule_population.get_terminal_rules())
+
+        for rule in non_terminal_rules:
+            self.symbol_index(rule.parent)
+            self.symbol_index(rule.left_child)
+            self.symbol_index(rule.right_child)
+        for rule in terminal_rules:
+            self.symbol_index(rule.parent)
+
+        self.size = size = len(self.symbols)
+        self.rule_probabilities = numpy.zeros((size, size, size))
+        self.rule_exists = numpy.zeros((size, size, size), dtype=bool)
+        self.rules = dict()
+        for rule in non_terminal_rules:
+            key = self.symbol_indexes[rule.parent], self.symbol_indexes[rule.left_child], \
+                self.symbol_indexes[rule.right_child]
+            self.rules[key] = rule
+            self.rule_exists[key] = True
+            self.rule_probabilities[key] = rule_population.get_normalized_rule_probability(rule)
+
+        self.pair_has_rule = self.rule_exists.any(axis=0)
+        self.left_children = self.rule_exists.any(axis=(0, 2))
+        self.right_children = self.rule_exists.any(axis=(0, 1))
+
+        self.terminal_probabilities = dict()
+        self.terminal_exists = dict()
+        self.terminal_rules = dict()
+        for rule in terminal_rules:
+            terminal_symbol = rule.left_child
+            if terminal_symbol not in self.terminal_exists:
+                self.terminal_exists[terminal_symbol] = numpy.zeros(size, dtype=bool)
+                self.terminal_probabilities[terminal_symbol] = numpy.zeros(size)
+
+            parent = self.symbol_indexes[rule.parent]
+            self.terminal_exists[terminal_symbol][parent] = True
+            self.terminal_probabilities[terminal_symbol][parent] = \
+                rule_population.get_normalized_rule_probability(rule)
+            self.terminal_rules[parent, terminal_symbol] = rule
+
+    def symbol_index(self, symbol):
+        index = self.symbol_indexes.get(symbol)
+        if index is None:
+            index = len(self.symbols)
+            self.symbol_indexes[symbol] = index
+            self.symbols.append(symbol)
+
+        return index
+
+
+class VectorizedStochasticEnvironment(TriangularEnvironment):
+    def __init__(self, sentence, factory):
+        super().__init__(sentence, factory)
+        self.grammar = None
+        self.grammar_changed = False
+        self._grammars = []
+        self._covered_productions = dict()
+        self.values = self.present = None
+        self.best_shift = self.best_left = self.best_right = None
+
+    def _create_cyk_table(self, factory):
+        return None
+
+    @property
+    def is_inside_approach(self):
+        return self.probability_approach is baum_welch_probability_approach
+
+    def bind_grammar(self, grammar):
+        self.grammar = grammar
+        self.grammar_changed = False
+        self._grammars.append(grammar)
+        self._reserve_symbols(len(grammar.symbols))
+
+    def _reserve_symbols(self, symbols):
+        if self.values is None:
+            cells = self.size * (self.size + 1) // 2
+            self.values = numpy.zeros((cells, symbols))
+            self.present = numpy.zeros((cells, symbols), dtype=bool)
+            self.best_shift, self.best_left, self.best_right = \
+                (numpy.zeros((cells, symbols), dtype=int) for _ in range(3))
+        elif self.values.shape[1] < symbols:
+            padding = ((0, 0), (0, symbols - self.values.shape[1]))
+            self.values, self.present, self.best_shift, self.best_left, self.best_right = \
+                (numpy.pad(array, padding, 'constant') for array in self._cell_arrays())
+
+    def _symbol_index(self, symbol):
+        index = self.grammar.symbol_index(symbol)
+        self._reserve_symbols(index + 1)
+        return index
+
+    def fill_cell(self, row, col):
+        if row == 0:
+            self._fill_terminal_cell(col)
+        else:
+            self._fill_non_terminal_cell(row, col)
+
+    def _fill_terminal_cell(self, col):
+        terminal_symbol = self.get_sentence_symbol(col)
+        exists = self.grammar.terminal_exists.get(terminal_symbol)
+        if exists is not None:
+            size = self.grammar.size
+            self.present[col, :size] = exists
+            self.values[col, :size] = self.grammar.terminal_probabilities[terminal_symbol]
+
+    def _fill_non_terminal_cell(self, row, col):
+        grammar = self.grammar
+        size = grammar.size
+        lefts = [self._cell_index(shift - 1, col) for shift in range(1, row + 1)]
+        rights = [self._cell_index(row - shift, col + shift) for shift in range(1, row + 1)]
+
+        left_present = self.present[lefts, :size] & grammar.left_children
+        right_present = self.present[rights, :size] & grammar.right_children
+        left_ids = numpy.flatnonzero(left_present.any(axis=0))
+        right_ids = numpy.flatnonzero(right_present.any(axis=0))
+        if not len(left_ids) or not len(right_ids):
+            return
+
+        pairs = left_present[:, left_ids, None] & right_present[:, None, right_ids]
+        rule_block = numpy.ix_(numpy.arange(size), left_ids, right_ids)
+        parent_present = (grammar.rule_exists[rule_block] & pairs.any(axis=0)).any(axis=(1, 2))
+        if not parent_present.any():
+            return
+
+        products = self.values[lefts][:, left_ids, None] * self.values[rights][:, None, right_ids]
+        merged = products.sum(axis=0) if self.is_inside_approach else products.max(axis=0)
+        scores = (grammar.rule_probabilities[rule_block] * merged).reshape(size, -1)
+
+        best_pairs = scores.argmax(axis=1)
+        best_lefts, best_rights = numpy.divmod(best_pairs, len(right_ids))
+
+        index = self._cell_index(row, col)
+        self.present[index, :size] = parent_present
+        self.values[index, :size] = scores.sum(axis=1) if self.is_inside_approach \
+            else scores.max(axis=1)
+        self.best_shift[index, :size] = products.argmax(axis=0)[best_lefts, best_rights] + 1
+        self.best_left[index, :size] = left_ids[best_lefts]
+        self.best_right[index, :size] = right_ids[best_rights]
+
+    def prune_cell(self, absolute_coordinates, max_effectors, relative_threshold):
+        index = self._cell_index(*absolute_coordinates)
+        effectors = numpy.flatnonzero(self.present[index])
+        if not len(effectors):
+            return 0
+
+        values = self.values[index, effectors]
+        kept = values >= values.max() * relative_threshold
+        if 0 < max_effectors < len(effectors):
+            best = numpy.zeros(len(effectors), dtype=bool)
+            best[numpy.argsort(-values, kind='stable')[:max_effectors]] = True
+            kept &= best
+
+        pruned = effectors[~kept]
+        self._drop_effectors(index, pruned)
+        self.pruned_effectors += len(pruned)
+        return len(pruned)
+
+    def filter_cell(self, absolute_coordinates, kept_symbols):
+        index = self._cell_index(*absolute_coordinates)
+        effectors = numpy.flatnonzero(self.present[index])
+        dropped = [effector for effector in effectors
+                   if self.grammar.symbols[effector] not in kept_symbols]
+        if not dropped or len(dropped) == len(effectors):
+            return 0
+
+        self._drop_effectors(index, dropped)
+        self.filtered_effectors += len(dropped)
+        return len(dropped)
+
+    def reset_cell(self, absolute_coordinates):
+        index = self._cell_index(*absolute_coordinates)
+        self._drop_effectors(index, numpy.flatnonzero(self.present[index]))
+
+    def add_unsatisfied_detector(self, coordinates):
+        # unsatisfied detectors are derived from the chart in get_unsatisfied_detectors
+        self._cell_index(*coordinates[:2])
+
+    def _drop_effectors(self, index, dropped):
+        self.present[index, dropped] = False
+        self.values[index, dropped] = 0
+        for parent in dropped:
+            self._covered_productions.pop((index, parent), None)
+
+    def _cell_arrays(self):
+        return self.values, self.present, self.best_shift, self.best_left, self.best_right
+
+    def snapshot_cell(self, coordinates):
+        index = self._cell_index(*coordinates)
+        return tuple(array[index].copy() for array in self._cell_arrays())
+
+    def restore_cell(self, coordinates, cell_snapshot):
+        index = self._cell_index(*coordinates)
+        for array, cell_row in zip(self._cell_arrays(), cell_snapshot):
+            array[index, :len(cell_row)] = cell_row
+
+    def _symbol_value(self, index, symbol):
+        symbol_index = self.grammar.symbol_indexes.get(symbol)
+        return 0 if symbol_index is None or symbol_index >= self.values.shape[1] \
+            else self.values[index, symbol_index]
+
+    def add_production(self, production):
+        if production.is_empty():
+            return
+
+        coordinates = production.get_coordinates()
+        index = self._cell_index(*coordinates[:2])
+        rule = production.rule
+        parent = self._symbol_index(rule.parent)
+        self.grammar_changed = True
+
+        if rule.is_terminal_rule():
+            probability = production.probability
+        else:
+            row, col, shift = coordinates[:3]
+            probability = production.probability * \
+                self._symbol_value(self._cell_index(shift - 1, col), rule.left_child) * \
+                self._symbol_value(self._cell_index(row - shift, col + shift), rule.right_child)
+
+        current = self.values[index, parent]
+        is_new_effector = not self.present[index, parent]
+        value = current + probability if self.is_inside_approach else max(current, probability)
+
+        self.present[index, parent] = True
+        self.values[index, parent] = value
+        if is_new_effector or value > current:
+            self._covered_productions[index, parent] = production
+
+    def get_symbols(self, absolute_coordinates):
+        index = self._cell_index(*absolute_coordinates)
+        return [self.grammar.symbols[i] for i in numpy.flatnonzero(self.present[index])]
+
+    def has_no_productions(self, coordinates):
+        return not self.present[self._cell_index(*coordinates)].any()
+
+    def get_left_parent_symbol_count(self, coordinates_with_shift):
+        row, col, shift = coordinates_with_shift
+        return len(self.get_symbols((shift - 1, col)))
+
+    def get_right_parent_symbol_count(self, coordinates_with_shift):
+        row, col, shift = coordinates_with_shift
+        return len(self.get_symbols((row - shift, col + shift)))
+
+    def get_detector_symbols(self, coord):
+        row = coord[0]
+        if row > 0:
+            return self.grammar.symbols[coord[3]], self.grammar.symbols[coord[4]]
+        else:
+            return self._terminal_parent_symbols(coord[1]),
+
+    def get_unsatisfied_detectors(self, coordinates):
+        row, col = coordinates
+        if row == 0:
+            terminal_symbol = self.get_sentence_symbol(col)
+            exists = self.grammar.terminal_exists.get(terminal_symbol)
+            return [Detector(coordinates)] if exists is None or not exists.any() else []
+
+        size = self.grammar.size
+        pair_has_rule = numpy.zeros((self.values.shape[1],) * 2, dtype=bool)
+        pair_has_rule[:size, :size] = self.grammar.pair_has_rule
+
+        detectors = []
+        for shift in range(1, row + 1):
+            left_ids = numpy.flatnonzero(self.present[self._cell_index(shift - 1, col)])
+            right_ids = numpy.flatnonzero(self.present[self._cell_index(row - shift,
+                                                                        col + shift)])
+            for left_id, right_id in zip(*numpy.nonzero(
+                    ~pair_has_rule[numpy.ix_(left_ids, right_ids)])):
+                detectors.append(Detector((row, col, shift, int(left_ids[left_id]),
+                                           int(right_ids[right_id]))))
+
+        return detectors
+
+    def _best_production(self, row, col, parent):
+        index = self._cell_index(row, col)
+        covered_production = self._covered_productions.get((index, parent))
+        if covered_production is not None:
+            return covered_production
+
+        if row == 0:
+            terminal_symbol = self.get_sentence_symbol(col)
+            for grammar in reversed(self._grammars):
+                rule = grammar.terminal_rules.get((parent, terminal_symbol))
+                if rule is not None:
+                    production = Production(Detector((row, col)), rule)
+                    production.probability = \
+                        grammar.terminal_probabilities[terminal_symbol][parent]
+                    return production
+        else:
+            shift, left, right = self.best_shift[index, parent], self.best_left[index, parent], \
+                self.best_right[index, parent]
+            key = parent, left, right
+            for grammar in reversed(self._grammars):
+                rule = grammar.rules.get(key)
+                if rule is not None:
+                    production = Production(
+                        Detector((row, col, int(shift), int(left), int(right))), rule)
+                    production.probability = grammar.rule_probabilities[key]
+                    return production
+
+        return None
+
+    def get_most_probable_production_for(self, symbol, coordinates=None):
+        row, col = coordinates if coordinates is not None else (self.size - 1, 0)
+        index = self._cell_index(row, col)
+        parent = self.grammar.symbol_indexes.get(symbol)
+        if parent is None or parent >= self.values.shape[1] or self.values[index, parent] <= 0:
+            return None
+
+        return self._best_production(row, col, parent)
+
+    def get_last_cell_productions(self):
+        return self._best_productions_of_cell((self.size - 1, 0))
+
+    def _best_productions_of_cell(self, coordinates):
+        index = self._cell_index(*coordinates)
+        productions = (self._best_production(coordinates[0], coordinates[1], parent)
+                       for parent in numpy.flatnonzero(self.present[index]))
+        return [production for production in productions if production is not None]
+
+    def simple_get_child_productions(self, production):
+        if production.is_empty() or production.rule.is_terminal_rule():
+            return None
+
+        coordinates = production.detector.coordinates
+        left_coordinates = self._left_coord(*coordinates)
+        right_coordinates = self._right_coord(*coordinates)
+        return self.get_most_probable_production_for(production.rule.left_child,
+                                                     left_coordinates), \
+            self._symbol_value(self._cell_index(*left_coordinates), production.rule.left_child), \
+            self.get_most_probable_production_for(production.rule.right_child,
+                                                  right_coordinates), \
+            self._symbol_value(self._cell_index(*right_coordinates), production.rule.right_child)
+
+    def _child_production_generator(self, coordinates, symbol):
+        production = self.get_most_probable_production_for(symbol, coordinates)
+        return [production] if production is not None else []
+
+    def get_child_productions(self, production):
+        result = []
+        if not production.rule.is_terminal_rule():
+            coordinates = production.detector.coordinates
+            for child_coordinates, child_symbol in [
+                    (self._left_coord(*coordinates), production.rule.left_child),
+                    (self._right_coord(*coordinates), production.rule.right_child)]:
+                child = self.get_most_probable_production_for(child_symbol, child_coordinates)
+                if child is not None:
+                    result.append(child)
+
+        return result
+
+    def __str__(self):
+        return self.__class__.__name__ + '({' + str(self.values) + "})"
+
+
+class CykVectorizedStochasticTableExecutor(CykStochasticTableExecutor):
+    def __init__(self, cyk_service):
+        super().__init__(cyk_service)
+        self._grammar = None
+
+    def invalidate_grammar(self):
+        self._grammar = None
+
+    def _compiled_grammar(self, rule_population):
+        if self._grammar is None or self._grammar.rule_population is not rule_population:
+            self._grammar = CompiledStochasticGrammar(
+                rule_population, rule_population.compiled_grammar.symbols)
+
+        return self._grammar
+
+    def _fill_cell(self, environment, rule_population, row, col):
+        if environment.grammar_changed:
+            self.invalidate_grammar()
+            environment.bind_grammar(self._compiled_grammar(rule_population))
+
+        execute_with_span_cache(self.cyk_service.span_cache, environment, (row, col),
+                                lambda: self._fill_and_prune_cell(environment, rule_population,
+                                                                  row, col))
+
+        if environment.has_no_productions((row, col)):
+            self.cyk_service.coverage_operations.perform_coverage(
+                self.cyk_service,
+                CoverageType.unknown_terminal_symbol if row == 0
+                else CoverageType.no_effector_found,
+                environment,
+                rule_population,
+                (row, col))
+
+    def _fill_and_prune_cell(self, environment, rule_population, row, col):
+        environment.fill_cell(row, col)
+        self._filter_cell(environment, rule_population, (row, col))
+        self._prune_cell(environment, (row, col))
+
+    def execute(self, environment, rule_population):
+        environment.bind_grammar(self._compiled_grammar(rule_population))
+        sentence_length = environment.get_sentence_length()
+
+        for row in range(sentence_length):
+            for col in range(environment.get_row_length(row)):
+                self._fill_cell(environment, rule_population, row, col)
+
+        result = self._create_result(environment, rule_population)
+        if environment.grammar_changed:
+            self.invalidate_grammar()
+
+        return result
@@ -0,0 +1,135 @@
+import importlib
+import multiprocessing
+
+from induction.bitset_recognizer import BitsetRecognizer
+from induction.cyk_executors import CykResult
+
+_worker_recognizer = None
+_worker_memory = None
+
+
+class SharedChart(object):
+    def __init__(self, buffer, cell_width):
+        self.buffer = buffer
+        self.cell_width = cell_width
+
+    @staticmethod
+    def cell_width_for(recognizer):
+        return max(1, (len(recognizer.grammar.symbols) + 7) // 8)
+
+    def __getitem__(self, index):
+        start = index * self.cell_width
+        return int.from_bytes(self.buffer[start:start + self.cell_width], 'little')
+
+    def __setitem__(self, index, mask):
+        start = index * self.cell_width
+        self.buffer[start:start + self.cell_width] = mask.to_bytes(self.cell_width, 'little')
+
+
+def _shared_memory():
+    return importlib.import_module('multiprocessing.shared_memory')
+
+
+def _initialize_worker(recognizer):
+    global _worker_recognizer
+    _worker_recognizer = recognizer
+
+
+def _attach_worker_memory(memory_name):
+    global _worker_memory
+    if _worker_memory is None or _worker_memory.name != memory_name:
+        if _worker_memory is not None:
+            _worker_memory.close()
+        _worker_memory = _shared_memory().SharedMemory(name=memory_name)
+
+    return _worker_memory
+
+
+def _fill_cells(task):
+    memory_name, cell_width, size, row, columns = task
+    chart = SharedChart(_attach_worker_memory(memory_name).buf, cell_width)
+    offsets = BitsetRecognizer.row_offsets(size)
+    for col in columns:
+        chart[offsets[row] + col] = _worker_recognizer._fill_cell(chart, offsets, row, col)
+
+
+class WavefrontRecognizer(object):
+    def __init__(self, recognizer, length_threshold, worker_count=0, min_cells_per_task=8):
+        self.recognizer = recognizer
+        self.length_threshold = length_threshold
+        self.worker_count = worker_count if worker_count > 0 else multiprocessing.cpu_count()
+        self.min_cells_per_task = min_cells_per_task
+        self._pool = None
+        self._memory = None
+
+    @staticmethod
+    def is_available():
+        try:
+            _shared_memory()
+        except ImportError:
+            return False
+
+        return not multiprocessing.current_process().daemon
+
+    def _row_tasks(self, size, row):
+        row_length = size - row
+        task_count = max(1, min(self.worker_count, row_length // self.min_cells_per_task))
+        task_size, remainder = divmod(row_length, task_count)
+
+        tasks, start = [], 0
+        for i in range(task_count):
+            end = start + task_size + (1 if i < remainder else 0)
+            tasks.append(range(start, end))
+            start = end
+
+        return tasks
+
+    def _shared_chart(self, size):
+        cell_width = SharedChart.cell_width_for(self.recognizer)
+        required_size = size * (size + 1) // 2 * cell_width
+        if self._memory is None or self._memory.size < required_size:
+            self._release_memory()
+            self._memory = _shared_memory().SharedMemory(create=True, size=required_size)
+
+        return SharedChart(self._memory.buf, cell_width)
+
+    def belongs_to_grammar(self, sentence):
+        size = len(sentence)
+        if size <= self.length_threshold or not self.recognizer.starting_mask or \
+                not self.recognizer.covers_all_terminals(sentence):
+            return self.recognizer.belongs_to_grammar(sentence)
+
+        # workers must inherit the resource tracker started by the parent's chart
+        chart = self._shared_chart(size)
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.worker_count, _initialize_worker,
+                                              (self.recognizer,))
+
+        for col in range(size):
+            chart[col] = self.recognizer.grammar.terminal_mask(sentence.get_symbol(col))
+
+        for row in range(1, size):
+            self._pool.map(_fill_cells, [(self._memory.name, chart.cell_width, size, row, columns)
+                                         for columns in self._row_tasks(size, row)])
+
+        return bool(chart[size * (size + 1) // 2 - 1] & self.recognizer.starting_mask)
+
+    def perform_cyk(self, sentence):
+        result = CykResult()
+        result.belongs_to_grammar = self.belongs_to_grammar(sentence)
+        result.is_positive = sentence.is_positive_sentence
+        return result
+
+    def _release_memory(self):
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+        self._release_memory()
@@ -83,7 +83,7 @@ class AddingRuleWithElitismStrategy(AddingRuleWithCrowdingStrategy):
     def __init__(self):
         super().__init__()
         self.hints = [AddingRuleStrategyHint.control_population_size_with_elitism]
-        self.elite = []
+        self.elite = set()
 
     def generate_elite(self, adding_supervisor, statistics, rule_population):
         rules = rule_population.get_all_non_terminal_rules()
@@ -91,7 +91,7 @@ class AddingRuleWithElitismStrategy(AddingRuleWithCrowdingStrategy):
                                   key=statistics.fitness.get_keyfunc_getter(statistics),
                                   reverse=True)
 
-        self.elite = rules_by_fitness[:adding_supervisor.configuration.elitism.size]
+        self.elite = set(rules_by_fitness[:adding_supervisor.configuration.elitism.size])
 
     def apply(self, adding_supervisor, statistics, rule, rule_population):
         if rule_population.has_rule(rule):
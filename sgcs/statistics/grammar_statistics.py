@@ -31,6 +31,10 @@ class RuleStatistics(metaclass=ABCMeta):
     def rule_used(self, rule, usage_info, grammar_statistics):
         pass
 
+    @abstractmethod
+    def rules_used(self, rule_usages, usage_info, grammar_statistics):
+        pass
+
     @abstractmethod
     def removed_rule(self, rule, grammar_statistics):
         pass
@@ -67,8 +71,15 @@ class PasiekaRuleStatistics(RuleStatistics):
         self._rule_info[rule] = PasiekaRuleInfo()
 
     def rule_used(self, rule, usage_info, grammar_statistics):
-        self._left_side_info[rule.parent].left_side_usage += 1
-        self._rule_info[rule].rule_usage += 1
+        usage_count = 1 if usage_info is None else usage_info
+        self._left_side_info[rule.parent].left_side_usage += usage_count
+        self._rule_info[rule].rule_usage += usage_count
+
+    def rules_used(self, rule_usages, usage_info, grammar_statistics):
+        usage_count = 1 if usage_info is None else usage_info
+        for rule, times_used in rule_usages.items():
+            self._left_side_info[rule.parent].left_side_usage += usage_count * times_used
+            self._rule_info[rule].rule_usage += usage_count * times_used
 
     def removed_rule(self, rule, grammar_statistics):
         removed_usage = self._rule_info[rule].rule_usage
@@ -77,7 +88,7 @@ class PasiekaRuleStatistics(RuleStatistics):
 
     @staticmethod
     def create_usage(grammar_statistics, cyk_result, sentence):
-        return None
+        return cyk_result.multiplicity
 
 
 class Fitness(metaclass=ABCMeta):
@@ -112,13 +123,13 @@ class ClassicRuleInfo(RuleInfo):
     def points_total(self):
         return self.points_gained_for_valid_sentences - self.points_gained_for_invalid_sentences
 
-    def apply_usage(self, usage_info):
+    def apply_usage(self, usage_info, times_used=1):
         if usage_info.positive_sentence:
-            self.valid_sentence_usage += usage_info.usage_count
-            self.points_gained_for_valid_sentences += usage_info.points_gained
+            self.valid_sentence_usage += usage_info.usage_count * times_used
+            self.points_gained_for_valid_sentences += usage_info.points_gained * times_used
         else:
-            self.invalid_sentence_usage += usage_info.usage_count
-            self.points_gained_for_invalid_sentences += usage_info.points_gained
+            self.invalid_sentence_usage += usage_info.usage_count * times_used
+            self.points_gained_for_invalid_sentences += usage_info.points_gained * times_used
 
 
 class ClassicRuleUsageInfo(object):
@@ -164,12 +175,28 @@ class ClassicRuleStatistics(RuleStatistics):
         rule_info = self._rule_info[rule]
         rule_info.apply_usage(usage_info)
 
-        if rule == self._worst_rule and usage_info.positive_sentence or \
-                rule == self._best_rule and not usage_info.positive_sentence:
+        if self._invalidates_fertility(rule, usage_info):
             self.search_for_fertility()
         else:
             self.update_fertility(rule, rule_info.points_total())
 
+    def rules_used(self, rule_usages, usage_info, grammar_statistics):
+        should_search_for_fertility = False
+        for rule, times_used in rule_usages.items():
+            self._rule_info[rule].apply_usage(usage_info, times_used)
+            should_search_for_fertility = should_search_for_fertility or \
+                self._invalidates_fertility(rule, usage_info)
+
+        if should_search_for_fertility:
+            self.search_for_fertility()
+        else:
+            for rule in rule_usages:
+                self.update_fertility(rule, self._rule_info[rule].points_total())
+
+    def _invalidates_fertility(self, rule, usage_info):
+        return rule == self._worst_rule and usage_info.positive_sentence or \
+            rule == self._best_rule and not usage_info.positive_sentence
+
     def removed_rule(self, rule, grammar_statistics):
         del self._rule_info[rule]
 
@@ -181,14 +208,34 @@ class ClassicRuleStatistics(RuleStatistics):
         price_value = grammar_statistics.configuration.valid_sentence_price \
             if sentence.is_positive_sentence or sentence.is_positive_sentence is None \
             else grammar_statistics.configuration.invalid_sentence_price
-        return ClassicRuleUsageInfo(sentence.is_positive_sentence, 1, price_value)
+        return ClassicRuleUsageInfo(sentence.is_positive_sentence, cyk_result.multiplicity,
+                                    price_value * cyk_result.multiplicity)
+
+
+class RuleUsageBatch(object):
+    def __init__(self):
+        self.rule_usages = dict()
+        self.sentence = None
+        self.cyk_result = None
+
+    def add(self, rule, sentence, cyk_result):
+        self.rule_usages[rule] = self.rule_usages.get(rule, 0) + 1
+        self.sentence = sentence
+        self.cyk_result = cyk_result
+
+    def apply(self, grammar_statistics):
+        if not self.rule_usages:
+            return
+
+        usage_info = grammar_statistics.rule_statistics.create_usage(
+            grammar_statistics, self.cyk_result, self.sentence)
+        rule_usages, self.rule_usages = self.rule_usages, dict()
+        grammar_statistics.on_rules_usage(rule_usages, usage_info)
 
 
 class StatisticsVisitor(object):
     def __call__(self, production, grammar_statistics, sentence, cyk_result, rules_population):
-        usage_info = grammar_statistics.rule_statistics.create_usage(grammar_statistics, cyk_result,
-                                                                     sentence)
-        grammar_statistics.on_rule_usage(production.rule, usage_info)
+        grammar_statistics.rule_usage_batch.add(production.rule, sentence, cyk_result)
 
 
 class ClassicFitness(Fitness):
@@ -221,6 +268,7 @@ class ClassicFitness(Fitness):
 class DummyCykStatistics(object):
     def __init__(self):
         self.statistics_visitors = []
+        self.rule_usage_batch = RuleUsageBatch()
 
     def get_rule_statistics(self, rule):
         return None
@@ -231,6 +279,12 @@ class DummyCykStatistics(object):
     def on_rule_usage(self, rule, usage_info=None):
         pass
 
+    def on_rules_usage(self, rule_usages, usage_info):
+        pass
+
+    def apply_rule_usage_batch(self):
+        self.rule_usage_batch.apply(self)
+
     def on_rule_removed(self, rule):
         pass
 
@@ -267,6 +321,12 @@ class GrammarStatistics(DummyCykStatistics):
         if self.rule_statistics.has_rule(rule):
             self.rule_statistics.rule_used(rule, usage_info, self)
 
+    def on_rules_usage(self, rule_usages, usage_info):
+        known_rule_usages = {rule: times_used for rule, times_used in rule_usages.items()
+                             if self.rule_statistics.has_rule(rule)}
+        if known_rule_usages:
+            self.rule_statistics.rules_used(known_rule_usages, usage_info, self)
+
     def on_rule_removed(self, rule):
         self.rule_statistics.removed_rule(rule, self)
 
@@ -0,0 +1,80 @@
+import unittest
+from random import Random
+from unittest.mock import create_autospec, patch
+
+from hamcrest import *
+
+from algorithm.gcs_runner import CykServiceVariationManager
+from algorithm.gcs_simulator import GcsSimulator
+from algorithm.run_estimator import RunEstimator
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation, StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from datalayer.symbol_translator import SymbolTranslator
+from utils import Randomizer
+
+
+class TestGcsSimulator(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('B'), Symbol('b'))
+        ]
+
+        self.testing_set = create_autospec(SymbolTranslator)
+        self.testing_set.get_sentences.return_value = [
+            Sentence([Symbol('a'), Symbol('b')], True),
+            Sentence([Symbol('b'), Symbol('a')], True),
+            Sentence([Symbol('a'), Symbol('a')], False),
+            Sentence([Symbol('a'), Symbol('b')], False)
+        ]
+
+    def create_rule_population(self, population_type=RulePopulation):
+        rule_population = population_type(Symbol('S'))
+        for rule in self.rules:
+            rule_population.add_rule(rule, self.randomizer)
+
+        return rule_population
+
+    def perform_generalization_test(self, is_stochastic, rule_population,
+                                    auxiliary_rule_population=None):
+        variant = CykServiceVariationManager(is_stochastic)
+        sut = GcsSimulator(self.randomizer, variant)
+        configuration = variant.create_default_configuration()
+
+        with patch('algorithm.gcs_simulator.GcsRunner') as runner:
+            result = sut._perform_generalization_test(
+                configuration, rule_population, auxiliary_rule_population, self.testing_set,
+                RunEstimator())
+
+        assert_that(runner.called, is_(False))
+        return result
+
+    def test_generalization_test_should_only_recognize_testing_set(self):
+        # Given:
+        rule_population = self.create_rule_population()
+
+        # When:
+        _, n_gen, grammar_estimator, tested_population = self.perform_generalization_test(
+            False, rule_population)
+
+        # Then:
+        assert_that(n_gen, is_(equal_to(0.5)))
+        assert_that(grammar_estimator['sensitivity'].get(0), is_(equal_to(0.5)))
+        assert_that(grammar_estimator['fallout'].get(0), is_(equal_to(0.5)))
+        assert_that(tested_population, is_(rule_population))
+
+    def test_generalization_test_should_fall_back_to_auxiliary_population(self):
+        # Given:
+        rule_population = self.create_rule_population(StochasticRulePopulation)
+
+        # When:
+        _, n_gen, _, tested_population = self.perform_generalization_test(
+            True, None, rule_population)
+
+        # Then:
+        assert_that(n_gen, is_(equal_to(0.5)))
+        assert_that(tested_population, is_(rule_population))
@@ -0,0 +1,111 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation, StochasticRulePopulation
+from core.symbol import Symbol
+from utils import Randomizer
+
+
+class TestCompiledGrammar(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+            Rule(Symbol('C'), Symbol('A'), Symbol('B')),
+            Rule(Symbol('S'), Symbol('B'), Symbol('A')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('B'), Symbol('a'))
+        ]
+
+    def create_rule_population(self, population_type=RulePopulation):
+        rule_population = population_type(Symbol('S'))
+        for rule in self.rules:
+            rule_population.add_rule(rule, self.randomizer)
+
+        return rule_population
+
+    def test_should_index_rules_by_symbol_ids(self):
+        # Given:
+        sut = self.create_rule_population().compiled_grammar
+        a, b = sut.symbol_ids[Symbol('A')], sut.symbol_ids[Symbol('B')]
+
+        # When/Then:
+        assert_that(sut.symbols, has_length(4))
+        assert_that([sut.rules[rule_id] for rule_id in sut.rules_by_right[a][b]],
+                    contains_inanyorder(self.rules[0], self.rules[1]))
+        assert_that(sut.rules_by_right[b], has_length(1))
+        assert_that(sut.get_rules_by_right(Symbol('A'), Symbol('A')), is_(empty()))
+        assert_that(sut.get_rules_by_right(Symbol('X'), Symbol('A')), is_(empty()))
+        assert_that(sut.get_terminal_rules(Symbol('a')),
+                    contains_inanyorder(self.rules[3], self.rules[4]))
+        assert_that(sut.get_terminal_rules(Symbol('b')), is_(empty()))
+
+    def test_should_follow_population_changes(self):
+        # Given:
+        rule_population = self.create_rule_population()
+        sut = rule_population.compiled_grammar
+        new_rule = Rule(Symbol('D'), Symbol('A'), Symbol('B'))
+        removed_rule_id = sut.rule_ids[self.rules[1]]
+
+        # When:
+        rule_population.remove_rule(self.rules[1])
+        rule_population.add_rule(new_rule, self.randomizer)
+        rule_population.remove_rule(self.rules[2])
+
+        # Then:
+        assert_that(rule_population.compiled_grammar, is_(sut))
+        assert_that(sut.rule_ids[new_rule], is_(equal_to(removed_rule_id)))
+        assert_that(sut.get_rules_by_right(Symbol('A'), Symbol('B')),
+                    contains_inanyorder(self.rules[0], new_rule))
+        assert_that(sut.rules_by_right[sut.symbol_ids[Symbol('B')]], is_(empty()))
+
+    def test_should_cache_normalized_probabilities(self):
+        # Given:
+        rule_population = self.create_rule_population(StochasticRulePopulation)
+        rule_population.update_rule_probabilities({rule: 1 for rule in self.rules})
+        sut = rule_population.compiled_grammar
+
+        # When:
+        probabilities = sut.probabilities
+        rule_population.update_rule_probabilities({self.rules[0]: 3})
+
+        # Then:
+        assert_that(probabilities[sut.rule_ids[self.rules[0]]], is_(close_to(0.5, 1e-9)))
+        assert_that(sut.get_normalized_rule_probability(self.rules[0]),
+                    is_(close_to(0.75, 1e-9)))
+        assert_that(sut.get_normalized_rule_probability(self.rules[3]),
+                    is_(close_to(1, 1e-9)))
+
+    def test_readding_rule_should_invalidate_probabilities(self):
+        # Given:
+        rule_population = self.create_rule_population(StochasticRulePopulation)
+        sut = rule_population.compiled_grammar
+        probabilities = sut.probabilities
+
+        # When:
+        rule_population.add_rule(self.rules[0], self.randomizer)
+
+        # Then:
+        assert_that(sut.probabilities, is_not(same_instance(probabilities)))
+        assert_that(sut.get_normalized_rule_probability(self.rules[0]), is_(close_to(
+            rule_population.get_normalized_rule_probability(self.rules[0]), 1e-9)))
+        assert_that(sut.get_normalized_rule_probability(self.rules[2]), is_(close_to(
+            rule_population.get_normalized_rule_probability(self.rules[2]), 1e-9)))
+
+    def test_should_find_symbols_reachable_from_starting_symbol(self):
+        # Given:
+        rule_population = self.create_rule_population()
+        sut = rule_population.compiled_grammar
+
+        # When:
+        reachable_symbols = sut.reachable_symbols
+        rule_population.add_rule(Rule(Symbol('B'), Symbol('C'), Symbol('D')), self.randomizer)
+
+        # Then:
+        assert_that(reachable_symbols, contains_inanyorder(Symbol('S'), Symbol('A'), Symbol('B')))
+        assert_that(sut.reachable_symbols, contains_inanyorder(
+            Symbol('S'), Symbol('A'), Symbol('B'), Symbol('C'), Symbol('D')))
@@ -0,0 +1,43 @@
+import copy
+import pickle
+import unittest
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.symbol import Symbol
+
+
+class TestRule(unittest.TestCase):
+    def test_should_intern_rules_by_symbols(self):
+        # When:
+        sut = Rule.of(Symbol.of(1), Symbol.of(2), Symbol.of(3))
+
+        # Then:
+        assert_that(Rule.of(Symbol(1), Symbol(2), Symbol(3)), is_(same_instance(sut)))
+        assert_that(Rule.of(Symbol(1), Symbol(3), Symbol(2)), is_not(same_instance(sut)))
+        assert_that(sut, is_(equal_to(Rule(Symbol(1), Symbol(2), Symbol(3)))))
+        assert_that(hash(sut), is_(equal_to(hash(Rule(Symbol(1), Symbol(2), Symbol(3))))))
+
+    def test_interned_rules_should_have_distinct_ids(self):
+        # When:
+        rule = Rule.of(Symbol(1), Symbol(2), Symbol(3))
+        terminal_rule = TerminalRule.of(Symbol(1), Symbol(2))
+
+        # Then:
+        assert_that(terminal_rule, is_(same_instance(Rule.of(Symbol(1), Symbol(2)))))
+        assert_that(terminal_rule.is_terminal_rule(), is_(True))
+        assert_that(rule.rule_id, is_not(none()))
+        assert_that(terminal_rule.rule_id, is_not(equal_to(rule.rule_id)))
+        assert_that(Rule(Symbol(1), Symbol(2), Symbol(3)).rule_id, is_(none()))
+
+    def test_copies_should_stay_interned(self):
+        # Given:
+        sut = Rule.of(Symbol(1), Symbol(2), Symbol(3))
+
+        # When/Then:
+        assert_that(pickle.loads(pickle.dumps(sut)), is_(same_instance(sut)))
+        assert_that(copy.deepcopy(sut), is_(same_instance(sut)))
+        assert_that(Rule.json_decoder(sut.json_coder()), is_(same_instance(sut)))
+        assert_that(copy.deepcopy(Rule(Symbol(1), Symbol(2), Symbol(3))),
+                    is_(same_instance(sut)))
@@ -1,8 +1,11 @@
+import copy
 import unittest
+from random import Random
 from unittest.mock import create_autospec, call
 from hamcrest import *
 
 from core.rule import Rule, TerminalRule
+from core.rule_change import RuleChangeJournal, RuleChangeKind
 from core.rule_population import RulePopulation, RulePopulationAccessViolationError, \
     StochasticRulePopulation
 from core.symbol import Symbol
@@ -73,14 +76,31 @@ class TestRulePopulation(unittest.TestCase):
         # Given:
         self.add_rules()
 
-        self.randomizer_mock.sample.return_value = [Rule('A', 'J', 'C'), Rule('D', 'B', 'C')]
+        self.randomizer_mock.sample.return_value = [2, 1]
 
         # When:
         rules = self.sut.get_random_rules(self.randomizer_mock, False, 2)
 
         # Then:
         assert_that(rules, only_contains(Rule('D', 'B', 'C'), Rule('A', 'J', 'C')))
-        assert_that(self.randomizer_mock.sample.called)
+        self.randomizer_mock.sample.assert_called_once_with(range(4), 2)
+
+    def test_random_population_should_be_drawn_from_remaining_rules(self):
+        # Given:
+        self.add_rules()
+        randomizer = Randomizer(Random())
+
+        # When:
+        self.sut.remove_rule(self.rules[1])
+        self.sut.remove_rule(self.rules[3])
+        self.sut.add_rule(self.rules[1], randomizer)
+
+        # Then:
+        assert_that(self.sut.get_random_rules(randomizer, False, 5),
+                    contains_inanyorder(*self.rules[:3]))
+        assert_that(self.sut.get_random_rules_matching_filter(
+            randomizer, False, 5, lambda x: x.parent == 'A'),
+            contains_inanyorder(self.rules[0], self.rules[2]))
 
     def test_should_be_able_to_remove_a_rule(self):
         # Given:
@@ -105,14 +125,15 @@ class TestRulePopulation(unittest.TestCase):
 
         filter = lambda x: x.right_child == 'C'
 
-        self.randomizer_mock.sample.return_value = [Rule('A', 'J', 'C'), Rule('D', 'B', 'C')]
+        self.randomizer_mock.randint.side_effect = [3, 2, 2]
 
         # When:
         rules = self.sut.get_random_rules_matching_filter(self.randomizer_mock, False, 2, filter)
 
         # Then:
         assert_that(rules, only_contains(Rule('D', 'B', 'C'), Rule('A', 'J', 'C')))
-        assert_that(self.randomizer_mock.sample.call_count, is_(equal_to(1)))
+        assert_that(self.randomizer_mock.randint.call_args_list,
+                    is_(equal_to([call(0, 3), call(1, 3), call(2, 3)])))
 
     def test_should_know_if_rule_already_exists(self):
         # Given:
@@ -124,6 +145,151 @@ class TestRulePopulation(unittest.TestCase):
             assert_that(self.sut.has_rule(rule))
         assert_that(not_(self.sut.has_rule(not_added_rule)))
 
+    def test_rule_change_journal_should_record_changes_since_position(self):
+        # Given:
+        self.sut.add_rule(self.rules[0], self.randomizer_mock)
+        journal = self.sut.rule_change_journal
+        position = journal.position
+
+        # When:
+        self.sut.add_rule(self.rules[1], self.randomizer_mock)
+        self.sut.remove_rule(self.rules[0])
+
+        # Then:
+        assert_that(self.sut.rule_change_journal, is_(same_instance(journal)))
+        assert_that(position, is_(equal_to(1)))
+        assert_that(journal.changes_since(position), contains(self.rules[1], self.rules[0]))
+        assert_that(journal.changes_since(journal.position), is_(empty()))
+
+    def test_rule_change_journal_should_forget_applied_changes(self):
+        # Given:
+        journal = self.sut.rule_change_journal
+        self.add_rules()
+
+        # When:
+        journal.forget_before(2)
+
+        # Then:
+        assert_that(journal.position, is_(equal_to(4)))
+        assert_that(journal.changes_since(1), is_(None))
+        assert_that(journal.changes_since(2), contains(self.rules[2], self.rules[3]))
+
+    def test_rule_change_journal_should_be_bounded(self):
+        # Given:
+        self.sut = RulePopulation('S')
+        self.sut._rule_change_journal = RuleChangeJournal(max_length=2)
+        journal = self.sut.rule_change_journal
+
+        # When:
+        self.add_rules()
+
+        # Then:
+        assert_that(journal.position, is_(equal_to(4)))
+        assert_that(journal.changes_since(1), is_(None))
+        assert_that(journal.changes_since(2), contains(self.rules[2], self.rules[3]))
+
+    def test_subscribers_should_be_notified_about_versioned_changes(self):
+        # Given:
+        changes = []
+        self.sut.subscribe(changes.append)
+
+        # When:
+        self.add_rules()
+        self.sut.remove_rule(self.rules[0])
+        self.sut.unsubscribe(changes.append)
+        self.sut.remove_rule(self.rules[1])
+
+        # Then:
+        assert_that(self.sut.version, is_(equal_to(6)))
+        assert_that([change.version for change in changes], contains(1, 2, 3, 4, 5))
+        assert_that([change.kind for change in changes], contains(
+            *[RuleChangeKind.added] * 4 + [RuleChangeKind.removed]))
+        assert_that(changes[-1].rule, is_(same_instance(self.rules[0])))
+
+    def test_copies_should_not_share_subscribers(self):
+        # Given:
+        changes = []
+        self.sut.subscribe(changes.append)
+        self.add_rules()
+        grammar = self.sut.compiled_grammar
+
+        # When:
+        copied = copy.deepcopy(self.sut)
+        copied.remove_rule(self.rules[0])
+
+        # Then:
+        assert_that(changes, has_length(4))
+        assert_that(copied.version, is_(equal_to(5)))
+        assert_that(grammar.rules, has_item(self.rules[0]))
+        assert_that(copied.compiled_grammar.rules, is_not(has_item(self.rules[0])))
+
+    def test_snapshot_should_not_see_later_changes(self):
+        # Given:
+        self.add_rules()
+        terminal_rule = TerminalRule(Symbol('A'), Symbol('a'))
+        self.sut.add_rule(terminal_rule, self.randomizer_mock)
+
+        # When:
+        snapshot = self.sut.snapshot()
+        self.sut.remove_rule(self.rules[0])
+        self.sut.remove_rule(terminal_rule)
+        self.sut.add_rule(Rule('E', 'B', 'C'), self.randomizer_mock)
+
+        # Then:
+        assert_that(snapshot.is_frozen, is_(True))
+        assert_that(snapshot.version, is_(equal_to(5)))
+        assert_that(snapshot.get_all_non_terminal_rules(), contains_inanyorder(*self.rules))
+        assert_that(snapshot.get_rules_by_right(('B', 'C')),
+                    contains_inanyorder(self.rules[0], self.rules[1]))
+        assert_that(snapshot.get_terminal_rules(Symbol('a')), contains(terminal_rule))
+        assert_that(self.sut.get_rules_by_right(('B', 'C')),
+                    contains_inanyorder(self.rules[1], Rule('E', 'B', 'C')))
+        assert_that(self.sut.get_terminal_rules(Symbol('a')), is_(empty()))
+
+    def test_snapshot_should_share_unchanged_buckets(self):
+        # Given:
+        self.add_rules()
+
+        # When:
+        snapshot = self.sut.snapshot()
+        self.sut.remove_rule(self.rules[3])
+
+        # Then:
+        assert_that(snapshot.get_rules_by_right(('B', 'J')), contains(self.rules[3]))
+        assert_that(self.sut._rules_by_right[('B', 'C')],
+                    is_(same_instance(snapshot._rules_by_right[('B', 'C')])))
+        assert_that(self.sut._all_terminal_rules,
+                    is_(same_instance(snapshot._all_terminal_rules)))
+
+    def test_snapshot_should_be_read_only(self):
+        # Given:
+        self.add_rules()
+        snapshot = self.sut.snapshot()
+
+        # When/Then:
+        assert_that(snapshot.snapshot(), is_(same_instance(snapshot)))
+        assert_that(calling(snapshot.add_rule).with_args(Rule('E', 'B', 'C'),
+                                                         self.randomizer_mock),
+                    raises(RulePopulationAccessViolationError))
+        assert_that(calling(snapshot.remove_rule).with_args(self.rules[0]),
+                    raises(RulePopulationAccessViolationError))
+        assert_that(snapshot.get_all_non_terminal_rules(), contains_inanyorder(*self.rules))
+
+    def test_copy_of_snapshot_should_be_modifiable(self):
+        # Given:
+        self.add_rules()
+        snapshot = self.sut.snapshot()
+
+        # When:
+        sut = snapshot.copy()
+        sut.remove_rule(self.rules[0])
+
+        # Then:
+        assert_that(sut.is_frozen, is_(False))
+        assert_that(sut.get_all_non_terminal_rules(), contains_inanyorder(*self.rules[1:]))
+        assert_that(snapshot.get_all_non_terminal_rules(), contains_inanyorder(*self.rules))
+        assert_that(self.sut.get_all_non_terminal_rules(), contains_inanyorder(*self.rules))
+
 
 class TestStochasticRulePopulation(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -214,3 +380,53 @@ class TestStochasticRulePopulation(unittest.TestCase):
                     is_(close_to(0.67, delta=0.01)))
         assert_that(self.sut.left_side_probabilities[self.new_rule.parent],
                     is_(close_to(1, delta=0.01)))
+
+    def test_probability_updates_should_be_versioned(self):
+        # Given:
+        self.randomizer_mock.uniform.return_value = 0.3
+        self.sut.add_rule(self.new_rule, self.randomizer_mock)
+        changes = []
+        self.sut.subscribe(changes.append)
+
+        # When:
+        self.sut.update_rule_probabilities({self.new_rule: 0.5})
+        self.sut.perform_probability_estimation(lambda rule: 1)
+
+        # Then:
+        assert_that(self.sut.version, is_(equal_to(3)))
+        assert_that([change.kind for change in changes],
+                    contains(RuleChangeKind.probabilities_updated,
+                             RuleChangeKind.probabilities_updated))
+        assert_that(self.sut.rule_change_journal.changes_since(1), is_(empty()))
+
+    def test_decoded_population_should_record_added_rules(self):
+        # Given:
+        json = [StochasticRulePopulation.__name__, [0.5, 101, 102, 103], [0.5, 102, 1, None]]
+
+        # When:
+        self.sut.json_decoder(json, self.randomizer_mock)
+
+        # Then:
+        assert_that(self.sut.version, is_(equal_to(2)))
+        assert_that(self.sut.rule_change_journal.changes_since(0), contains(
+            Rule(Symbol(101), Symbol(102), Symbol(103)), TerminalRule(Symbol(102), Symbol(1))))
+        assert_that(self.sut.get_normalized_rule_probability(
+            TerminalRule(Symbol(102), Symbol(1))), is_(equal_to(1)))
+
+    def test_snapshot_should_keep_probabilities(self):
+        # Given:
+        self.randomizer_mock.uniform.side_effect = [0.1, 0.3]
+        self.sut.add_rule(self.new_rule, self.randomizer_mock)
+        self.sut.add_rule(self.another_rule_with_parent_a, self.randomizer_mock)
+
+        # When:
+        snapshot = self.sut.snapshot()
+        self.sut.update_rule_probabilities({self.new_rule: 0.3})
+
+        # Then:
+        assert_that(snapshot.get_normalized_rule_probability(self.new_rule),
+                    is_(close_to(0.25, delta=0.01)))
+        assert_that(self.sut.get_normalized_rule_probability(self.new_rule),
+                    is_(close_to(0.5, delta=0.01)))
+        assert_that(calling(snapshot.update_rule_probabilities).with_args({self.new_rule: 1}),
+                    raises(RulePopulationAccessViolationError))
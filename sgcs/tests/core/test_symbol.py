@@ -0,0 +1,47 @@
+import copy
+import pickle
+import unittest
+
+from hamcrest import *
+
+from core.rule import Rule
+from core.symbol import Symbol
+from datalayer.jsonizer import BasicJsonizer
+
+
+class TestSymbol(unittest.TestCase):
+    def test_should_intern_symbols_by_id(self):
+        # When:
+        sut = Symbol.of(7)
+
+        # Then:
+        assert_that(Symbol.of(7), is_(same_instance(sut)))
+        assert_that(Symbol.of(8), is_not(same_instance(sut)))
+        assert_that(sut, is_(equal_to(Symbol(7))))
+        assert_that(hash(sut), is_(equal_to(hash(Symbol(7)))))
+
+    def test_copies_should_stay_interned(self):
+        # Given:
+        sut = Symbol.of(7)
+
+        # When/Then:
+        assert_that(pickle.loads(pickle.dumps(sut)), is_(same_instance(sut)))
+        assert_that(copy.deepcopy(sut), is_(same_instance(sut)))
+
+    def test_symbols_should_not_carry_instance_dict(self):
+        # Given:
+        sut = Symbol.of(7)
+        jsonizer = BasicJsonizer([Symbol])
+
+        # When/Then:
+        assert_that(hasattr(sut, '__dict__'), is_(False))
+        assert_that(jsonizer.from_json(jsonizer.to_json(sut)), is_(same_instance(sut)))
+
+    def test_decoded_rules_should_use_interned_symbols(self):
+        # When:
+        rule = Rule.json_decoder([101, 102, 101])
+
+        # Then:
+        assert_that(rule.parent, is_(same_instance(Symbol.of(101))))
+        assert_that(rule.left_child, is_(same_instance(Symbol.of(102))))
+        assert_that(rule.right_child, is_(same_instance(rule.parent)))
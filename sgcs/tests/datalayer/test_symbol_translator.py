@@ -38,6 +38,7 @@ class TestSymbolTranslator(unittest.TestCase):
         assert_that(self.sut.word_to_symbol('kota'), is_(equal_to(Symbol(-103))))
         assert_that(self.sut.word_to_symbol('kot'), is_(equal_to(Symbol(-104))))
         assert_that(self.sut.word_to_symbol('ale'), is_(equal_to(Symbol(-105))))
+        assert_that(self.sut.word_to_symbol('ale'), is_(same_instance(Symbol.of(-105))))
         assert_that(calling(self.sut.word_to_symbol).with_args('andrzej'), raises(UnknownWord))
 
     def test_should_be_able_to_get_translated_sentence_generator(self):
@@ -0,0 +1,144 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.beam_pruning import beam_pruned_effectors
+from induction.cyk_configuration import CykConfiguration, InvalidCykConfigurationError
+from induction.cyk_service import CykService, StochasticCykService, VectorizedStochasticCykService
+from induction.detector import Detector
+from induction.environment import viterbi_probability_approach
+from induction.production import Production, ProductionPool
+from statistics.grammar_statistics import GrammarStatistics, PasiekaStatisticsConfiguration
+from utils import Randomizer
+
+
+class TestBeamPruning(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.probabilities = {Symbol('A'): 0.5, Symbol('B'): 0.05, Symbol('C'): 0.3,
+                              Symbol('D'): 0.3}
+
+    def create_rule_population(self, statistics):
+        rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+            TerminalRule(Symbol('X'), Symbol('a')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('A'), Symbol('c')),
+            TerminalRule(Symbol('B'), Symbol('b'))
+        ]
+        rule_population = StochasticRulePopulation(Symbol('S'))
+        for rule in rules:
+            rule_population.add_rule(rule, self.randomizer)
+            statistics.on_added_new_rule(rule)
+
+        rule_population.update_rule_probabilities({rule: 1 for rule in rules})
+        return rule_population
+
+    def perform_cyk(self, service_type, **beam):
+        sut = service_type.default(self.randomizer, None)
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0, **beam)
+        statistics = GrammarStatistics.sgcs_variant(self.randomizer,
+                                                    PasiekaStatisticsConfiguration.default())
+        estimator = EvolutionStepEstimator()
+
+        sut.perform_cyk_for_all_sentences(
+            self.create_rule_population(statistics),
+            [Sentence([Symbol('a'), Symbol('b')], True),
+             Sentence([Symbol('c'), Symbol('b')], True)],
+            estimator, configuration, statistics)
+
+        return sut, estimator
+
+    def test_should_keep_best_effectors(self):
+        assert_that(beam_pruned_effectors(self.probabilities.keys(), self.probabilities, 2, 0),
+                    only_contains(Symbol('B'), Symbol('D')))
+        assert_that(beam_pruned_effectors(self.probabilities.keys(), self.probabilities, 0, 0.5),
+                    only_contains(Symbol('B')))
+        assert_that(beam_pruned_effectors(self.probabilities.keys(), self.probabilities, 0, 0),
+                    is_(empty()))
+
+    def test_pool_should_drop_productions_of_pruned_effectors(self):
+        # Given:
+        sut = ProductionPool()
+        for symbol, probability in self.probabilities.items():
+            production = Production(Detector((0, 0)), TerminalRule(symbol, Symbol('a')))
+            production.probability = probability
+            sut.add_production(production, None, viterbi_probability_approach)
+
+        # When:
+        pruned = sut.prune_effectors(1, 0)
+
+        # Then:
+        assert_that(pruned, is_(equal_to(3)))
+        assert_that(sut.get_effectors(), contains(Symbol('A')))
+        assert_that(sut.get_non_empty_productions(), has_length(1))
+        assert_that(sut.get_best_production_for(Symbol('C')), is_(none()))
+        assert_that(sut.get_best_production_for(Symbol('A')), is_(not_none()))
+
+    def test_should_parse_without_pruning_by_default(self):
+        for service_type in [StochasticCykService, VectorizedStochasticCykService]:
+            # When:
+            sut, estimator = self.perform_cyk(service_type)
+
+            # Then:
+            assert_that(estimator.true_positive, is_(equal_to(2)))
+            assert_that(sut.pruning_report, is_(none()))
+
+    def test_should_report_results_changed_by_pruning(self):
+        for service_type in [StochasticCykService, VectorizedStochasticCykService]:
+            # When:
+            sut, estimator = self.perform_cyk(service_type, should_prune_beam=True, beam_width=1)
+
+            # Then:
+            assert_that(estimator.true_positive, is_(equal_to(1)))
+            assert_that(estimator.false_negative, is_(equal_to(1)))
+            assert_that(sut.pruning_report.pruned_effectors, is_(equal_to(1)))
+            assert_that(sut.pruning_report.pruned_sentences, is_(equal_to(1)))
+            assert_that(sut.pruning_report.changed_results, is_(equal_to(1)))
+
+    def test_relative_threshold_should_keep_close_effectors(self):
+        for service_type in [StochasticCykService, VectorizedStochasticCykService]:
+            # When:
+            sut, estimator = self.perform_cyk(service_type, should_prune_beam=True,
+                                              beam_threshold=0.4)
+
+            # Then:
+            assert_that(estimator.true_positive, is_(equal_to(2)))
+            assert_that(sut.pruning_report.pruned_effectors, is_(equal_to(0)))
+
+    def test_classic_service_should_reject_beam_pruning(self):
+        # Given:
+        sut = CykService.default(self.randomizer, None)
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0, should_prune_beam=True,
+                                                beam_width=1)
+
+        # When/Then:
+        assert_that(calling(sut.prepare_for_step).with_args(configuration, None),
+                    raises(InvalidCykConfigurationError))
+
+    def test_configuration_should_reject_invalid_beam(self):
+        for beam in [dict(beam_width=-1), dict(beam_threshold=1.5),
+                     dict(beam_threshold=-0.1)]:
+            assert_that(calling(CykConfiguration.create).with_args(
+                False, 0, 0, 0, 0, 0, should_prune_beam=True, **beam),
+                raises(InvalidCykConfigurationError))
+
+        assert_that(CykConfiguration.create(False, 0, 0, 0, 0, 0, should_prune_beam=True,
+                                            beam_width=0, beam_threshold=1).beam_pruning,
+                    is_(not_none()))
+
+    def test_service_should_reject_beam_changed_after_creation(self):
+        # Given:
+        sut = StochasticCykService.default(self.randomizer, None)
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0, should_prune_beam=True)
+        configuration.beam_pruning.relative_threshold = 2
+
+        # When/Then:
+        assert_that(calling(sut.prepare_for_step).with_args(configuration, None),
+                    raises(InvalidCykConfigurationError))
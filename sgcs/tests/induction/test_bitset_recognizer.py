@@ -0,0 +1,162 @@
+import unittest
+from random import Random
+from unittest.mock import create_autospec
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation, StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.bitset_recognizer import BitsetGrammar, BitsetRecognizer, bit_indexes
+from induction.cyk_service import CykService, StochasticCykService
+from tests.test_common import she_eats_a_fish_rules
+from utils import Randomizer
+
+
+class TestBitsetGrammar(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rule_population = RulePopulation(Symbol('S'))
+        for rule in [Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+                     Rule(Symbol('C'), Symbol('A'), Symbol('B')),
+                     Rule(Symbol('B'), Symbol('B'), Symbol('B')),
+                     TerminalRule(Symbol('A'), Symbol('a')),
+                     TerminalRule(Symbol('B'), Symbol('b'))]:
+            self.rule_population.add_rule(rule, self.randomizer)
+
+        self.sut = BitsetGrammar(self.rule_population)
+
+    def test_bit_indexes_should_list_set_bits(self):
+        assert_that(list(bit_indexes(0b101001)), is_(equal_to([0, 3, 5])))
+        assert_that(list(bit_indexes(0)), is_(empty()))
+
+    def test_terminal_masks_should_hold_all_parents(self):
+        assert_that(self.sut.symbols_of(self.sut.terminal_mask(Symbol('a'))),
+                    only_contains(Symbol('A')))
+        assert_that(self.sut.terminal_mask(Symbol('x')), is_(equal_to(0)))
+
+    def test_pair_table_should_map_children_to_parents(self):
+        # Given:
+        left = self.sut.mask_of(Symbol('A'))
+        right = self.sut.mask_of(Symbol('B'))
+
+        # When:
+        parents = self.sut.combine(left | right, right)
+
+        # Then:
+        assert_that(self.sut.symbols_of(parents),
+                    contains_inanyorder(Symbol('S'), Symbol('C'), Symbol('B')))
+        assert_that(self.sut.combine(right, left), is_(equal_to(0)))
+
+
+class TestBitsetRecognizer(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+
+    def create_rules(self, rules, population_type=RulePopulation):
+        rule_population = population_type(Symbol('S'))
+        for rule in rules:
+            rule_population.add_rule(rule, self.randomizer)
+
+        return rule_population
+
+    @staticmethod
+    def create_sentence(*words, is_positive_sentence=True):
+        return Sentence([Symbol(word) for word in words], is_positive_sentence)
+
+    def test_should_recognize_sentences_of_the_grammar(self):
+        # Given:
+        sut = BitsetRecognizer(self.create_rules(she_eats_a_fish_rules()))
+
+        # When/Then:
+        assert_that(sut.belongs_to_grammar(
+            self.create_sentence('she', 'eats', 'a', 'fish', 'with', 'a', 'fork')))
+        assert_that(sut.belongs_to_grammar(self.create_sentence('she', 'eats')))
+        assert_that(sut.belongs_to_grammar(self.create_sentence('she', 'a', 'fish')), is_(False))
+        assert_that(sut.belongs_to_grammar(self.create_sentence('he', 'eats')), is_(False))
+
+    def test_should_reject_sentences_with_unknown_words_without_parsing(self):
+        # Given:
+        sut = BitsetRecognizer(self.create_rules(she_eats_a_fish_rules()))
+        sut.fill_chart = create_autospec(sut.fill_chart)
+        sentence = self.create_sentence('she', 'eats', 'a', 'soup')
+
+        # When/Then:
+        assert_that(sut.covers_all_terminals(sentence), is_(False))
+        assert_that(sut.belongs_to_grammar(sentence), is_(False))
+        assert_that(sut.fill_chart.called, is_(False))
+
+    def test_should_recognize_single_word_sentences(self):
+        # Given:
+        sut = BitsetRecognizer(self.create_rules(
+            she_eats_a_fish_rules(TerminalRule(Symbol('S'), Symbol('eats')))))
+
+        # When/Then:
+        assert_that(sut.belongs_to_grammar(self.create_sentence('eats')))
+        assert_that(sut.belongs_to_grammar(self.create_sentence('she')), is_(False))
+
+    def test_chart_cells_should_match_symbols_covering_span(self):
+        # Given:
+        sut = BitsetRecognizer(self.create_rules(she_eats_a_fish_rules()))
+        sentence = self.create_sentence('she', 'eats', 'a', 'fish')
+
+        # When:
+        chart = sut.fill_chart(sentence)
+
+        # Then:
+        offsets = sut.row_offsets(len(sentence))
+        assert_that(chart, has_length(10))
+        assert_that(sut.grammar.symbols_of(chart[offsets[1] + 2]), only_contains(Symbol('NP')))
+        assert_that(sut.grammar.symbols_of(chart[offsets[2] + 1]), only_contains(Symbol('VP')))
+        assert_that(sut.grammar.symbols_of(chart[offsets[3]]), only_contains(Symbol('S')))
+
+    def test_result_should_keep_sentence_polarity(self):
+        # Given:
+        sut = BitsetRecognizer(self.create_rules(she_eats_a_fish_rules()))
+
+        # When:
+        result = sut.perform_cyk(self.create_sentence('she', 'eats', is_positive_sentence=False))
+
+        # Then:
+        assert_that(result.belongs_to_grammar, is_(True))
+        assert_that(result.is_positive, is_(False))
+
+    def test_service_should_feed_recognition_results_to_estimator(self):
+        # Given:
+        rule_population = self.create_rules(she_eats_a_fish_rules())
+        sut = CykService.default(self.randomizer, None)
+        estimator = EvolutionStepEstimator()
+
+        # When:
+        sut.perform_recognition_for_all_sentences(
+            rule_population,
+            [self.create_sentence('she', 'eats', 'a', 'fish'),
+             self.create_sentence('she', 'a', 'fish'),
+             self.create_sentence('she', 'eats', is_positive_sentence=False)],
+            estimator)
+
+        # Then:
+        assert_that(estimator.true_positive, is_(equal_to(1)))
+        assert_that(estimator.false_negative, is_(equal_to(1)))
+        assert_that(estimator.false_positive, is_(equal_to(1)))
+
+    def test_stochastic_recognition_should_ignore_improbable_rules(self):
+        # Given:
+        improbable_rule = Rule(Symbol('S'), Symbol('NP'), Symbol('VP'))
+        rule_population = self.create_rules(
+            she_eats_a_fish_rules(Rule(Symbol('S'), Symbol('NP'), Symbol('N'))),
+            StochasticRulePopulation)
+        rule_population.perform_probability_estimation(
+            lambda rule: 0 if rule == improbable_rule else 1)
+        sut = StochasticCykService.default(self.randomizer, None)
+        estimator = EvolutionStepEstimator()
+
+        # When:
+        sut.perform_recognition_for_all_sentences(
+            rule_population, [self.create_sentence('she', 'eats')], estimator)
+
+        # Then:
+        assert_that(estimator.false_negative, is_(equal_to(1)))
@@ -1,17 +1,21 @@
 import unittest
+from random import Random
 from unittest.mock import create_autospec, PropertyMock, call
 
 from hamcrest import *
 
 from core.rule import Rule, TerminalRule
 from core.rule_population import RulePopulation, StochasticRulePopulation
-from core.symbol import Symbol
+from core.symbol import Symbol, Sentence
 from sgcs.factory import Factory
 from sgcs.induction.cyk_executors import *
-from sgcs.induction.cyk_service import CykService
+from sgcs.induction.coverage_operators import CoverageOperations
+from sgcs.induction.cyk_service import CykService, StochasticCykService
 from sgcs.induction.environment import Environment
 from sgcs.induction.production import ProductionPool, Production, EmptyProduction
-from sgcs.tests.test_common import are_
+from sgcs.tests.test_common import are_, she_eats_a_fish_rules, create_sentences, \
+    create_rule_population
+from sgcs.utils import Randomizer
 
 
 class ExecutorSuite(unittest.TestCase):
@@ -407,3 +411,115 @@ class TestCykStochasticSymbolPairExecutor(ExecutorSuite):
         ))
         assert_that(calls[0][0][0].probability, is_(equal_to(0.3)))
         assert_that(calls[1][0][0].probability, is_(equal_to(0.6)))
+
+
+class TestCykFusedTableExecutor(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rules = she_eats_a_fish_rules(Rule(Symbol('NP'), Symbol('NP'), Symbol('PP')))
+        self.sentences = create_sentences('she eats a fish with a fork', 'she eats',
+                                          'a fish eats she', 'she eats with fork', 'eats')
+
+    def create_rule_population(self, population_type):
+        rule_population = create_rule_population(population_type, self.rules,
+                                                 Randomizer(Random()))
+        if population_type is StochasticRulePopulation:
+            rule_population.perform_probability_estimation(
+                lambda rule: self.rules.index(rule) + 1)
+
+        return rule_population
+
+    @staticmethod
+    def run_executor(service_type, table_executor_type, rule_population, sentence,
+                     filters_unreachable_symbols=False):
+        service = service_type.default(None, None)
+        service.filters_unreachable_symbols = filters_unreachable_symbols
+        coverage_calls = []
+        service._coverage_operations = create_autospec(CoverageOperations)
+        service.coverage_operations.perform_coverage.side_effect = \
+            lambda _, coverage_type, environment, population, coordinates: \
+            coverage_calls.append((coverage_type, coordinates))
+
+        executor = table_executor_type(service)
+        environment = service.factory.create(CykTypeId.environment, sentence, service.factory)
+        result = executor.execute(environment, rule_population)
+
+        chart = [(environment.get_symbols((row, col)),
+                  environment._get_production_pool((row, col)).effector_probabilities,
+                  list(environment.get_unsatisfied_detectors((row, col))))
+                 for row in range(len(sentence)) for col in range(len(sentence) - row)]
+        return (result.belongs_to_grammar, result.is_positive), coverage_calls, chart
+
+    def assert_side_by_side(self, service_type, population_type, hierarchy_executor_type,
+                            fused_executor_type):
+        rule_population = self.create_rule_population(population_type)
+        for sentence in self.sentences:
+            assert_that(
+                self.run_executor(service_type, fused_executor_type, rule_population, sentence),
+                is_(equal_to(self.run_executor(service_type, hierarchy_executor_type,
+                                               rule_population, sentence))))
+
+    def test_fused_executor_should_match_executor_hierarchy(self):
+        self.assert_side_by_side(CykService, RulePopulation, CykTableExecutor,
+                                 CykFusedTableExecutor)
+
+    def test_stochastic_fused_executor_should_match_executor_hierarchy(self):
+        self.assert_side_by_side(StochasticCykService, StochasticRulePopulation,
+                                 CykStochasticTableExecutor, CykStochasticFusedTableExecutor)
+
+    def test_fused_executor_should_filter_unreachable_symbols(self):
+        self.rules += [
+            TerminalRule(Symbol('Y'), Symbol('she')),
+            TerminalRule(Symbol('Y'), Symbol('her')),
+            Rule(Symbol('X'), Symbol('NP'), Symbol('V')),
+            Rule(Symbol('Z'), Symbol('Y'), Symbol('VP'))
+        ]
+        sentence = Sentence([Symbol('her'), Symbol('she'), Symbol('eats')])
+
+        for service_type, population_type, executor_type in [
+                (CykService, RulePopulation, CykFusedTableExecutor),
+                (StochasticCykService, StochasticRulePopulation,
+                 CykStochasticFusedTableExecutor)]:
+            rule_population = self.create_rule_population(population_type)
+            for unfiltered_sentence in self.sentences:
+                assert_that(self.run_executor(service_type, executor_type, rule_population,
+                                              unfiltered_sentence, True)[0],
+                            is_(equal_to(self.run_executor(service_type, executor_type,
+                                                           rule_population,
+                                                           unfiltered_sentence)[0])))
+
+            # When:
+            _, _, chart = self.run_executor(service_type, executor_type, rule_population,
+                                            sentence, True)
+
+            # Then:
+            assert_that([symbols for symbols, _, _ in chart], is_(equal_to([
+                [Symbol('Y')], [Symbol('NP')], [Symbol('VP'), Symbol('V')],
+                [], [Symbol('S')], []])))
+
+    def test_fused_executor_should_keep_unsatisfied_detectors_packed(self):
+        # Given:
+        rule_population = self.create_rule_population(RulePopulation)
+        sentence = self.sentences[3]
+        service = CykService.default(None, None)
+        service._coverage_operations = create_autospec(CoverageOperations)
+        environment = service.factory.create(CykTypeId.environment, sentence, service.factory)
+
+        # When:
+        CykFusedTableExecutor(service).execute(environment, rule_population)
+
+        # Then:
+        production_pools = [environment._get_production_pool((row, col))
+                            for row in range(len(sentence))
+                            for col in range(len(sentence) - row)]
+        assert_that([production for pool in production_pools
+                     for production in pool.all_productions if production.is_empty()],
+                    is_(empty()))
+        assert_that(production_pools[4].get_unsatisfied_coordinates(),
+                    is_(equal_to([(1, 0, 1, 0, 1)])))
+
+    def test_fused_executor_should_be_registered_by_default(self):
+        assert_that(type(CykService.default(None, None).table_executor).__name__,
+                    is_(equal_to(CykFusedTableExecutor.__name__)))
+        assert_that(type(StochasticCykService.default(None, None).table_executor).__name__,
+                    is_(equal_to(CykStochasticFusedTableExecutor.__name__)))
@@ -5,7 +5,7 @@ from hamcrest import *
 
 from core.rule import Rule
 from core.rule_population import RulePopulation
-from sgcs.induction.detector import Detector
+from sgcs.induction.detector import Detector, UnsatisfiedDetectors
 from sgcs.induction.environment import Environment, CykTableIndexError
 
 
@@ -70,3 +70,14 @@ class TestDetector(unittest.TestCase):
         assert_that(prod_b.rule, is_(equal_to(rules[1])))
         self.rule_population_mock.get_rules_by_right.assert_called_once_with(symbols)
         self.environment_mock.get_detector_symbols.assert_called_once_with(self.coordinates)
+
+    def test_unsatisfied_detectors_should_be_materialized_on_access(self):
+        # Given:
+        sut = UnsatisfiedDetectors([self.sut], [(1, 0, 1, 0, 0), (1, 0, 1, 0, 1)])
+
+        # When/Then:
+        assert_that(sut, has_length(3))
+        assert_that(sut[2], is_(equal_to(Detector((1, 0, 1, 0, 1)))))
+        assert_that(list(sut), is_(equal_to(
+            [self.sut, Detector((1, 0, 1, 0, 0)), Detector((1, 0, 1, 0, 1))])))
+        assert_that(calling(sut.__getitem__).with_args(3), raises(IndexError))
@@ -8,7 +8,7 @@ from core.symbol import Sentence, Symbol
 from sgcs.factory import Factory
 from sgcs.induction.cyk_executors import CykTypeId
 from sgcs.induction.detector import Detector
-from sgcs.induction.environment import Environment, CykTableIndexError
+from sgcs.induction.environment import Environment, CykTableIndexError, TriangularEnvironment
 from sgcs.induction.production import Production, ProductionPool
 
 
@@ -124,7 +124,7 @@ class TestEnvironment(unittest.TestCase):
         p1 = self.terminal_production_with(1, 0, 1, 0, 0, Symbol('A'), Symbol('a'))
         p2 = self.terminal_production_with(1, 0, 1, 0, 1, Symbol('B'), Symbol('b'))
         p3 = self.terminal_production_with(1, 0, 1, 0, 1, Symbol('Y'), Symbol('y'))
-        self.production_pool_mock.find_non_empty_productions.side_effect = [(p1, p2), (p3,)]
+        self.production_pool_mock.get_productions_for.side_effect = [(p1, p2), (p3,)]
 
         # When:
         p0_productions = list(self.sut.get_child_productions(p0))
@@ -157,3 +157,71 @@ class TestEnvironment(unittest.TestCase):
     #     assert_that(p1_productions, is_(empty()))
     #     assert_that(p2_productions, is_(empty()))
     #     assert_that(p3_productions, is_(empty()))
+
+    def terminal_production_with_probability(self, col, effector, terminal, probability):
+        production = self.terminal_production_with(0, col, 0, 0, 0, effector, terminal)
+        production.probability = probability
+        return production
+
+    def test_child_productions_should_be_looked_up_by_effector_id(self):
+        # Given:
+        sentence = Sentence([Symbol('x'), Symbol('b')])
+        sut = type(self.sut).with_viterbi_approach(
+            sentence, Factory({CykTypeId.production_pool: ProductionPool}))
+        worse_left = self.terminal_production_with_probability(0, Symbol('A'), 'x', 0.2)
+        best_left = self.terminal_production_with_probability(0, Symbol('A'), 'y', 0.6)
+        other_left = self.terminal_production_with_probability(0, Symbol('C'), 'z', 0.5)
+        right = self.terminal_production_with_probability(1, Symbol('B'), 'b', 0.4)
+        for production in [worse_left, best_left, other_left, right]:
+            sut.add_production(production)
+
+        # When:
+        a_children = sut.simple_get_child_productions(
+            Production(Detector((1, 0, 1, 0, 0)), Rule(Symbol('S'), Symbol('A'), Symbol('B'))))
+        c_children = sut.simple_get_child_productions(
+            Production(Detector((1, 0, 1, 1, 0)), Rule(Symbol('S'), Symbol('C'), Symbol('B'))))
+
+        # Then:
+        assert_that(a_children, is_(equal_to((best_left, 0.6, right, 0.4))))
+        assert_that(c_children, is_(equal_to((other_left, 0.5, right, 0.4))))
+
+
+class TestTriangularEnvironment(TestEnvironment):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_pools = []
+        self.executor_factory = Factory(
+            {
+                CykTypeId.production_pool: self.create_production_pool
+            })
+        self.sut = TriangularEnvironment(self.sentence_mock, self.executor_factory)
+
+    def create_production_pool(self):
+        self.created_pools.append(object())
+        return self.production_pool_mock
+
+    def test_should_be_able_to_get_unsatisfied_detectors(self):
+        # Given:
+        coordinates = (2, 1)
+        self.production_pool_mock.get_unsatisfied_detectors.return_value = [Detector(coordinates)]
+
+        # When:
+        result = self.sut.get_unsatisfied_detectors(coordinates)
+
+        # Then:
+        assert_that(result, only_contains(Detector(coordinates)))
+
+    def test_only_upper_triangle_should_be_allocated(self):
+        assert_that(self.created_pools, has_length(10))
+
+    def test_cells_should_be_mapped_to_distinct_flat_indexes(self):
+        indexes = [self.sut._cell_index(row, col)
+                   for row in range(TestEnvironment.table_size)
+                   for col in range(self.sut.get_row_length(row))]
+
+        assert_that(sorted(indexes), is_(equal_to(list(range(10)))))
+
+    def test_cells_outside_of_triangle_should_not_be_accessible(self):
+        assert_that(calling(self.sut.get_symbols).with_args((1, 3)), raises(CykTableIndexError))
+        assert_that(calling(self.sut.get_symbols).with_args((0, -1)), raises(CykTableIndexError))
+        assert_that(calling(self.sut.get_symbols).with_args((4, 0)), raises(CykTableIndexError))
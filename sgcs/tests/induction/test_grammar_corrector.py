@@ -90,3 +90,22 @@ class TestGrammarCorrector(unittest.TestCase):
                                              self.second_lvl_rule_accessible_from_top,
                                              self.second_lvl_accessible_rule],
                                             self.sut.correct_grammar)
+
+    def test_should_return_rules_removed_from_real_population(self):
+        # Given:
+        rule_population = RulePopulation(Symbol('S'))
+        rules = [self.rule_a, self.rule_b, self.starting_symbol, self.accessible_rule,
+                 self.not_accessible_rule, self.rule_accessible_from_top,
+                 self.mk_rule('S', 'A', 'C'), self.mk_rule('C', 'C', 'B')]
+        for rule in rules:
+            rule_population.add_rule(rule, None)
+
+        # When:
+        removed_rules = self.sut.correct_grammar(rule_population, self.statistics_mock)
+
+        # Then:
+        assert_that(removed_rules, contains_inanyorder(
+            self.starting_symbol, self.rule_accessible_from_top, self.not_accessible_rule))
+        assert_that(rule_population.get_all_non_terminal_rules(),
+                    contains_inanyorder(*rules[3:4] + rules[6:]))
+        assert_that(self.statistics_mock.on_rule_removed.call_count, is_(equal_to(3)))
@@ -0,0 +1,162 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.cyk_configuration import CykConfiguration, InvalidCykConfigurationError
+from induction.cyk_executors import CykTypeId
+from induction.cyk_service import CykService, StochasticCykService
+from induction.incremental_parsing import IncrementalCykParser, IncrementalChartRefresh
+from statistics.grammar_statistics import GrammarStatistics, ClassicalStatisticsConfiguration
+from tests.test_common import she_eats_a_fish_rules, create_sentences, create_rule_population
+from utils import Randomizer
+
+
+class TestIncrementalParsing(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rule_population = create_rule_population(RulePopulation, she_eats_a_fish_rules(),
+                                                      self.randomizer)
+        self.sentences = create_sentences('she eats a fish with a fork', 'a fish eats',
+                                          'she eats a fish', is_positive_sentence=True)
+
+        self.sut = CykService.default(self.randomizer, None)
+        self.sut.configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0)
+
+    @staticmethod
+    def chart_of(environment):
+        size = environment.get_sentence_length()
+        return [(environment.get_symbols((row, col)),
+                 list(environment.get_unsatisfied_detectors((row, col))),
+                 [(production.get_coordinates(), production.rule) for production in
+                  environment._get_production_pool((row, col)).get_non_empty_productions()])
+                for row in range(size) for col in range(size - row)]
+
+    def fresh_chart_of(self, sentence):
+        environment = self.sut.factory.create(CykTypeId.environment, sentence, self.sut.factory)
+        result = self.sut.table_executor.execute(environment, self.rule_population)
+        return result.belongs_to_grammar, self.chart_of(environment)
+
+    def test_reparse_should_match_fresh_parse_after_population_change(self):
+        # Given:
+        parser = IncrementalCykParser(self.sut)
+        for sentence in self.sentences:
+            parser.parse(self.rule_population, sentence)
+
+        self.rule_population.remove_rule(Rule(Symbol('NP'), Symbol('Det'), Symbol('N')))
+        self.rule_population.add_rule(Rule(Symbol('NP'), Symbol('NP'), Symbol('PP')),
+                                      self.randomizer)
+        self.rule_population.add_rule(Rule(Symbol('S'), Symbol('Det'), Symbol('N')),
+                                      self.randomizer)
+
+        for sentence in self.sentences:
+            # When:
+            environment, result = parser.parse(self.rule_population, sentence)
+
+            # Then:
+            assert_that((result.belongs_to_grammar, self.chart_of(environment)),
+                        is_(equal_to(self.fresh_chart_of(sentence))))
+
+    def test_reparse_with_filtering_should_match_fresh_parse(self):
+        # Given:
+        self.rule_population = RulePopulation(Symbol('S'))
+        for rule in [TerminalRule(Symbol('A'), Symbol('a')),
+                     TerminalRule(Symbol('B'), Symbol('b')),
+                     TerminalRule(Symbol('X'), Symbol('a')),
+                     Rule(Symbol('S'), Symbol('A'), Symbol('A'))]:
+            self.rule_population.add_rule(rule, self.randomizer)
+        self.sut.filters_unreachable_symbols = True
+        sentence = Sentence([Symbol('a'), Symbol('b')], True)
+        parser = IncrementalCykParser(self.sut)
+        parser.parse(self.rule_population, sentence)
+
+        # When:
+        self.rule_population.add_rule(Rule(Symbol('S'), Symbol('X'), Symbol('B')),
+                                      self.randomizer)
+        environment, result = parser.parse(self.rule_population, sentence)
+
+        # Then:
+        assert_that(result.belongs_to_grammar, is_(True))
+        assert_that((result.belongs_to_grammar, self.chart_of(environment)),
+                    is_(equal_to(self.fresh_chart_of(sentence))))
+
+    def test_reparse_should_recompute_only_affected_cells(self):
+        # Given:
+        sentence = self.sentences[0]
+        parser = IncrementalCykParser(self.sut)
+        environment, _ = parser.parse(self.rule_population, sentence)
+        journal = self.rule_population.rule_change_journal
+        position = journal.position
+
+        self.rule_population.add_rule(Rule(Symbol('X'), Symbol('P'), Symbol('Det')),
+                                      self.randomizer)
+        chart_refresh = IncrementalChartRefresh(environment, journal, position)
+
+        # When:
+        self.sut.table_executor.execute(environment, self.rule_population, chart_refresh)
+
+        # Then:
+        assert_that(chart_refresh.recomputed_cells, is_(equal_to(6)))
+        assert_that(environment.get_symbols((1, 4)), contains(Symbol('X')))
+        assert_that(self.chart_of(environment),
+                    is_(equal_to(self.fresh_chart_of(sentence)[1])))
+
+    def test_unchanged_population_should_recompute_nothing(self):
+        # Given:
+        parser = IncrementalCykParser(self.sut)
+        environment, _ = parser.parse(self.rule_population, self.sentences[1])
+        journal = self.rule_population.rule_change_journal
+        chart_refresh = IncrementalChartRefresh(environment, journal, journal.position)
+
+        # When:
+        result = self.sut.table_executor.execute(environment, self.rule_population,
+                                                 chart_refresh)
+
+        # Then:
+        assert_that(chart_refresh.recomputed_cells, is_(equal_to(0)))
+        assert_that(result.belongs_to_grammar, is_(True))
+
+    def test_service_should_keep_charts_across_steps_when_configured(self):
+        # Given:
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                                should_parse_incrementally=True)
+        statistics = GrammarStatistics.default(self.randomizer,
+                                               ClassicalStatisticsConfiguration.default())
+        estimators = [EvolutionStepEstimator(), EvolutionStepEstimator()]
+
+        # When:
+        for estimator in estimators:
+            self.sut.perform_cyk_for_all_sentences(self.rule_population, self.sentences,
+                                                   estimator, configuration, statistics)
+
+        # Then:
+        assert_that(self.sut.incremental_parser, has_length(len(self.sentences)))
+        assert_that(estimators[1].true_positive, is_(equal_to(estimators[0].true_positive)))
+        assert_that(estimators[1].true_positive, is_(equal_to(3)))
+        assert_that(self.rule_population.rule_change_journal.changes_since(
+            self.rule_population.rule_change_journal.position), is_(empty()))
+
+    def test_stochastic_service_should_not_parse_incrementally(self):
+        # Given:
+        sut = StochasticCykService.default(self.randomizer, None)
+        sut.configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                                    should_parse_incrementally=True)
+
+        # When/Then:
+        assert_that(sut._should_parse_incrementally(), is_(False))
+        assert_that(self.sut._should_parse_incrementally(), is_(False))
+
+    def test_stochastic_service_should_reject_incremental_parsing(self):
+        # Given:
+        sut = StochasticCykService.default(self.randomizer, None)
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                                should_parse_incrementally=True)
+
+        # When/Then:
+        assert_that(calling(sut.prepare_for_step).with_args(configuration, None),
+                    raises(InvalidCykConfigurationError))
@@ -0,0 +1,123 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_service import StochasticCykService
+from induction.inside_outside import InsideOutsideEstimator
+from statistics.grammar_statistics import GrammarStatistics, PasiekaStatisticsConfiguration
+from utils import Randomizer
+
+
+class TestInsideOutside(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+
+    def create_population(self, rules):
+        rule_population = StochasticRulePopulation(Symbol('S'))
+        for rule in rules:
+            rule_population.add_rule(rule, self.randomizer)
+
+        rule_population.update_rule_probabilities({rule: 1 for rule in rules})
+        return rule_population
+
+    @staticmethod
+    def create_sentences(*sentences, is_positive=True):
+        return [Sentence([Symbol(word) for word in sentence.split()], is_positive)
+                for sentence in sentences]
+
+    def test_should_estimate_relative_frequencies_for_unambiguous_grammar(self):
+        # Given:
+        rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+            Rule(Symbol('S'), Symbol('B'), Symbol('A')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('B'), Symbol('b'))
+        ]
+        rule_population = self.create_population(rules)
+        sentences = self.create_sentences('a b', 'a b', 'b a', 'a b') + \
+            self.create_sentences('b b', is_positive=False)
+
+        # When:
+        InsideOutsideEstimator(rule_population).estimate(sentences)
+
+        # Then:
+        assert_that(rule_population.get_normalized_rule_probability(rules[0]),
+                    is_(close_to(0.75, 1e-9)))
+        assert_that(rule_population.get_normalized_rule_probability(rules[1]),
+                    is_(close_to(0.25, 1e-9)))
+        assert_that(rule_population.get_normalized_rule_probability(rules[2]),
+                    is_(close_to(1, 1e-9)))
+        assert_that(rule_population.get_normalized_rule_probability(rules[3]),
+                    is_(close_to(1, 1e-9)))
+
+    def test_should_count_all_parses_of_ambiguous_sentence(self):
+        # Given:
+        rules = [
+            Rule(Symbol('S'), Symbol('S'), Symbol('S')),
+            TerminalRule(Symbol('S'), Symbol('a'))
+        ]
+        rule_population = self.create_population(rules)
+        sut = InsideOutsideEstimator(rule_population)
+
+        # When:
+        sut.accumulate(self.create_sentences('a a a'))
+
+        # Then:
+        assert_that(sut.sentence_probabilities[0], is_(close_to(0.0625, 1e-9)))
+        assert_that(sut.rule_counts.sum(), is_(close_to(2, 1e-9)))
+        assert_that(sut.terminal_counts[Symbol('a')].sum(), is_(close_to(3, 1e-9)))
+
+        probabilities = sut.estimated_probabilities()
+        assert_that(probabilities[rules[0]], is_(close_to(0.4, 1e-9)))
+        assert_that(probabilities[rules[1]], is_(close_to(0.6, 1e-9)))
+
+    def test_should_leave_probabilities_of_unused_left_sides(self):
+        # Given:
+        rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('A')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('C'), Symbol('c'))
+        ]
+        rule_population = self.create_population(rules)
+        rule_population.update_rule_probabilities({rules[2]: 0.3})
+
+        # When:
+        InsideOutsideEstimator(rule_population).estimate(self.create_sentences('a a', 'c'))
+
+        # Then:
+        assert_that(rule_population.rule_probabilities[rules[2]], is_(close_to(0.3, 1e-9)))
+        assert_that(rule_population.left_side_probabilities[Symbol('C')],
+                    is_(close_to(0.3, 1e-9)))
+
+    def test_service_should_estimate_inside_outside_when_configured(self):
+        # Given:
+        rules = [
+            Rule(Symbol('S'), Symbol('A'), Symbol('B')),
+            Rule(Symbol('S'), Symbol('B'), Symbol('A')),
+            TerminalRule(Symbol('A'), Symbol('a')),
+            TerminalRule(Symbol('B'), Symbol('b'))
+        ]
+        rule_population = self.create_population(rules)
+        sut = StochasticCykService.default(self.randomizer, None)
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                                should_estimate_inside_outside=True)
+        statistics = GrammarStatistics.sgcs_variant(self.randomizer,
+                                                    PasiekaStatisticsConfiguration.default())
+
+        # When:
+        sut.perform_cyk_for_all_sentences(rule_population,
+                                          self.create_sentences('a b', 'b a', 'b a', 'b a'),
+                                          EvolutionStepEstimator(), configuration, statistics)
+
+        # Then:
+        assert_that(rule_population.get_normalized_rule_probability(rules[0]),
+                    is_(close_to(0.25, 1e-9)))
+        assert_that(rule_population.get_normalized_rule_probability(rules[1]),
+                    is_(close_to(0.75, 1e-9)))
@@ -1,5 +1,6 @@
 from random import Random
 from unittest import TestCase
+from unittest.mock import Mock
 
 from hamcrest import *
 
@@ -9,7 +10,8 @@ from core.symbol import Symbol, Sentence
 from grammar_estimator import EvolutionStepEstimator
 from rule_adding import AddingRulesConfiguration, AddingRuleSupervisor
 from sgcs.induction.cyk_configuration import CykConfiguration
-from sgcs.induction.cyk_service import CykService, StochasticCykService
+from sgcs.induction.cyk_service import CykService, StochasticCykService, \
+    VectorizedStochasticCykService
 from sgcs.utils import Randomizer
 from statistics.grammar_statistics import GrammarStatistics, \
     ClassicRuleStatistics, ClassicFitness, ClassicalStatisticsConfiguration
@@ -189,6 +191,30 @@ class TestModuleGCS(TestModuleCommon):
         self.rule_adding.configuration.crowding.factor = 2
         self.rule_adding.configuration.crowding.size = 3
 
+    def test_hopeless_sentence_should_not_be_parsed_when_coverage_is_off(self):
+        # Given:
+        self.service_wire_up(self.random_rules)
+        self.sut.prepare_for_step(self.cyk_configuration, self.statistics)
+        table_executor = self.sut.table_executor
+        table_executor.execute = Mock(wraps=table_executor.execute)
+
+        # When:
+        cyk_result = self.sut.perform_cyk(self.random_rules, self.grammar_sentence, 3)
+
+        # Then:
+        assert_that(table_executor.execute.called, is_(False))
+        assert_that(cyk_result.belongs_to_grammar, is_(False))
+        assert_that(cyk_result.is_positive, is_(True))
+        assert_that(cyk_result.multiplicity, is_(equal_to(3)))
+
+        # When:
+        self.cyk_configuration.coverage.operators.aggressive.chance = 1
+        self.sut.prepare_for_step(self.cyk_configuration, self.statistics)
+        self.sut.perform_cyk(self.random_rules, self.grammar_sentence)
+
+        # Then:
+        assert_that(table_executor.execute.called, is_(True))
+
     def test_adding_coverage_module_should_change_nothing_if_chances_not_set(self):
         self.prepare_rule_adding_module()
 
@@ -365,3 +391,9 @@ class TestModuleSGCS(TestModuleGCS):
             rule_population.add_rule(rule, self.randomizer)
 
         return rule_population
+
+
+class TestModuleVectorizedSGCS(TestModuleSGCS):
+    def setUp(self):
+        super().setUp()
+        self.service_creator = VectorizedStochasticCykService
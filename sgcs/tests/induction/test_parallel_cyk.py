@@ -0,0 +1,161 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation, StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_service import CykService
+from induction.parallel_cyk import ParallelCykExecutor, PopulationUpdate
+from rule_adding import AddingRuleSupervisor
+from statistics.grammar_statistics import GrammarStatistics, ClassicalStatisticsConfiguration
+from utils import Randomizer
+
+
+class TestParallelCyk(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rules = [
+            Rule(Symbol('S'), Symbol('NP'), Symbol('VP')),
+            Rule(Symbol('VP'), Symbol('V'), Symbol('NP')),
+            Rule(Symbol('NP'), Symbol('Det'), Symbol('N')),
+            TerminalRule(Symbol('NP'), Symbol('she')),
+            TerminalRule(Symbol('V'), Symbol('eats')),
+            TerminalRule(Symbol('N'), Symbol('fish')),
+            TerminalRule(Symbol('Det'), Symbol('a'))
+        ]
+        self.sentences = [
+            Sentence([Symbol(word) for word in text.split()], is_positive)
+            for text, is_positive in [
+                ('she eats a fish', True),
+                ('a fish', False),
+                ('she eats she', True),
+                ('a fish eats', False),
+                ('she eats a fish', False)
+            ]
+        ]
+
+    def perform_step(self, configuration, sentences):
+        randomizer = Randomizer(Random(7))
+        rule_population = RulePopulation(Symbol('S'))
+        statistics = GrammarStatistics.default(randomizer,
+                                               ClassicalStatisticsConfiguration.default())
+        for rule in self.rules:
+            rule_population.add_rule(rule, randomizer)
+            statistics.on_added_new_rule(rule)
+
+        sut = CykService.default(randomizer, AddingRuleSupervisor.default(randomizer))
+        estimator = EvolutionStepEstimator()
+        try:
+            sut.perform_cyk_for_all_sentences(rule_population, sentences, estimator,
+                                              configuration, statistics)
+        finally:
+            sut.close()
+
+        usage = [(rule_info.valid_sentence_usage, rule_info.invalid_sentence_usage)
+                 for rule_info in (statistics.get_rule_statistics(rule)[0] for rule in self.rules)]
+        confusion = (estimator.true_positive, estimator.false_positive,
+                     estimator.true_negative, estimator.false_negative)
+        return rule_population, confusion, usage
+
+    def test_split_should_keep_order_and_balance_chunks(self):
+        # Given:
+        sut = ParallelCykExecutor(3)
+
+        # When:
+        chunks = sut.split(list(range(7)))
+
+        # Then:
+        assert_that(chunks, is_(equal_to([[0, 1, 2], [3, 4], [5, 6]])))
+        assert_that(sut.split([1]), is_(equal_to([[1]])))
+        assert_that(sut.split([]), is_(empty()))
+
+    def test_parallel_step_should_merge_to_sequential_result(self):
+        # Given:
+        _, confusion, usage = self.perform_step(
+            CykConfiguration.create(False, 0, 0, 0, 0, 0), self.sentences)
+
+        # When:
+        _, parallel_confusion, parallel_usage = self.perform_step(
+            CykConfiguration.create(False, 0, 0, 0, 0, 0, should_parse_in_parallel=True,
+                                    worker_count=2), self.sentences)
+
+        # Then:
+        assert_that(parallel_confusion, is_(equal_to(confusion)))
+        assert_that(parallel_confusion, is_(equal_to((2, 1, 2, 0))))
+        assert_that(parallel_usage, is_(equal_to(usage)))
+
+    def test_coverage_rules_should_be_applied_after_merge(self):
+        # Given:
+        sentences = [Sentence([Symbol('she'), Symbol('sleeps')], True),
+                     Sentence([Symbol('she'), Symbol('eats'), Symbol('fish')], True)]
+        configuration = CykConfiguration.create(False, 1, 0, 0, 0, 0,
+                                                should_parse_in_parallel=True, worker_count=2)
+
+        # When:
+        rule_population, *_ = self.perform_step(configuration, sentences)
+
+        # Then:
+        assert_that([rule.left_child for rule in rule_population.get_terminal_rules()],
+                    has_item(Symbol('sleeps')))
+        assert_that(rule_population.terminal_rule_count, is_(equal_to(5)))
+
+    def test_update_should_carry_only_changes_since_version(self):
+        # Given:
+        randomizer = Randomizer(Random(7))
+        rule_population = StochasticRulePopulation(Symbol('S'))
+        for rule in self.rules:
+            rule_population.add_rule(rule, randomizer)
+        worker_population = PopulationUpdate.since(rule_population, None).apply(None, randomizer)
+        version = rule_population.version
+
+        # When:
+        rule_population.remove_rule(self.rules[0])
+        rule_population.add_rule(Rule(Symbol('S'), Symbol('NP'), Symbol('V')), randomizer)
+        rule_population.perform_probability_estimation(lambda rule: 1)
+        sut = PopulationUpdate.since(rule_population, version)
+        worker_population = sut.apply(worker_population, randomizer)
+
+        # Then:
+        assert_that(sut.snapshot, is_(None))
+        assert_that(sut.changes, has_length(2))
+        assert_that(worker_population.get_all_non_terminal_rules(),
+                    contains_inanyorder(*rule_population.get_all_non_terminal_rules()))
+        for rule in self.rules[1:]:
+            assert_that(worker_population.get_normalized_rule_probability(rule),
+                        is_(equal_to(rule_population.get_normalized_rule_probability(rule))))
+
+    def test_service_should_keep_workers_across_steps(self):
+        # Given:
+        randomizer = Randomizer(Random(7))
+        rule_population = RulePopulation(Symbol('S'))
+        for rule in self.rules:
+            rule_population.add_rule(rule, randomizer)
+        sut = CykService.default(randomizer, AddingRuleSupervisor.default(randomizer))
+        configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                                should_parse_in_parallel=True, worker_count=2)
+        estimators = [EvolutionStepEstimator(), EvolutionStepEstimator()]
+
+        # When:
+        try:
+            sut.perform_cyk_for_all_sentences(
+                rule_population, self.sentences, estimators[0], configuration,
+                GrammarStatistics.default(randomizer, ClassicalStatisticsConfiguration.default()))
+            executor, workers = sut.parallel_cyk, list(sut.parallel_cyk._workers)
+            rule_population.remove_rule(self.rules[0])
+            sut.perform_cyk_for_all_sentences(
+                rule_population, self.sentences, estimators[1], configuration,
+                GrammarStatistics.default(randomizer, ClassicalStatisticsConfiguration.default()))
+
+            # Then:
+            assert_that(sut.parallel_cyk, is_(same_instance(executor)))
+            assert_that(sut.parallel_cyk._workers, is_(equal_to(workers)))
+            assert_that(estimators[0].true_positive, is_(equal_to(2)))
+            assert_that(estimators[1].true_positive, is_(equal_to(0)))
+        finally:
+            sut.close()
+
+        assert_that(sut.parallel_cyk, is_(None))
@@ -61,6 +61,30 @@ class TestProductionPool(unittest.TestCase):
         # Then:
         assert_that(result, only_contains(empty_detector))
 
+    def test_unsatisfied_detectors_should_be_kept_as_coordinates(self):
+        # Given:
+        coordinates = (2, 1, 1, 0, 0)
+
+        # When:
+        self.sut.add_unsatisfied_detector(coordinates)
+
+        # Then:
+        assert_that(self.sut.is_empty(), is_(equal_to(True)))
+        assert_that(self.sut.get_unsatisfied_coordinates(), only_contains(coordinates))
+        assert_that(self.sut.all_productions, is_(empty()))
+
+    def test_productions_and_pools_should_not_carry_instance_dicts(self):
+        # Given:
+        detector = Detector((1, 0, 1, 0, 0))
+
+        # When:
+        productions = [Production(detector, self.rule), EmptyProduction(detector)]
+
+        # Then:
+        assert_that([hasattr(x, '__dict__') for x in productions + [detector, self.sut]],
+                    only_contains(False))
+        assert_that(hash(detector), is_(equal_to(hash((1, 0, 1, 0, 0)))))
+
     def test_should_be_able_to_find_nonempty_productions_with_a_predicate(self):
         # Given:
         self.rule.configure_mock()
@@ -82,6 +106,23 @@ class TestProductionPool(unittest.TestCase):
         # Then:
         assert_that(rules, only_contains(production2))
 
+    def test_productions_should_be_indexed_by_parent(self):
+        # Given:
+        productions = []
+        for coordinates, parent in [(1, 'A'), (2, 'B'), (3, 'A')]:
+            detector = create_autospec(Detector)
+            detector.configure_mock(coordinates=coordinates)
+            rule = create_autospec(Rule)
+            rule.configure_mock(parent=Symbol(parent))
+            productions.append(Production(detector, rule))
+            self.sut.add_production(productions[-1], (anything(), anything()), None)
+
+        # When/Then:
+        assert_that(self.sut.get_productions_for(Symbol('A')),
+                    contains(productions[0], productions[2]))
+        assert_that(self.sut.get_productions_for(Symbol('B')), contains(productions[1]))
+        assert_that(self.sut.get_productions_for(Symbol('C')), is_(empty()))
+
     def test_viterbi_should_work_well_with_terminal_productions(self):
         # Given:
         production = Production(self.detector, self.rule)
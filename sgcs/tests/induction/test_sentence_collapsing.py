@@ -0,0 +1,136 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import RulePopulation
+from core.symbol import Symbol, Sentence
+from grammar_estimator import EvolutionStepEstimator
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_service import CykService
+from statistics.grammar_statistics import GrammarStatistics, ClassicalStatisticsConfiguration
+from utils import Randomizer
+
+
+class TestSentenceCollapsing(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rules = [
+            Rule(Symbol('S'), Symbol('NP'), Symbol('VP')),
+            Rule(Symbol('VP'), Symbol('V'), Symbol('NP')),
+            Rule(Symbol('NP'), Symbol('Det'), Symbol('N')),
+            TerminalRule(Symbol('NP'), Symbol('she')),
+            TerminalRule(Symbol('V'), Symbol('eats')),
+            TerminalRule(Symbol('N'), Symbol('fish')),
+            TerminalRule(Symbol('Det'), Symbol('a'))
+        ]
+        self.sentences = [
+            self.create_sentence(text, is_positive) for text, is_positive in [
+                ('she eats a fish', True),
+                ('a fish', False),
+                ('she eats a fish', True),
+                ('she eats a fish', False),
+                ('a fish', False),
+                ('she eats a fish', True)
+            ]
+        ]
+
+    @staticmethod
+    def create_sentence(text, is_positive):
+        return Sentence([Symbol(word) for word in text.split()], is_positive)
+
+    def create_rule_population(self, statistics=None):
+        rule_population = RulePopulation(Symbol('S'))
+        for rule in self.rules:
+            rule_population.add_rule(rule, self.randomizer)
+            if statistics is not None:
+                statistics.on_added_new_rule(rule)
+
+        return rule_population
+
+    def perform_step(self, should_collapse_sentences):
+        statistics = GrammarStatistics.default(self.randomizer,
+                                               ClassicalStatisticsConfiguration.default())
+        rule_population = self.create_rule_population(statistics)
+
+        sut = CykService.default(self.randomizer, None)
+        parsed_sentences = []
+        perform_cyk = sut.perform_cyk
+        sut.perform_cyk = lambda *args: parsed_sentences.append(args[1]) or perform_cyk(*args)
+        estimator = EvolutionStepEstimator()
+
+        sut.perform_cyk_for_all_sentences(
+            rule_population, self.sentences, estimator,
+            CykConfiguration.create(False, 0, 0, 0, 0, 0,
+                                    should_collapse_sentences=should_collapse_sentences),
+            statistics)
+
+        usage = [(rule_info.valid_sentence_usage, rule_info.invalid_sentence_usage,
+                  rule_info.points_total())
+                 for rule_info in (statistics.get_rule_statistics(rule)[0] for rule in self.rules)]
+        return parsed_sentences, estimator, usage
+
+    def perform_recognition(self, should_collapse_sentences):
+        sut = CykService.default(self.randomizer, None)
+        sut.configuration = CykConfiguration.create(
+            False, 0, 0, 0, 0, 0, should_collapse_sentences=should_collapse_sentences)
+        recognized_sentences = []
+        create_recognizer = sut.create_recognizer
+
+        def create_counting_recognizer(rule_population):
+            recognizer = create_recognizer(rule_population)
+            perform_cyk = recognizer.perform_cyk
+            recognizer.perform_cyk = \
+                lambda sentence: recognized_sentences.append(sentence) or perform_cyk(sentence)
+            return recognizer
+
+        sut.create_recognizer = create_counting_recognizer
+        estimator = EvolutionStepEstimator()
+
+        sut.perform_recognition_for_all_sentences(self.create_rule_population(),
+                                                  self.sentences, estimator)
+        return recognized_sentences, estimator
+
+    def test_collapse_duplicates_should_count_sentences_with_same_label(self):
+        # When:
+        collapsed = Sentence.collapse_duplicates(self.sentences)
+
+        # Then:
+        assert_that([(sentence.is_positive_sentence, count) for sentence, count in collapsed],
+                    is_(equal_to([(True, 3), (False, 2), (False, 1)])))
+        assert_that(collapsed[0][0], is_(same_instance(self.sentences[0])))
+
+    def test_collapsed_step_should_match_uncollapsed_step(self):
+        # Given:
+        parsed, estimator, usage = self.perform_step(False)
+
+        # When:
+        collapsed_parsed, collapsed_estimator, collapsed_usage = self.perform_step(True)
+
+        # Then:
+        assert_that(parsed, has_length(6))
+        assert_that(collapsed_parsed, has_length(3))
+        assert_that((collapsed_estimator.true_positive, collapsed_estimator.false_positive,
+                     collapsed_estimator.true_negative, collapsed_estimator.false_negative),
+                    is_(equal_to((estimator.true_positive, estimator.false_positive,
+                                  estimator.true_negative, estimator.false_negative))))
+        assert_that(collapsed_estimator.true_positive, is_(equal_to(3)))
+        assert_that(collapsed_usage, is_(equal_to(usage)))
+
+    def test_collapsed_recognition_should_match_uncollapsed_recognition(self):
+        # Given:
+        recognized, estimator = self.perform_recognition(False)
+
+        # When:
+        collapsed_recognized, collapsed_estimator = self.perform_recognition(True)
+
+        # Then:
+        assert_that(recognized, has_length(6))
+        assert_that(collapsed_recognized, has_length(3))
+        assert_that((collapsed_estimator.true_positive, collapsed_estimator.false_positive,
+                     collapsed_estimator.true_negative, collapsed_estimator.false_negative),
+                    is_(equal_to((estimator.true_positive, estimator.false_positive,
+                                  estimator.true_negative, estimator.false_negative))))
+        assert_that(collapsed_estimator.true_positive, is_(equal_to(3)))
@@ -0,0 +1,172 @@
+import unittest
+from random import Random
+from unittest.mock import create_autospec
+
+from hamcrest import *
+
+from core.rule import TerminalRule
+from core.rule_population import RulePopulation, StochasticRulePopulation
+from core.symbol import Symbol
+from grammar_estimator import EvolutionStepEstimator
+from induction.coverage_operators import CoverageOperations, CoverageOperator, CoverageType
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_executors import CykTypeId
+from induction.cyk_service import CykService, StochasticCykService, \
+    VectorizedStochasticCykService
+from induction.detector import Detector
+from induction.environment import Environment
+from induction.production import Production
+from induction.span_cache import SpanCache
+from rule_adding import AddingRuleSupervisor
+from statistics.grammar_statistics import GrammarStatistics, ClassicalStatisticsConfiguration
+from tests.test_common import she_eats_a_fish_rules, create_sentences, create_rule_population
+from utils import Randomizer
+
+
+class TestSpanCache(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rules = she_eats_a_fish_rules()
+        self.sentences = create_sentences('she eats a fish with a fork', 'she eats a fish',
+                                          'a fish with a fork')
+
+    def create_rule_population(self, population_type):
+        rule_population = create_rule_population(population_type, self.rules, self.randomizer)
+        if population_type is StochasticRulePopulation:
+            rule_population.perform_probability_estimation(
+                lambda rule: self.rules.index(rule) + 1)
+
+        return rule_population
+
+    def parse_all(self, service_type, rule_population, span_cache):
+        service = service_type.default(self.randomizer, None)
+        service.configuration = CykConfiguration.create(False, 0, 0, 0, 0, 0)
+        service.span_cache = span_cache
+
+        charts = []
+        for sentence in self.sentences:
+            environment = service.factory.create(CykTypeId.environment, sentence, service.factory)
+            result = service.table_executor.execute(environment, rule_population)
+            charts.append((result.belongs_to_grammar, [
+                (environment.get_symbols((row, col)),
+                 environment.get_most_probable_production_for(Symbol('S'), (row, col)))
+                for row in range(len(sentence)) for col in range(len(sentence) - row)]))
+
+        return charts
+
+    def assert_cached_parse_is_identical(self, service_type, population_type):
+        # Given:
+        rule_population = self.create_rule_population(population_type)
+        span_cache = SpanCache()
+
+        # When:
+        cached_charts = self.parse_all(service_type, rule_population, span_cache)
+
+        # Then:
+        assert_that(cached_charts,
+                    is_(equal_to(self.parse_all(service_type, rule_population, None))))
+        assert_that(span_cache.hits, is_(greater_than(0)))
+
+    def test_cached_spans_should_reproduce_gcs_chart(self):
+        self.assert_cached_parse_is_identical(CykService, RulePopulation)
+
+    def test_cached_spans_should_reproduce_sgcs_chart(self):
+        self.assert_cached_parse_is_identical(StochasticCykService, StochasticRulePopulation)
+
+    def test_cached_spans_should_reproduce_vectorized_chart(self):
+        self.assert_cached_parse_is_identical(VectorizedStochasticCykService,
+                                              StochasticRulePopulation)
+
+    def test_span_key_should_depend_only_on_terminals(self):
+        # Given:
+        factory = CykService.default(self.randomizer, None).factory
+        environment = factory.create(CykTypeId.environment, self.sentences[0], factory)
+
+        # When/Then:
+        assert_that(SpanCache.span_key(environment, (1, 2)),
+                    is_(equal_to((Symbol('a'), Symbol('fish')))))
+        assert_that(SpanCache.span_key(environment, (1, 5)),
+                    is_(equal_to((Symbol('a'), Symbol('fork')))))
+
+    def perform_terminal_coverage(self, span_cache, add_rule):
+        rule_population = RulePopulation(Symbol('S'))
+        span_cache.follow(rule_population)
+        span_cache._spans[(Symbol('a'),)] = []
+        rule_adding_mock = create_autospec(AddingRuleSupervisor)
+        rule_adding_mock.add_rule.side_effect = add_rule
+        cyk_service_mock = create_autospec(CykService)
+        cyk_service_mock.configure_mock(span_cache=span_cache, rule_adding=rule_adding_mock)
+        operator_mock = create_autospec(CoverageOperator)
+        operator_mock.configure_mock(coverage_type=CoverageType.unknown_terminal_symbol)
+        operator_mock.cover.return_value = Production(
+            Detector((0, 0)), TerminalRule(Symbol('A'), Symbol('a')))
+        environment_mock = create_autospec(Environment)
+        environment_mock.configure_mock(probability_approach=None)
+        sut = CoverageOperations()
+        sut.operators = [operator_mock]
+
+        sut.perform_coverage(cyk_service_mock, CoverageType.unknown_terminal_symbol,
+                             environment_mock, rule_population, (0, 0))
+
+    def test_coverage_adding_rule_should_invalidate_cache(self):
+        # Given:
+        span_cache = SpanCache()
+
+        # When:
+        self.perform_terminal_coverage(
+            span_cache,
+            lambda rule, rule_population, *args: rule_population.add_rule(rule, self.randomizer))
+
+        # Then:
+        assert_that(len(span_cache), is_(equal_to(0)))
+
+    def test_coverage_with_rejected_rule_should_keep_cache(self):
+        # Given:
+        span_cache = SpanCache()
+
+        # When:
+        self.perform_terminal_coverage(span_cache, lambda *args: None)
+
+        # Then:
+        assert_that(len(span_cache), is_(equal_to(1)))
+
+    def test_cache_should_live_only_during_step_when_configured(self):
+        # Given:
+        rule_population = self.create_rule_population(RulePopulation)
+        sut = CykService.default(self.randomizer, None)
+        seen_caches = []
+        perform_cyk = sut.perform_cyk
+        sut.perform_cyk = lambda *args: seen_caches.append(sut.span_cache) or perform_cyk(*args)
+
+        # When:
+        for should_cache_spans in [True, False]:
+            sut.perform_cyk_for_all_sentences(
+                rule_population, self.sentences[:1], EvolutionStepEstimator(),
+                CykConfiguration.create(False, 0, 0, 0, 0, 0, should_cache_spans),
+                GrammarStatistics.default(self.randomizer,
+                                          ClassicalStatisticsConfiguration.default()))
+
+        # Then:
+        assert_that(seen_caches[0], is_(instance_of(SpanCache)))
+        assert_that(seen_caches[1], is_(None))
+        assert_that(sut.span_cache, is_(None))
+
+    def test_removing_rule_between_parses_should_invalidate_cache(self):
+        # Given:
+        rule_population = self.create_rule_population(RulePopulation)
+        sut = CykService.default(self.randomizer, None)
+        sut.prepare_for_step(
+            CykConfiguration.create(False, 0, 0, 0, 0, 0, True),
+            GrammarStatistics.default(self.randomizer, ClassicalStatisticsConfiguration.default()))
+        sentence = self.sentences[1]
+        first_result = sut.perform_cyk(rule_population, sentence)
+
+        # When:
+        rule_population.remove_rule(self.rules[0])
+        result = sut.perform_cyk(rule_population, sentence)
+
+        # Then:
+        assert_that(first_result.belongs_to_grammar, is_(True))
+        assert_that(result.belongs_to_grammar, is_(False))
+        assert_that(sut.span_cache.hits, is_(equal_to(0)))
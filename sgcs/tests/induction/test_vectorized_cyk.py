@@ -0,0 +1,175 @@
+import unittest
+from random import Random
+
+from hamcrest import *
+
+from core.rule import Rule, TerminalRule
+from core.rule_population import StochasticRulePopulation
+from core.symbol import Symbol, Sentence
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_service import StochasticCykService, VectorizedStochasticCykService
+from induction.environment import CykTableIndexError, TriangularEnvironment
+from induction.vectorized_cyk import CompiledStochasticGrammar, VectorizedStochasticEnvironment
+from tests.test_common import she_eats_a_fish_rules, create_rule_population
+from utils import Randomizer
+
+
+class TestVectorizedCyk(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.cyk_configuration = CykConfiguration.create(
+            should_correct_grammar=False,
+            terminal_chance=0,
+            universal_chance=0,
+            aggressive_chance=0,
+            starting_chance=0,
+            full_chance=0
+        )
+
+        rules = she_eats_a_fish_rules(Rule(Symbol('S'), Symbol('NP'), Symbol('V')),
+                                      Rule(Symbol('NP'), Symbol('NP'), Symbol('PP')))
+        self.rule_population = create_rule_population(StochasticRulePopulation, rules,
+                                                      self.randomizer)
+        self.rule_population.perform_probability_estimation(lambda rule: rules.index(rule) + 1)
+
+    @staticmethod
+    def create_sentence(*words):
+        return Sentence([Symbol(word) for word in words])
+
+    def parse(self, service_type, sentence, approach, filters_unreachable_symbols=False):
+        service = service_type.default(self.randomizer, None)
+        service.configuration = self.cyk_configuration
+        service.filters_unreachable_symbols = filters_unreachable_symbols
+        environment = approach(service_type, sentence, service.factory)
+        result = service.table_executor.execute(environment, self.rule_population)
+        return result, environment
+
+    @staticmethod
+    def viterbi_environment(service_type, sentence, factory):
+        return VectorizedStochasticEnvironment.with_viterbi_approach(sentence, factory) \
+            if service_type is VectorizedStochasticCykService \
+            else TriangularEnvironment.with_viterbi_approach(sentence, factory)
+
+    @staticmethod
+    def inside_environment(service_type, sentence, factory):
+        return VectorizedStochasticEnvironment.with_baum_welch_approach(sentence, factory) \
+            if service_type is VectorizedStochasticCykService \
+            else TriangularEnvironment.with_baum_welch_approach(sentence, factory)
+
+    def assert_same_charts(self, approach, filters_unreachable_symbols=False):
+        sentence = self.create_sentence('she', 'eats', 'a', 'fish', 'with', 'a', 'fork')
+        _, expected = self.parse(StochasticCykService, sentence, approach,
+                                 filters_unreachable_symbols)
+        _, actual = self.parse(VectorizedStochasticCykService, sentence, approach,
+                               filters_unreachable_symbols)
+
+        for row in range(len(sentence)):
+            for col in range(len(sentence) - row):
+                probabilities = expected._get_production_pool((row, col)).effector_probabilities
+                assert_that(actual.get_symbols((row, col)),
+                            contains_inanyorder(*probabilities.keys()))
+                for symbol, probability in probabilities.items():
+                    assert_that(actual.values[actual._cell_index(row, col),
+                                              actual.grammar.symbol_indexes[symbol]],
+                                is_(close_to(probability, 1e-12)))
+
+    def test_compiled_grammar_should_hold_normalized_probabilities(self):
+        # Given:
+        rule = Rule(Symbol('S'), Symbol('NP'), Symbol('VP'))
+
+        # When:
+        sut = CompiledStochasticGrammar(self.rule_population)
+
+        # Then:
+        key = sut.symbol_indexes[Symbol('S')], sut.symbol_indexes[Symbol('NP')], \
+            sut.symbol_indexes[Symbol('VP')]
+        assert_that(sut.rules[key], is_(equal_to(rule)))
+        assert_that(sut.rule_probabilities[key],
+                    is_(close_to(self.rule_population.get_normalized_rule_probability(rule),
+                                 1e-12)))
+        assert_that(sut.rule_exists.sum(), is_(equal_to(7)))
+        assert_that(sut.terminal_exists[Symbol('eats')].sum(), is_(equal_to(2)))
+
+    def test_compiled_grammar_should_keep_given_symbol_order(self):
+        # When:
+        sut = CompiledStochasticGrammar(self.rule_population, [Symbol('X'), Symbol('S')])
+
+        # Then:
+        assert_that(sut.symbols[:2], contains(Symbol('X'), Symbol('S')))
+        assert_that(sut.size, is_(equal_to(len(sut.symbols))))
+
+    def test_viterbi_chart_should_match_object_engine(self):
+        self.assert_same_charts(self.viterbi_environment)
+
+    def test_inside_chart_should_match_object_engine(self):
+        self.assert_same_charts(self.inside_environment)
+
+    def test_filtered_chart_should_match_object_engine(self):
+        # Given:
+        for rule in [TerminalRule(Symbol('Y'), Symbol('she')),
+                     Rule(Symbol('X'), Symbol('NP'), Symbol('V')),
+                     Rule(Symbol('Z'), Symbol('Y'), Symbol('VP'))]:
+            self.rule_population.add_rule(rule, self.randomizer)
+        self.rule_population.perform_probability_estimation(lambda rule: 1)
+
+        # When/Then:
+        self.assert_same_charts(self.viterbi_environment, True)
+
+        _, sut = self.parse(VectorizedStochasticCykService, self.create_sentence('she', 'eats'),
+                            self.viterbi_environment, True)
+        assert_that(sut.get_symbols((0, 0)), contains(Symbol('NP')))
+        assert_that(sut.get_symbols((1, 0)), contains(Symbol('S')))
+        assert_that(sut.filtered_effectors, is_(equal_to(2)))
+
+    def test_backpointers_should_rebuild_most_probable_tree(self):
+        # Given:
+        sentence = self.create_sentence('she', 'eats', 'a', 'fish')
+
+        # When:
+        result, sut = self.parse(VectorizedStochasticCykService, sentence,
+                                 self.viterbi_environment)
+
+        # Then:
+        assert_that(result.belongs_to_grammar, is_(True))
+        root = sut.get_most_probable_production_for(Symbol('S'))
+        assert_that(root.rule, is_(equal_to(Rule(Symbol('S'), Symbol('NP'), Symbol('VP')))))
+        assert_that(root.get_coordinates(), is_(equal_to((3, 0, 1, sut.grammar.symbol_indexes[
+            Symbol('NP')], sut.grammar.symbol_indexes[Symbol('VP')]))))
+        assert_that([child.rule for child in sut.get_child_productions(root)], contains(
+            TerminalRule(Symbol('NP'), Symbol('she')),
+            Rule(Symbol('VP'), Symbol('V'), Symbol('NP'))))
+
+    def test_unknown_sentence_should_not_belong_to_grammar(self):
+        # When:
+        result, sut = self.parse(VectorizedStochasticCykService,
+                                 self.create_sentence('fish', 'she'),
+                                 self.viterbi_environment)
+
+        # Then:
+        assert_that(result.belongs_to_grammar, is_(False))
+        assert_that(sut.get_most_probable_production_for(Symbol('S')), is_(None))
+        assert_that(sut.get_unsatisfied_detectors((1, 0)), has_length(1))
+
+    def test_chart_should_support_inherited_cell_operations(self):
+        # Given:
+        result, sut = self.parse(VectorizedStochasticCykService,
+                                 self.create_sentence('she', 'eats', 'a', 'fish'),
+                                 self.viterbi_environment)
+        root = sut.get_most_probable_production_for(Symbol('S'))
+
+        # When:
+        children = sut.simple_get_child_productions(root)
+        sut.add_unsatisfied_detector((1, 0, 1, 0, 0))
+        sut.reset_cell((3, 0))
+
+        # Then:
+        assert_that([children[0].rule, children[2].rule], contains(
+            TerminalRule(Symbol('NP'), Symbol('she')),
+            Rule(Symbol('VP'), Symbol('V'), Symbol('NP'))))
+        assert_that(children[1], is_(greater_than(0)))
+        assert_that(children[3], is_(greater_than(0)))
+        assert_that(sut.has_no_productions((3, 0)), is_(True))
+        assert_that(sut.get_most_probable_production_for(Symbol('S')), is_(None))
+        assert_that(calling(sut.add_unsatisfied_detector).with_args((4, 0)),
+                    raises(CykTableIndexError))
@@ -0,0 +1,98 @@
+import sys
+import unittest
+from random import Random
+from unittest.mock import patch
+
+from hamcrest import *
+
+from core.rule import Rule
+from core.rule_population import RulePopulation
+from core.symbol import Symbol
+from grammar_estimator import EvolutionStepEstimator
+from induction.bitset_recognizer import BitsetRecognizer
+from induction.cyk_configuration import CykConfiguration
+from induction.cyk_service import CykService
+from induction.wavefront import SharedChart, WavefrontRecognizer
+from tests.test_common import she_eats_a_fish_rules, create_sentences, create_rule_population
+from utils import Randomizer
+
+
+class TestWavefrontRecognizer(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.randomizer = Randomizer(Random())
+        self.rule_population = create_rule_population(
+            RulePopulation, she_eats_a_fish_rules(Rule(Symbol('NP'), Symbol('NP'), Symbol('PP'))),
+            self.randomizer)
+
+        long_tail = ' with a fork' * 6
+        self.sentences = create_sentences(
+            'she eats a fish' + long_tail, 'she eats a fish with' + long_tail, 'she eats a fish',
+            'a fish eats she' + long_tail, is_positive_sentence=True)
+
+    def test_shared_chart_should_round_trip_masks(self):
+        # Given:
+        sut = SharedChart(bytearray(6), 2)
+
+        # When:
+        sut[1] = 0b1000000001
+        sut[2] = 0xffff
+
+        # Then:
+        assert_that([sut[0], sut[1], sut[2]], is_(equal_to([0, 0b1000000001, 0xffff])))
+
+    def test_wavefront_should_match_sequential_recognition(self):
+        # Given:
+        recognizer = BitsetRecognizer(self.rule_population)
+        sut = WavefrontRecognizer(recognizer, 8, worker_count=2, min_cells_per_task=4)
+
+        # When:
+        try:
+            results = [sut.belongs_to_grammar(sentence) for sentence in self.sentences]
+        finally:
+            sut.close()
+
+        # Then:
+        assert_that(results, is_(equal_to(
+            [recognizer.belongs_to_grammar(sentence) for sentence in self.sentences])))
+        assert_that(results, is_(equal_to([True, False, True, True])))
+
+    def test_short_sentences_should_not_start_workers(self):
+        # Given:
+        sut = WavefrontRecognizer(BitsetRecognizer(self.rule_population), 8, worker_count=2)
+
+        # When:
+        result = sut.perform_cyk(self.sentences[2])
+
+        # Then:
+        assert_that(result.belongs_to_grammar, is_(True))
+        assert_that(sut._pool, is_(None))
+
+    def test_row_tasks_should_cover_row_without_gaps(self):
+        # Given:
+        sut = WavefrontRecognizer(None, 8, worker_count=3, min_cells_per_task=4)
+
+        # When/Then:
+        assert_that([list(columns) for columns in sut._row_tasks(20, 1)],
+                    is_(equal_to([list(range(0, 7)), list(range(7, 13)), list(range(13, 19))])))
+        assert_that([list(columns) for columns in sut._row_tasks(20, 17)],
+                    is_(equal_to([[0, 1, 2]])))
+
+    def test_service_should_use_wavefront_when_configured(self):
+        # Given:
+        sut = CykService.default(self.randomizer, None)
+        sut.configuration = CykConfiguration.create(
+            False, 0, 0, 0, 0, 0, worker_count=2, should_use_wavefront=True,
+            wavefront_length_threshold=8)
+        estimator = EvolutionStepEstimator()
+
+        # When:
+        sut.perform_recognition_for_all_sentences(self.rule_population, self.sentences, estimator)
+
+        # Then:
+        assert_that(estimator.true_positive, is_(equal_to(3)))
+        assert_that(estimator.false_negative, is_(equal_to(1)))
+
+    def test_should_be_unavailable_without_shared_memory(self):
+        with patch.dict(sys.modules, {'multiprocessing.shared_memory': None}):
+            assert_that(WavefrontRecognizer.is_available(), is_(False))
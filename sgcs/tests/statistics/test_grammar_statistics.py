@@ -4,11 +4,13 @@ from unittest.mock import create_autospec
 from hamcrest import *
 
 from core.rule import Rule
-from core.symbol import Symbol
+from core.symbol import Symbol, Sentence
+from induction.cyk_executors import CykResult
+from induction.production import Production
 from sgcs.induction.cyk_service import CykService
 from statistics.grammar_statistics import PasiekaRuleStatistics, GrammarStatistics, PasiekaFitness, PasiekaRuleInfo, \
     PasiekaLeftSideInfo, ClassicRuleStatistics, ClassicRuleUsageInfo, Fitness, \
-    ClassicalStatisticsConfiguration
+    ClassicalStatisticsConfiguration, StatisticsVisitor
 from utils import Randomizer
 
 
@@ -80,6 +82,20 @@ class TestPasiekaRuleStatistics(unittest.TestCase):
         assert_that(another_rule_info[0].rule_usage, is_(equal_to(1)))
         assert_that(another_rule_info[1].left_side_usage, is_(equal_to(1)))
 
+    def test_should_be_able_to_count_batched_rule_usage(self):
+        # Given:
+        another_rule = Rule(Symbol(hash('A')), Symbol(hash('B')), Symbol(hash('G')))
+        self.sut.added_new_rule(self.rule, self.cyk_service_mock)
+        self.sut.added_new_rule(another_rule, self.cyk_service_mock)
+
+        # When:
+        self.sut.rules_used({self.rule: 2, another_rule: 1}, 3, self.cyk_service_mock)
+
+        # Then:
+        rule_info = self.sut.get_rule_statistics(self.rule, self.cyk_service_mock)
+        assert_that(rule_info[0].rule_usage, is_(equal_to(6)))
+        assert_that(rule_info[1].left_side_usage, is_(equal_to(9)))
+
 
 class TestClassicRuleStatistics(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -173,6 +189,27 @@ class TestClassicRuleStatistics(unittest.TestCase):
         assert_that(min_fertility, is_(equal_to(-3)))
         assert_that(max_fertility, is_(equal_to(3)))
 
+    def test_batched_usage_should_match_repeated_usage(self):
+        # Given:
+        best_rule = Rule(Symbol(hash('A')), Symbol(hash('B')), Symbol(hash('G')))
+        for rule in [self.rule, best_rule]:
+            self.sut.added_new_rule(rule, self.cyk_service_mock)
+        self.sut.rule_used(best_rule, ClassicRuleUsageInfo(True, 1, 5), self.cyk_service_mock)
+
+        # When:
+        self.sut.rules_used({self.rule: 3, best_rule: 1}, ClassicRuleUsageInfo(False, 2, 2),
+                            self.cyk_service_mock)
+
+        # Then:
+        rule_info, min_fertility, max_fertility = \
+            self.sut.get_rule_statistics(self.rule, self.cyk_service_mock)
+        best_rule_info, _, _ = self.sut.get_rule_statistics(best_rule, self.cyk_service_mock)
+
+        self.assert_rule_statistics(rule_info, 0, 6, 0, 6)
+        self.assert_rule_statistics(best_rule_info, 1, 2, 5, 2)
+        assert_that(min_fertility, is_(equal_to(-6)))
+        assert_that(max_fertility, is_(equal_to(3)))
+
     def test_should_be_able_to_remove_rule(self):
         # Given:
         self.rule_with_usage_scenario()
@@ -229,6 +266,28 @@ class TestGrammarStatistics(unittest.TestCase):
         self.rule_statistics_mock.removed_rule.assert_called_once_with(
             self.rule, self.sut)
 
+    def test_visited_rules_should_be_applied_in_one_batch(self):
+        # Given:
+        another_rule = Rule(Symbol(hash('A')), Symbol(hash('B')), Symbol(hash('G')))
+        unknown_rule = Rule(Symbol(hash('A')), Symbol(hash('B')), Symbol(hash('J')))
+        self.rule_statistics_mock.has_rule.side_effect = lambda rule: rule != unknown_rule
+        self.rule_statistics_mock.create_usage.return_value = 2
+        visitor = StatisticsVisitor()
+        sentence, cyk_result = Sentence([Symbol('a')], True), CykResult()
+
+        # When:
+        for rule in [self.rule, another_rule, self.rule, unknown_rule]:
+            visitor(Production(None, rule), self.sut, sentence, cyk_result, None)
+        self.sut.apply_rule_usage_batch()
+        self.sut.apply_rule_usage_batch()
+
+        # Then:
+        self.rule_statistics_mock.create_usage.assert_called_once_with(
+            self.sut, cyk_result, sentence)
+        self.rule_statistics_mock.rules_used.assert_called_once_with(
+            {self.rule: 2, another_rule: 1}, 2, self.sut)
+        assert_that(not self.rule_statistics_mock.rule_used.called)
+
 
 class TestPasiekaFitness(unittest.TestCase):
     def __init__(self, *args, **kwargs):
@@ -1,6 +1,9 @@
 import math
 from hamcrest import is_, assert_that, close_to
 
+from core.rule import Rule, TerminalRule
+from core.symbol import Symbol, Sentence
+
 
 def are_(matcher):
     return is_(matcher)
@@ -11,3 +14,33 @@ def assert_nearly_equal_or_both_nan(a, b, delta=0.01):
         assert_that(math.isnan(b))
     else:
         assert_that(a, is_(close_to(b, delta)))
+
+
+def she_eats_a_fish_rules(*extra_rules):
+    return [
+        Rule(Symbol('S'), Symbol('NP'), Symbol('VP')),
+        Rule(Symbol('VP'), Symbol('VP'), Symbol('PP')),
+        Rule(Symbol('VP'), Symbol('V'), Symbol('NP')),
+        TerminalRule(Symbol('VP'), Symbol('eats')),
+        Rule(Symbol('PP'), Symbol('P'), Symbol('NP')),
+        Rule(Symbol('NP'), Symbol('Det'), Symbol('N')),
+        TerminalRule(Symbol('NP'), Symbol('she')),
+        TerminalRule(Symbol('V'), Symbol('eats')),
+        TerminalRule(Symbol('P'), Symbol('with')),
+        TerminalRule(Symbol('N'), Symbol('fish')),
+        TerminalRule(Symbol('N'), Symbol('fork')),
+        TerminalRule(Symbol('Det'), Symbol('a'))
+    ] + list(extra_rules)
+
+
+def create_sentences(*texts, is_positive_sentence=None):
+    return [Sentence([Symbol(word) for word in text.split()], is_positive_sentence)
+            for text in texts]
+
+
+def create_rule_population(population_type, rules, randomizer):
+    rule_population = population_type(Symbol('S'))
+    for rule in rules:
+        rule_population.add_rule(rule, randomizer)
+
+    return rule_population
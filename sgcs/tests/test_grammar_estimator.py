@@ -63,6 +63,17 @@ class TestEvolutionStepEstimator(unittest.TestCase):
         self.assert_estimation(tp=2, tn=1, fp=1, fn=1, total=5, positives=3, negatives=2,
                                fitness=0.6)
 
+    def test_step_estimation_should_weight_results_by_multiplicity(self):
+        result_tp = self.mk_cyk_result(True, True)
+        result_tp.multiplicity = 3
+        result_tn = self.mk_cyk_result(False, False)
+        result_tn.multiplicity = 2
+
+        self.sut.append_result(result_tp)
+        self.sut.append_result(result_tn)
+        self.assert_estimation(tp=3, tn=2, fp=0, fn=0, total=5, positives=3, negatives=2,
+                               fitness=1)
+
 
 class TestGrammarEstimator(unittest.TestCase):
     def __init__(self, *args, **kwargs):